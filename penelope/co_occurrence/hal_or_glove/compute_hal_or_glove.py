@@ -1,4 +1,7 @@
-from typing import Iterable, Mapping, Tuple
+import itertools
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import get_context
+from typing import Iterable, List, Mapping, Set, Tuple
 
 import more_itertools
 import numpy as np
@@ -7,18 +10,57 @@ from tqdm.auto import tqdm
 
 import penelope.utility as utility
 from penelope.corpus import DocumentIndex
-from penelope.type_alias import FilenameTokensTuple
 
 from .vectorizer_glove import GloveVectorizer
 from .vectorizer_hal import HyperspaceAnalogueToLanguageVectorizer
 
 logger = utility.getLogger('penelope')
 
+COO_COLUMNS: List[str] = ['x_id', 'y_id', 'nw_xy', 'nw_x', 'nw_y', 'cwr']
+
+# Vocabulary shared by all partitions, set once per worker process by `_initialize_process_state`
+_token2id: Mapping[str, int] = None
+
+
 # pylint: disable=
 class CoOccurrenceError(ValueError):
     ...
 
 
+def _initialize_process_state(token2id: Mapping[str, int]) -> None:
+    global _token2id  # pylint: disable=global-statement
+    _token2id = token2id
+
+
+def _compute_partition_co_occurrences(args: Tuple) -> Tuple[int, Mapping[str, np.ndarray]]:
+    """Fits a vectorizer on a single partition and returns the co-occurrences as sparse COO arrays"""
+
+    key, tokens_stream, method, window_size, distance_metric, normalize, zero_diagonal, direction_sensitive = args
+
+    vectorizer = (
+        HyperspaceAnalogueToLanguageVectorizer(token2id=_token2id).fit(
+            tokens_stream, size=window_size, distance_metric=distance_metric
+        )
+        if method == "HAL"
+        else GloveVectorizer(token2id=_token2id).fit(tokens_stream, size=window_size)
+    )
+
+    data: Mapping[str, np.ndarray] = vectorizer.to_coo(
+        normalize=normalize, zero_diagonal=zero_diagonal, direction_sensitive=direction_sensitive
+    )
+
+    return key, data
+
+
+def is_partitioned_in_runs(values: pd.Series) -> bool:
+    """Returns True if each distinct value in `values` occurs in a single contiguous run"""
+    values: np.ndarray = values.to_numpy()
+    if len(values) == 0:
+        return True
+    run_values: np.ndarray = values[np.concatenate([[True], values[1:] != values[:-1]])]
+    return len(run_values) == len(pd.unique(run_values))
+
+
 def compute_hal_or_glove_co_occurrences(
     stream: Iterable[Tuple[str, Iterable[str]]],
     *,
@@ -31,11 +73,18 @@ def compute_hal_or_glove_co_occurrences(
     zero_diagonal: bool = True,
     direction_sensitive: bool = False,
     partition_column: str = 'year',
+    processes: int = None,
 ):
     """Computes co-occurrence as specified by either `Glove` or `Hyperspace Analogous to Hyperspace` (HAL)
 
         NOTE:
             - Passed document index MUST be in the same sequence as the passed sequence of tokens
+            - If each partition is a contiguous run in the document index (e.g. index sorted by year), partitions
+              are read from the stream one at a time, otherwise the entire stream is read and bucketed first.
+            - If `processes` is given, partitions are fitted concurrently in a (spawned) process pool.
+              The vocabulary is sent once to each worker, at most `processes` partitions are in flight
+              and each partition's result is returned as sparse COO arrays that are merged once.
+              Memory is bounded by the partitions in flight only if partitions are read one at a time.
     Parameters
     ----------
     corpus : Iterable[str,Iterable[str]]
@@ -56,6 +105,10 @@ def compute_hal_or_glove_co_occurrences(
         [description], by default True
     direction_sensitive : bool, optional
         [description], by default False
+    partition_column : str, optional
+        Document index column that defines partitions, by default 'year'
+    processes : int, optional
+        Number of worker processes, by default None (sequential)
 
     Returns
     -------
@@ -82,57 +135,107 @@ def compute_hal_or_glove_co_occurrences(
             raise CoOccurrenceError(f"expected stream of (name,tokens) tuples found {type(item)}")
 
         filename = item[0]
-        if not isinstance(str, filename):
+        if not isinstance(filename, str):
             raise CoOccurrenceError(f"expected filename (str) ound {type(filename)}")
 
         return int(document_index.loc[filename][partition_column])
 
-    total_results = []
-    key_streams = more_itertools.bucket(stream, key=get_bucket_key, validator=None)
-    keys = sorted(list(key_streams))
+    def partition_streams() -> Iterable[Tuple[int, List[Iterable[str]]]]:
+
+        if is_partitioned_in_runs(document_index[partition_column]):
+            seen_keys: Set[int] = set()
+            for key, items in itertools.groupby(stream, key=get_bucket_key):
+                if key in seen_keys:
+                    raise CoOccurrenceError("stream is not in document index sequence (partition split into runs)")
+                seen_keys.add(key)
+                yield key, [tokens for _, tokens in items]
+        else:
+            key_streams = more_itertools.bucket(stream, key=get_bucket_key, validator=None)
+            for key in sorted(list(key_streams)):
+                yield key, [tokens for _, tokens in key_streams[key]]
+
+    def task_stream() -> Iterable[Tuple]:
+        for key, tokens_stream in partition_streams():
+            logger.info(f'Processing {key}...')
+            yield (
+                key,
+                tokens_stream,
+                method,
+                window_size,
+                distance_metric,
+                normalize,
+                zero_diagonal,
+                direction_sensitive,
+            )
 
-    metadata = []
-    for i, key in tqdm(enumerate(keys), position=0, leave=True):
+    partials: Mapping[int, Mapping[str, np.ndarray]] = {}
 
-        key_stream: FilenameTokensTuple = key_streams[key]
-        keyed_document_index = document_index[document_index[partition_column] == key]
+    if not processes:
 
-        metadata.append(
-            dict(
-                document_id=i,
-                filename='year_{year}.txt',
-                document_name='year_{year}',
-                year=key,
-                n_docs=len(keyed_document_index),
-            )
-        )
+        _initialize_process_state(token2id)
+        for args in tqdm(task_stream(), total=document_index[partition_column].nunique(), position=0, leave=True):
+            key, data = _compute_partition_co_occurrences(args)
+            partials[key] = data
 
-        logger.info(f'Processing{key}...')
+    else:
 
-        tokens_stream = (tokens for _, tokens in key_stream)
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=get_context("spawn"),
+            initializer=_initialize_process_state,
+            initargs=(token2id,),
+        ) as executor:
 
-        vectorizer = (
-            HyperspaceAnalogueToLanguageVectorizer(token2id=token2id).fit(
-                tokens_stream, size=window_size, distance_metric=distance_metric
-            )
-            if method == "HAL"
-            else GloveVectorizer(token2id=token2id).fit(tokens_stream, size=window_size)
-        )
+            pending: Set[Future] = set()
+            for args in tqdm(task_stream(), total=document_index[partition_column].nunique(), position=0, leave=True):
+                if len(pending) >= processes:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    partials.update(future.result() for future in done)
+                pending.add(executor.submit(_compute_partition_co_occurrences, args))
 
-        co_occurrence = vectorizer.to_dataframe(
-            normalize=normalize, zero_diagonal=zero_diagonal, direction_sensitive=direction_sensitive
-        )
+            partials.update(future.result() for future in wait(pending).done)
 
-        co_occurrence[partition_column] = key
+    co_occurrences: pd.DataFrame = merge_partitioned_coo(
+        partials, keys=sorted(partials), token2id=token2id, partition_column=partition_column
+    )
+
+    return co_occurrences
 
-        total_results.append(
-            co_occurrence[['year', 'x_term', 'y_term', 'nw_xy', 'nw_x', 'nw_y', 'cwr']],
-        )
 
-        # if i == 5: break
+def merge_partitioned_coo(
+    partials: Mapping[int, Mapping[str, np.ndarray]],
+    *,
+    keys: List[int],
+    token2id: Mapping[str, int],
+    partition_column: str,
+) -> pd.DataFrame:
+    """Merges partitioned COO arrays into a single co-occurrence frame with cwr scaled to max 1"""
 
-    co_occurrences = pd.concat(total_results, ignore_index=True)
+    sizes: np.ndarray = np.array([len(partials[key]['x_id']) for key in keys], dtype=np.int64)
 
-    co_occurrences['cwr'] = co_occurrences.cwr / np.max(co_occurrences.cwr, axis=0)
+    data: Mapping[str, np.ndarray] = {
+        column: (
+            np.concatenate([partials[key][column] for key in keys]) if len(keys) > 0 else np.array([], dtype=np.int64)
+        )
+        for column in COO_COLUMNS
+    }
+
+    vocabulary: np.ndarray = np.empty(len(token2id), dtype=object)
+    vocabulary[np.fromiter(token2id.values(), dtype=np.int64, count=len(token2id))] = list(token2id.keys())
+
+    co_occurrences: pd.DataFrame = pd.DataFrame(
+        {
+            partition_column: np.repeat(np.array(keys, dtype=np.int64), sizes),
+            'x_term': vocabulary[data['x_id']],
+            'y_term': vocabulary[data['y_id']],
+            'nw_xy': data['nw_xy'],
+            'nw_x': data['nw_x'],
+            'nw_y': data['nw_y'],
+            'cwr': data['cwr'],
+        }
+    )
+
+    if len(co_occurrences) > 0:
+        co_occurrences['cwr'] = co_occurrences.cwr / np.max(co_occurrences.cwr, axis=0)
 
     return co_occurrences
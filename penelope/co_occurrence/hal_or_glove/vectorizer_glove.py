@@ -58,43 +58,51 @@ class GloveVectorizer:
 
         return self
 
-    def to_dataframe(self, *, normalize='size', zero_diagonal=True, **_):
-        '''Return computed co-occurrence values'''
-
-        matrix = self.nw_xy
-
-        if zero_diagonal:
-            pass
-        #    matrix.fill_diagonal(0)
-
-        coo_matrix = matrix  # .tocoo(copy=False)
-
-        df = pd.DataFrame(
-            {
-                'x_id': coo_matrix.row,
-                'y_id': coo_matrix.col,
-                'nw_xy': coo_matrix.data,
-                'nw_x': 0,
-                'nw_y': 0,
-            }
-        ).reset_index(drop=True)
+    def to_coo(self, *, normalize='size', zero_diagonal=True, **_):  # pylint: disable=unused-argument
+        '''Return computed co-occurrence values as parallel (sparse COO) arrays'''
 
-        df = df.assign(
-            x_term=df.x_id.apply(lambda x: self.id2token[x]), y_term=df.y_id.apply(lambda x: self.id2token[x])
-        )
-
-        df = df[['x_id', 'y_id', 'x_term', 'y_term', 'nw_xy', 'nw_x', 'nw_y']]
+        coo_matrix = self.nw_xy.tocoo()
 
         norm = 1.0
         if normalize == 'size':
             norm = self.term_count
         elif normalize == 'max':
-            norm = np.max(coo_matrix)
+            norm = coo_matrix.max()
         elif normalize is None:
             logger.warning('No normalize method specified. Using absolute counts...')
         else:
             assert False, 'Unknown normalize specifier'
 
-        df_nw_xy = df.assign(cwr=df.nw_xy / norm)
+        cwr = coo_matrix.data / norm
+        keep = cwr > 0
+
+        return dict(
+            x_id=coo_matrix.row[keep],
+            y_id=coo_matrix.col[keep],
+            nw_xy=coo_matrix.data[keep],
+            nw_x=np.zeros(keep.sum(), dtype=np.uint32),
+            nw_y=np.zeros(keep.sum(), dtype=np.uint32),
+            cwr=cwr[keep],
+        )
+
+    def to_dataframe(self, *, normalize='size', zero_diagonal=True, **_):
+        '''Return computed co-occurrence values'''
+
+        data = self.to_coo(normalize=normalize, zero_diagonal=zero_diagonal)
+
+        vocabulary = np.array([self.id2token[i] for i in range(0, len(self.token2id))], dtype=object)
+
+        df = pd.DataFrame(
+            {
+                'x_id': data['x_id'],
+                'y_id': data['y_id'],
+                'x_term': vocabulary[data['x_id']],
+                'y_term': vocabulary[data['y_id']],
+                'nw_xy': data['nw_xy'],
+                'nw_x': data['nw_x'],
+                'nw_y': data['nw_y'],
+                'cwr': data['cwr'],
+            }
+        )
 
-        return df_nw_xy[df_nw_xy.cwr > 0]
+        return df
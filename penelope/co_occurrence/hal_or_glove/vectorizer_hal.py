@@ -1,5 +1,4 @@
-import itertools
-from typing import Iterable, Mapping
+from typing import Iterable, List, Mapping, Tuple
 
 import numpy as np
 import pandas as pd
@@ -36,7 +35,7 @@ class HyperspaceAnalogueToLanguageVectorizer:
     def corpus(self, value: Iterable[Iterable[str]]):
 
         self._corpus = value
-        self.term_count = sum(map(len, value or []))
+        self.term_count = sum(map(len, value)) if isinstance(value, (list, tuple)) else 0
 
         if self.token2id is None and value is not None:
             self.token2id = generate_token2id(value)
@@ -49,19 +48,32 @@ class HyperspaceAnalogueToLanguageVectorizer:
                 self._id2token = {v: k for k, v in self.token2id.items()}
         return self._id2token
 
-    def sliding_window(self, seq: Iterable[str], n: int) -> Iterable[str]:
-        it: Iterable[str] = itertools.chain(iter(seq), [None] * n)
-        memory: Iterable[str] = tuple(itertools.islice(it, n + 1))
-        if len(memory) == n + 1:
-            yield memory
-        for x in it:
-            memory = memory[1:] + (x,)
-            yield memory
+    @staticmethod
+    def distance_weights(size: int, distance_metric: int) -> np.ndarray:
+        """Returns weights for offsets 1..size (index 0 is offset 1)"""
+        d: np.ndarray = np.arange(1, size + 1, dtype=np.float64)
+        if distance_metric == 0:  # linear i.e. adjacent equals window size, then decreasing by one
+            return size - d + 1
+        if distance_metric == 1:  # f(d) = 1 / d
+            return 1.0 / d
+        if distance_metric == 2:  # Constant value of 1
+            return np.ones(size, dtype=np.float64)
+        return np.zeros(size, dtype=np.float64)
 
     def fit(
-        self, corpus: Iterable[str] = None, size: int = 2, distance_metric: int = 0, zero_out_diag: bool = False
+        self,
+        corpus: Iterable[str] = None,
+        size: int = 2,
+        distance_metric: int = 0,
+        zero_out_diag: bool = False,
+        buffer_size: int = 10_000_000,
     ) -> "HyperspaceAnalogueToLanguageVectorizer":
-        '''Trains HAL for a document. Note that sentence borders (for now) are ignored'''
+        """Trains HAL for a document. Note that sentence borders (for now) are ignored
+
+        All (x, y) pairs within `size` (y following x) and their distance weights are computed
+        as arrays per document and accumulated as COO (row, col, data) triplets. Triplets are
+        summed into the result matrix whenever more than `buffer_size` are pending.
+        """
 
         if corpus is not None:
             self.corpus = corpus
@@ -69,49 +81,67 @@ class HyperspaceAnalogueToLanguageVectorizer:
         assert self.token2id is not None, "Fit with no vocabulary!"
         assert self.corpus is not None, "Fit with no corpus!"
 
-        nw_xy: sp.lil_matrix = sp.csc_matrix((len(self.token2id), len(self.token2id)), dtype=np.uint32)
+        shape: Tuple[int, int] = (len(self.token2id), len(self.token2id))
+        dtype: np.dtype = np.float64 if distance_metric == 1 else np.uint32
+        weights: np.ndarray = self.distance_weights(size, distance_metric)
+
+        nw_xy: sp.csr_matrix = sp.csr_matrix(shape, dtype=dtype)
         nw_x: np.ndarray = np.zeros(len(self.token2id), dtype=np.uint32)
 
-        for terms in corpus:
+        rows: List[np.ndarray] = []
+        cols: List[np.ndarray] = []
+        data: List[np.ndarray] = []
+        n_pending: int = 0
+
+        def flush(nw_xy: sp.csr_matrix) -> sp.csr_matrix:
+            if n_pending == 0:
+                return nw_xy
+            pending: sp.csr_matrix = sp.coo_matrix(
+                (np.concatenate(data).astype(dtype), (np.concatenate(rows), np.concatenate(cols))), shape=shape
+            ).tocsr()
+            rows.clear()
+            cols.clear()
+            data.clear()
+            return nw_xy + pending
 
-            id_terms = (self.token2id[t] for t in terms)
+        term_count: int = 0
 
-            for win in self.sliding_window(id_terms, size):
+        for terms in self.corpus:
 
-                # logger.info([ self.id2token[x] if x is not None else None for x in win])
+            ids: np.ndarray = np.fromiter((self.token2id[t] for t in terms), dtype=np.int64)
+            n_terms: int = len(ids)
+            term_count += n_terms
 
-                if win[0] is None:
-                    continue
+            if n_terms == 0:
+                continue
 
-                for x in win:
-                    if x is not None:
-                        nw_x[x] += 1
+            # A term at position p is counted once in each window starting in [p - size, p]
+            n_windows: np.ndarray = np.minimum(np.arange(n_terms), size) + 1
+            nw_x += np.bincount(ids, weights=n_windows, minlength=len(nw_x)).astype(np.uint32)
 
-                for i in range(1, size + 1):
+            for i in range(1, min(size, n_terms - 1) + 1):
 
-                    if win[i] is None:
-                        continue
+                x: np.ndarray = ids[:-i]
+                y: np.ndarray = ids[i:]
 
-                    if zero_out_diag:
-                        if win[0] == win[i]:
-                            continue
+                if zero_out_diag:
+                    mask: np.ndarray = x != y
+                    x, y = x[mask], y[mask]
 
-                    d = float(i)  # abs(n - i)
-                    if distance_metric == 0:  # linear i.e. adjacent equals window size, then decreasing by one
-                        w = size - d + 1  # / size
-                    elif distance_metric == 1:  # f(d) = 1 / d
-                        w = 1.0 / d
-                    elif distance_metric == 2:  # Constant value of 1
-                        w = 1
-                    else:
-                        w = 0
+                rows.append(x)
+                cols.append(y)
+                data.append(np.full(len(x), weights[i - 1]))
+                n_pending += len(x)
 
-                    # print('*', i, self.id2token[win[0]], self.id2token[win[i]], w, [ self.id2token[x] if x is not None else None for x in win])
-                    nw_xy[win[0], win[i]] += w
+            if n_pending >= buffer_size:
+                nw_xy = flush(nw_xy)
+                n_pending = 0
+
+        nw_xy = flush(nw_xy)
 
         self.nw_x = nw_x
-        self.nw_xy = nw_xy
-        # self.f_xy = nw_xy / np.max(nw_xy)
+        self.nw_xy = nw_xy.tocsc()
+        self.term_count = term_count
 
         return self
 
@@ -177,60 +207,92 @@ class HyperspaceAnalogueToLanguageVectorizer:
 
     #     return df
 
-    def to_dataframe(
+    def to_coo(
         self, *, normalize: str = 'size', zero_diagonal: bool = True, direction_sensitive: bool = False, **_
-    ) -> pd.DataFrame:
-        '''Return computed co-occurrence values'''
+    ) -> Mapping[str, np.ndarray]:
+        """Return computed co-occurrence values as parallel (sparse COO) arrays sorted by (x_id, y_id)
 
-        matrix: sp.csc_matrix = self.nw_xy
+        Returns:
+            Mapping[str, np.ndarray]: arrays `x_id`, `y_id`, `nw_xy`, `nw_x`, `nw_y` and `cwr` (only pairs where cwr > 0)
+        """
+
+        matrix: sp.csr_matrix = self.nw_xy.tocsr()
 
         if not direction_sensitive:
-            matrix += matrix.T
-            matrix[np.tril_indices(matrix.shape[0])] = 0
-        else:
-            if zero_diagonal:
-                matrix.fill_diagonal(0)
+            matrix = matrix + matrix.T
 
         coo_matrix: sp.coo_matrix = matrix.tocoo(copy=False)
+        coo_matrix.sum_duplicates()
 
-        df_nw_x: pd.DataFrame = pd.DataFrame(self.nw_x, columns=['nw'])
-
-        df: pd.DataFrame = (
-            pd.DataFrame({'x_id': coo_matrix.row, 'y_id': coo_matrix.col, 'nw_xy': coo_matrix.data})[
-                ['x_id', 'y_id', 'nw_xy']
-            ]
-            .sort_values(['x_id', 'y_id'])
-            .reset_index(drop=True)
-        )
-
-        df = df.assign(
-            x_term=df.x_id.apply(lambda x: self.id2token[x]), y_term=df.y_id.apply(lambda x: self.id2token[x])
-        )
+        if not direction_sensitive:
+            mask: np.ndarray = coo_matrix.row < coo_matrix.col
+        elif zero_diagonal:
+            mask: np.ndarray = coo_matrix.row != coo_matrix.col
+        else:
+            mask: np.ndarray = np.ones(coo_matrix.nnz, dtype=np.bool_)
 
-        df = df.merge(df_nw_x, left_on='x_id', right_index=True, how='inner').rename(columns={'nw': 'nw_x'})
-        df = df.merge(df_nw_x, left_on='y_id', right_index=True, how='inner').rename(columns={'nw': 'nw_y'})
+        x_ids: np.ndarray = coo_matrix.row[mask]
+        y_ids: np.ndarray = coo_matrix.col[mask]
+        nw_xy: np.ndarray = coo_matrix.data[mask]
 
-        df = df[['x_id', 'y_id', 'x_term', 'y_term', 'nw_xy', 'nw_x', 'nw_y']]
+        order: np.ndarray = np.lexsort((y_ids, x_ids))
+        x_ids, y_ids, nw_xy = x_ids[order], y_ids[order], nw_xy[order]
 
         norm = 1.0
         if normalize == 'size':
             norm = self.term_count
         elif normalize == 'max':
-            norm = np.max(coo_matrix)
+            norm = nw_xy.max() if len(nw_xy) > 0 else 1.0
         elif normalize is None:
             logger.warning('No normalize method specified. Using absolute counts...')
             # return as as is..."
         else:
             assert False, 'Unknown normalize specifier'
 
-        # logger.info('Normalizing for document corpus size %s.', norm)
+        nw_x: np.ndarray = self.nw_x[x_ids]
+        nw_y: np.ndarray = self.nw_x[y_ids]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cwr: np.ndarray = (nw_xy / (nw_x.astype(np.float64) + nw_y - nw_xy)) / norm
+
+        cwr[~np.isfinite(cwr) | (cwr < 0.0)] = 0.0
 
-        df_nw_xy: pd.DataFrame = df.assign(cwr=((df.nw_xy / (df.nw_x + df.nw_y - df.nw_xy)) / norm))
+        keep: np.ndarray = cwr > 0
 
-        df_nw_xy.loc[df_nw_xy.cwr < 0.0, 'cwr'] = 0
-        df_nw_xy.cwr.fillna(0.0, inplace=True)
+        return dict(
+            x_id=x_ids[keep],
+            y_id=y_ids[keep],
+            nw_xy=nw_xy[keep],
+            nw_x=nw_x[keep],
+            nw_y=nw_y[keep],
+            cwr=cwr[keep],
+        )
+
+    def to_dataframe(
+        self, *, normalize: str = 'size', zero_diagonal: bool = True, direction_sensitive: bool = False, **_
+    ) -> pd.DataFrame:
+        '''Return computed co-occurrence values as a long (sparse) frame, the term-term matrix is never densified'''
+
+        data: Mapping[str, np.ndarray] = self.to_coo(
+            normalize=normalize, zero_diagonal=zero_diagonal, direction_sensitive=direction_sensitive
+        )
+
+        vocabulary: np.ndarray = np.array([self.id2token[i] for i in range(0, len(self.token2id))], dtype=object)
+
+        df: pd.DataFrame = pd.DataFrame(
+            {
+                'x_id': data['x_id'],
+                'y_id': data['y_id'],
+                'x_term': vocabulary[data['x_id']],
+                'y_term': vocabulary[data['y_id']],
+                'nw_xy': data['nw_xy'],
+                'nw_x': data['nw_x'],
+                'nw_y': data['nw_y'],
+                'cwr': data['cwr'],
+            }
+        )
 
-        return df_nw_xy[df_nw_xy.cwr > 0]
+        return df
 
 
 def test_burgess_litmus_test():
@@ -300,11 +300,11 @@ class DocumentIndexHelper:
         self._document_index[target_column_name] = (
             self._document_index[source_column_name]
             if time_period_specifier == source_column_name
-            else self._document_index.year.apply(create_time_period_categorizer(time_period_specifier))
+            else categorize_time_period(self._document_index.year, time_period_specifier)
         )
 
         """Store indices for documents in each group"""
-        category_indices = self._document_index.groupby(target_column_name).apply(lambda x: x.index.tolist()).to_dict()
+        category_indices = group_indices(self._document_index, target_column_name)
 
         """Group by 'target_column_name' column"""
         grouped_document_index = (
@@ -383,6 +383,24 @@ KNOWN_TIME_PERIODS: dict = {'year': 1, 'lustrum': 5, 'decade': 10}
 TimePeriodSpecifier = Union[str, dict, Callable[[Any], Any]]
 
 
+def group_indices(document_index: DocumentIndex, keys: Union[str, List[str]]) -> Dict[Any, List[int]]:
+    """Returns index labels of each group as a dict keyed by group value, computed using group codes"""
+    codes: np.ndarray = document_index.groupby(keys, sort=True).ngroup().values
+    rows: np.ndarray = np.flatnonzero(codes >= 0)
+    rows = rows[np.argsort(codes[rows], kind='stable')]
+    if len(rows) == 0:
+        return {}
+    starts: np.ndarray = np.flatnonzero(np.diff(codes[rows], prepend=-1))
+    first_rows: pd.DataFrame = document_index.iloc[rows[starts]]
+    values: list = (
+        first_rows[keys].tolist()
+        if isinstance(keys, str)
+        else list(first_rows[keys].itertuples(index=False, name=None))
+    )
+    groups: List[np.ndarray] = np.split(document_index.index.values[rows], starts[1:])
+    return dict(zip(values, (x.tolist() for x in groups)))
+
+
 def get_document_id(document_index: DocumentIndex, document_name: str) -> int:
     document_id = document_index.loc[document_name]['document_id']
     return document_id
@@ -409,6 +427,22 @@ def create_time_period_categorizer(time_period_specifier: TimePeriodSpecifier) -
     return categorizer
 
 
+def categorize_time_period(series: pd.Series, time_period_specifier: TimePeriodSpecifier) -> pd.Series:
+    """Vectorized version of `create_time_period_categorizer` applied to `series` (e.g. a year column)"""
+
+    if isinstance(time_period_specifier, str) and not callable(time_period_specifier):
+
+        if time_period_specifier not in KNOWN_TIME_PERIODS:
+            raise ValueError(f"{time_period_specifier} is not a known period specifier")
+
+        return series - series % KNOWN_TIME_PERIODS[time_period_specifier]
+
+    if isinstance(time_period_specifier, dict):
+        return series.map(dict_of_key_values_inverted_to_dict_of_value_key(time_period_specifier))
+
+    return series.apply(create_time_period_categorizer(time_period_specifier))
+
+
 def get_strictly_increasing_document_id(
     document_index: DocumentIndex, document_id_field: str = 'document_id'
 ) -> pd.Series:
@@ -13,6 +13,7 @@ from .convert import (
 from .corpus import VectorizedCorpus, find_matching_words_in_vocabulary
 from .group import GroupByMixIn
 from .interface import IVectorizedCorpus
+from .search import VocabularySearchIndex
 from .slice import SliceMixIn
 from .store import StoreMixIn, load_corpus, load_metadata, store_metadata
 from .ttm import WORD_PAIR_DELIMITER, CoOccurrenceVocabularyHelper, compute_hal_cwr_score, to_word_pair_token
@@ -12,25 +12,20 @@ import scipy
 from loguru import logger
 
 # pylint: disable=logging-format-interpolation, too-many-public-methods, too-many-ancestors
-from scipy.sparse import SparseEfficiencyWarning, lil_matrix
+from scipy.sparse import SparseEfficiencyWarning
 
 from penelope import utility
 
 from ..document_index import DocumentIndex
+from .counter import token_ids_to_csr
 from .group import GroupByMixIn
 from .interface import IVectorizedCorpus, VectorizedCorpusError
+from .search import VocabularySearchIndex, token2id_to_array
 from .slice import SliceMixIn
 from .stats import StatsMixIn
 from .store import StoreMixIn
 from .ttm import CoOccurrenceMixIn
 
-try:
-    import sklearn.preprocessing
-    from sklearn.feature_extraction.text import TfidfTransformer
-except ImportError:
-    ...
-
-
 warnings.simplefilter('ignore', SparseEfficiencyWarning)
 
 
@@ -69,6 +64,9 @@ class VectorizedCorpus(StoreMixIn, GroupByMixIn, SliceMixIn, StatsMixIn, CoOccur
             else token2id
         )
         self._id2token: Optional[Mapping[int, str]] = None
+        self._vocabulary_array: Optional[np.ndarray] = None
+        self._search_index: Optional[VocabularySearchIndex] = None
+        self._term_frequency_cache: Optional[Tuple[Any, Any, np.ndarray]] = None
         self._document_index: DocumentIndex = self._ingest_document_index(document_index=document_index)
         self._overridden_term_frequency: Optional[np.ndarray] = overridden_term_frequency
         self._payload: dict = dict(**kwargs)
@@ -107,6 +105,20 @@ class VectorizedCorpus(StoreMixIn, GroupByMixIn, SliceMixIn, StatsMixIn, CoOccur
             self._id2token = {i: t for t, i in self.token2id.items()}
         return self._id2token
 
+    @property
+    def vocabulary_array(self) -> np.ndarray:
+        """Vocabulary as an array of tokens indexed by token id"""
+        if self._vocabulary_array is None and self.token2id is not None:
+            self._vocabulary_array = token2id_to_array(self.token2id)
+        return self._vocabulary_array
+
+    @property
+    def search_index(self) -> VocabularySearchIndex:
+        """Lazily built search index over the vocabulary, rebuilt if `token2id` is replaced"""
+        if self._search_index is None or self._search_index.token2id is not self.token2id:
+            self._search_index = VocabularySearchIndex(self.token2id)
+        return self._search_index
+
     @property
     def vocabulary(self) -> List[str]:
         vocab = [self.id2token[i] for i in range(0, self.data.shape[1])]
@@ -267,11 +279,20 @@ class VectorizedCorpus(StoreMixIn, GroupByMixIn, SliceMixIn, StatsMixIn, CoOccur
 
         return corpus
 
-    def normalize(self, axis: int = 1, norm: str = 'l1', keep_magnitude: bool = False) -> IVectorizedCorpus:
+    def normalize(
+        self,
+        axis: int = 1,
+        norm: str = 'l1',
+        keep_magnitude: bool = False,
+        inplace: bool = False,
+        dtype: np.dtype = None,
+    ) -> IVectorizedCorpus:
         """Scale BoW matrix's rows or columns individually to unit norm:
 
             sklearn.preprocessing.normalize(self.bag_term_matrix, axis=axis, norm=norm)
 
+        The scaling is done directly on the CSR data array, and on `self` if `inplace` is True.
+
         Parameters
         ----------
         axis : int, optional
@@ -280,45 +301,56 @@ class VectorizedCorpus(StoreMixIn, GroupByMixIn, SliceMixIn, StatsMixIn, CoOccur
             Norm to use 'l1', 'l2', or 'max' , by default 'l1'
         keep_magnitude : bool, optional
             Scales result matrix so that sum equals input matrix sum, by default False
+        inplace : bool, optional
+            Normalize this corpus instead of creating a new corpus, by default False
+        dtype : np.dtype, optional
+            Float type of result (e.g. np.float32), by default None (float64 or existing float type)
 
         Returns
         -------
         VectorizedCorpus
-            New corpus normalized in given `axis`
+            New (or this) corpus normalized in given `axis`
         """
-        btm = sklearn.preprocessing.normalize(self._bag_term_matrix, axis=axis, norm=norm)
+        bag_term_matrix: scipy.sparse.csr_matrix = self._bag_term_matrix
+        magnitude: float = bag_term_matrix[0, :].sum() if keep_magnitude else None
 
-        if keep_magnitude is True:
-            factor = self._bag_term_matrix[0, :].sum() / btm[0, :].sum()
-            btm = btm * factor
+        norms: np.ndarray = utility.sparse_matrix_norms(bag_term_matrix, axis=axis, norm=norm)
+        btm = utility.scale_sparse_matrix_by_vector(bag_term_matrix, norms, axis=axis, dtype=dtype, inplace=inplace)
 
-        corpus = VectorizedCorpus(
-            bag_term_matrix=btm,
-            token2id=self.token2id,
-            document_index=self.document_index,
-            overridden_term_frequency=self._overridden_term_frequency,
-            **self.payload,
-        )
-
-        return corpus
+        if keep_magnitude is True:
+            factor = magnitude / btm[0, :].sum()
+            btm.data *= btm.dtype.type(factor)
 
-    def normalize_by_raw_counts(self):
+        return self._transformed(btm, inplace=inplace)
 
+    def normalize_by_raw_counts(self, inplace: bool = False, dtype: np.dtype = None) -> IVectorizedCorpus:
+        """Scales each document (row) by its raw token count (`n_raw_tokens` in document index)"""
         if 'n_raw_tokens' not in self.document_index.columns:
             # logging.warning("Normalizing using DTM counts (not actual self counts)")
             # return self.normalize()
             raise VectorizedCorpusError("raw count normalize attempted but no n_raw_tokens in document index")
 
         token_counts = self.document_index.n_raw_tokens.values
-        btm = utility.normalize_sparse_matrix_by_vector(self._bag_term_matrix, token_counts)
+        btm = utility.scale_sparse_matrix_by_vector(
+            self._bag_term_matrix, token_counts, axis=1, dtype=dtype, inplace=inplace
+        )
+
+        return self._transformed(btm, inplace=inplace)
+
+    def _transformed(self, bag_term_matrix: scipy.sparse.csr_matrix, inplace: bool) -> IVectorizedCorpus:
+        """Returns self with `bag_term_matrix` if `inplace`, otherwise a new corpus with same metadata"""
+        if inplace:
+            self._bag_term_matrix = bag_term_matrix
+            self._term_frequency_cache = None
+            return self
+
         corpus = VectorizedCorpus(
-            bag_term_matrix=btm,
+            bag_term_matrix=bag_term_matrix,
             token2id=self.token2id,
             document_index=self.document_index,
             overridden_term_frequency=self._overridden_term_frequency,
             **self.payload,
         )
-
         return corpus
 
     def token_indices(self, tokens: Iterable[str]) -> List[int]:
@@ -336,10 +368,17 @@ class VectorizedCorpus(StoreMixIn, GroupByMixIn, SliceMixIn, StatsMixIn, CoOccur
         """
         return [self.token2id[token] for token in tokens if token in self.token2id]
 
-    def tf_idf(self, norm: str = 'l2', use_idf: bool = True, smooth_idf: bool = True) -> IVectorizedCorpus:
+    def tf_idf(
+        self,
+        norm: str = 'l2',
+        use_idf: bool = True,
+        smooth_idf: bool = True,
+        inplace: bool = False,
+        dtype: np.dtype = None,
+    ) -> IVectorizedCorpus:
         """Returns a (normalized) TF-IDF transformed version of the corpus
 
-        Calls sklearn's TfidfTransformer
+        Computes the same weights as sklearn's TfidfTransformer, but directly on the CSR data array
         https://scikit-learn.org/stable/modules/generated/sklearn.feature_extraction.text.TfidfTransformer.html#sklearn-feature-extraction-text-tfidftransformer
         https://scikit-learn.org/stable/modules/feature_extraction.html#tfidf-term-weighting
         Parameters
@@ -350,25 +389,33 @@ class VectorizedCorpus(StoreMixIn, GroupByMixIn, SliceMixIn, StatsMixIn, CoOccur
             Indicates if an IDF reweighting should be done
         smooth_idf : bool, optional
             Adds 1 to document frequencies to smooth the IDF weights, by default True
+        inplace : bool, optional
+            Transform this corpus instead of creating a new corpus, by default False
+        dtype : np.dtype, optional
+            Float type of result (e.g. np.float32), by default None (float64 or existing float type)
 
         Returns
         -------
         VectorizedCorpus
             The TF-IDF transformed corpus
         """
-        transformer = TfidfTransformer(norm=norm, use_idf=use_idf, smooth_idf=smooth_idf)
-
-        tfidf_bag_term_matrix = transformer.fit_transform(self._bag_term_matrix)
-
-        n_corpus = VectorizedCorpus(
-            bag_term_matrix=tfidf_bag_term_matrix,
-            token2id=self.token2id,
-            document_index=self.document_index,
-            overridden_term_frequency=self._overridden_term_frequency,
-            **self.payload,
-        )
+        btm: scipy.sparse.csr_matrix = utility.csr_float_matrix(self._bag_term_matrix, dtype=dtype, inplace=inplace)
+
+        if use_idf:
+            n_samples, n_features = btm.shape
+            df: np.ndarray = np.full(n_features, int(smooth_idf), dtype=np.float64)
+            for i, j in utility.csr_row_blocks(btm):
+                df += np.bincount(btm.indices[btm.indptr[i] : btm.indptr[j]], minlength=n_features)
+            with np.errstate(divide='ignore'):
+                idf: np.ndarray = np.log((n_samples + int(smooth_idf)) / df) + 1.0
+            utility.multiply_sparse_matrix_by_vector(btm, idf.astype(btm.dtype), axis=0)
+
+        if norm is not None:
+            btm = utility.scale_sparse_matrix_by_vector(
+                btm, utility.sparse_matrix_norms(btm, axis=1, norm=norm), axis=1, inplace=True
+            )
 
-        return n_corpus
+        return self._transformed(btm, inplace=inplace)
 
     def to_bag_of_terms(self, indices: Optional[Iterable[int]] = None) -> Iterable[Iterable[str]]:
         """Returns a document token stream that corresponds to the BoW.
@@ -407,27 +454,34 @@ class VectorizedCorpus(StoreMixIn, GroupByMixIn, SliceMixIn, StatsMixIn, CoOccur
         return term_term_matrix
 
     def find_matching_words(self, word_or_regexp: Set[str], n_max_count: int, descending: bool = False) -> List[str]:
-        """Returns words in corpus that matches candidate tokens"""
-        words = self.pick_n_top_words(
-            find_matching_words_in_vocabulary(self.token2id, word_or_regexp),
-            n_max_count,
-            descending=descending,
-        )
+        """Returns (at most `n_max_count`) words in corpus that matches candidate tokens, ranked by TF"""
+        indices: np.ndarray = self._find_matching_indices(word_or_regexp, n_max_count, descending=descending)
+        words: List[str] = self.search_index.vocabulary[indices].tolist()
         return words
 
     def find_matching_words_indices(
         self, word_or_regexp: List[str], n_max_count: int, descending: bool = False
     ) -> List[int]:
-        """Returns `tokens´ indices` in corpus that matches candidate tokens"""
+        """Returns `tokens´ indices` in corpus that matches candidate tokens, ranked by TF"""
+        indices: List[int] = self._find_matching_indices(word_or_regexp, n_max_count, descending=descending).tolist()
+        return indices
 
-        # FIXME: Use https://github.com/WojciechMula/pyahocorasick to search for words
+    def _find_matching_indices(self, word_or_regexp: List[str], n_max_count: int, descending: bool) -> np.ndarray:
+        return self.search_index.search(
+            word_or_regexp or [], self.cached_term_frequency, n_top=n_max_count, descending=descending
+        )
 
-        indices: List[int] = [
-            self.token2id[token]
-            for token in self.find_matching_words(word_or_regexp, n_max_count, descending=descending)
-            if token in self.token2id
-        ]
-        return indices
+    @property
+    def cached_term_frequency(self) -> np.ndarray:
+        """Global TF, cached until the DTM (or its data array) is replaced or transformed inplace"""
+        btm: scipy.sparse.csr_matrix = self._bag_term_matrix
+        if (
+            self._term_frequency_cache is None
+            or self._term_frequency_cache[0] is not btm
+            or self._term_frequency_cache[1] is not btm.data
+        ):
+            self._term_frequency_cache = (btm, btm.data, self.term_frequency)
+        return self._term_frequency_cache[2]
 
     @staticmethod
     def create(
@@ -457,13 +511,24 @@ class VectorizedCorpus(StoreMixIn, GroupByMixIn, SliceMixIn, StatsMixIn, CoOccur
 
         D, T = document_index.document_id.max() + 1, max(token2id.values()) + 1
 
-        M: lil_matrix = lil_matrix((D, T), dtype=int)
+        document_ids: List[int] = []
+
+        def token_ids_stream() -> Iterable[Iterable[int]]:
+            for document_id, document_token_ids in stream:
+                document_ids.append(document_id)
+                yield document_token_ids
 
-        for document_id, document_token_ids in stream:
-            token_ids, counts = np.unique(document_token_ids, return_counts=True)
-            M[document_id, token_ids] = counts
+        counts: scipy.sparse.csr_matrix = token_ids_to_csr(token_ids_stream(), n_columns=T, dtype=int)
+
+        """Move counted rows (stream order) to their document_id rows"""
+        selector: scipy.sparse.csr_matrix = scipy.sparse.csr_matrix(
+            (np.ones(len(document_ids), dtype=int), (document_ids, np.arange(len(document_ids)))),
+            shape=(D, len(document_ids)),
+        )
+        M: scipy.sparse.csr_matrix = selector @ counts
+        M.sort_indices()
 
-        corpus: VectorizedCorpus = VectorizedCorpus(M.tocsr(), token2id=token2id, document_index=document_index)
+        corpus: VectorizedCorpus = VectorizedCorpus(M, token2id=token2id, document_index=document_index)
 
         if min_tf:
             corpus = corpus.slice_by_tf(min_tf, inplace=True)
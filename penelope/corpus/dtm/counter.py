@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import numbers
+import re
+from collections import defaultdict
+from itertools import repeat
+from typing import Any, Callable, Iterable, List, Mapping, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+try:
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+except ImportError:
+    ENGLISH_STOP_WORDS = frozenset()
+
+# Max number of tokens counted in one vectorized operation
+BLOCK_SIZE: int = 2**20
+
+# Row and column (token id) are packed into a single 64-bit key when counting
+ID_BITS: int = 32
+
+
+def create_analyzer(
+    already_tokenized: bool = True,
+    lowercase: bool = False,
+    stop_words: Iterable[str] = None,
+    token_pattern: str = r"(?u)\b\w+\b",
+) -> Callable[[Any], List[str]]:
+    """Returns a function that turns a document into a list of tokens (same semantics as `CountVectorizer`)
+
+    Args:
+        already_tokenized (bool, optional): Documents are tokens, otherwise text. Defaults to True.
+        lowercase (bool, optional): Lowercase tokens (or text). Defaults to False.
+        stop_words (Iterable[str], optional): Tokens to remove, 'english' for sklearn's stop words. Defaults to None.
+        token_pattern (str, optional): Token pattern used for text documents. Defaults to r"(?u)\b\w+\b".
+    """
+    stop_words = set(ENGLISH_STOP_WORDS if stop_words == 'english' else stop_words or [])
+    pattern: re.Pattern = re.compile(token_pattern)
+
+    if already_tokenized:
+        tokenize: Callable[[Any], List[str]] = (lambda d: [t.lower() for t in d]) if lowercase else list
+    else:
+        tokenize = (lambda d: pattern.findall(d.lower())) if lowercase else pattern.findall
+
+    if not stop_words:
+        return tokenize
+
+    return lambda d: [t for t in tokenize(d) if t not in stop_words]
+
+
+def vocabulary_size(token2id: Mapping[str, int]) -> int:
+    return max(token2id.values()) + 1 if token2id else 0
+
+
+def token_ids_to_csr(
+    documents: Iterable[Iterable[int]], n_columns: int = None, dtype: Any = np.int32, block_size: int = BLOCK_SIZE
+) -> sp.csr_matrix:
+    """Returns a DTM (CSR) with counts of token ids for each document (row) in `documents`.
+
+    Documents are counted in blocks of about `block_size` tokens: each block's (row, token id) pairs are packed
+    into integer keys that are counted by a single `np.unique`, so that rows come out with sorted indices.
+
+    Args:
+        documents (Iterable[Iterable[int]]): token ids (non-negative, any negative id is ignored)
+        n_columns (int, optional): Number of columns. Defaults to None (max token id + 1).
+        dtype (Any, optional): Count data type. Defaults to np.int32.
+    """
+    indptr: List[np.ndarray] = [np.zeros(1, dtype=np.int64)]
+    indices: List[np.ndarray] = []
+    data: List[np.ndarray] = []
+    n_rows, nnz, max_id = 0, 0, -1
+
+    def count_block(block: List[np.ndarray]) -> None:
+        nonlocal n_rows, nnz, max_id
+        ids: np.ndarray = np.concatenate(block) if block else np.zeros(0, dtype=np.int64)
+        rows: np.ndarray = np.repeat(np.arange(len(block), dtype=np.int64), [len(x) for x in block])
+        keep: np.ndarray = ids >= 0
+        keys, counts = np.unique((rows[keep] << ID_BITS) | ids[keep], return_counts=True)
+        columns: np.ndarray = keys & ((1 << ID_BITS) - 1)
+        indptr.append(np.cumsum(np.bincount(keys >> ID_BITS, minlength=len(block))) + nnz)
+        indices.append(columns.astype(np.int32))
+        data.append(counts.astype(dtype))
+        n_rows, nnz = n_rows + len(block), nnz + len(keys)
+        max_id = max(max_id, int(columns.max()) if len(columns) > 0 else -1)
+
+    block: List[np.ndarray] = []
+    block_tokens: int = 0
+    for document in documents:
+        ids: np.ndarray = np.asarray(document, dtype=np.int64).ravel()
+        block.append(ids)
+        block_tokens += len(ids)
+        if block_tokens >= block_size:
+            count_block(block)
+            block, block_tokens = [], 0
+
+    if block or n_rows == 0:
+        count_block(block)
+
+    return sp.csr_matrix(
+        (np.concatenate(data), np.concatenate(indices), np.concatenate(indptr)),
+        shape=(n_rows, max_id + 1 if n_columns is None else n_columns),
+    )
+
+
+def tokens_to_csr(
+    documents: Iterable[List[str]], vocabulary: Mapping[str, int] = None, dtype: Any = np.int32
+) -> Tuple[sp.csr_matrix, Mapping[str, int]]:
+    """Returns a DTM (CSR) for tokenized `documents` and its vocabulary.
+
+    If a `vocabulary` is given, tokens not in the vocabulary are ignored. Otherwise a vocabulary is built with
+    ids in first occurrence order, and then sorted (as `CountVectorizer` does).
+    """
+    if vocabulary is not None:
+        lookup = vocabulary.get
+        matrix: sp.csr_matrix = token_ids_to_csr(
+            (np.fromiter(map(lookup, tokens, repeat(-1)), dtype=np.int64, count=len(tokens)) for tokens in documents),
+            n_columns=vocabulary_size(vocabulary),
+            dtype=dtype,
+        )
+        return matrix, vocabulary
+
+    token2id: defaultdict = defaultdict()
+    token2id.default_factory = token2id.__len__
+    lookup = token2id.__getitem__
+
+    matrix = token_ids_to_csr(
+        (np.fromiter(map(lookup, tokens), dtype=np.int64, count=len(tokens)) for tokens in documents),
+        dtype=dtype,
+    )
+    matrix.resize(matrix.shape[0], len(token2id))
+
+    return sort_vocabulary(matrix, token2id)
+
+
+def sort_vocabulary(bag_term_matrix: sp.csr_matrix, token2id: Mapping[str, int]) -> Tuple[sp.csr_matrix, dict]:
+    """Renumbers (inplace) columns so that ids are in alphabetical token order, returns matrix and new vocabulary"""
+    tokens: List[str] = [None] * len(token2id)
+    for token, token_id in token2id.items():
+        tokens[token_id] = token
+
+    order: List[int] = sorted(range(len(tokens)), key=tokens.__getitem__)
+    ranks: np.ndarray = np.empty(len(tokens), dtype=bag_term_matrix.indices.dtype)
+    ranks[order] = np.arange(len(tokens), dtype=ranks.dtype)
+
+    bag_term_matrix.indices = ranks[bag_term_matrix.indices]
+    bag_term_matrix.has_sorted_indices = False
+    bag_term_matrix.sort_indices()
+
+    return bag_term_matrix, dict(zip(map(tokens.__getitem__, order), range(len(tokens))))
+
+
+def document_frequency_indices(bag_term_matrix: sp.spmatrix, max_df: float = 1.0, min_df: int = 1) -> np.ndarray:
+    """Returns (sorted) indices of terms whose document frequency is within bounds.
+    Integer bounds are document counts, float bounds are proportions of documents (as in CountVectorizer)."""
+    n_documents: int = bag_term_matrix.shape[0]
+    max_count: float = max_df if isinstance(max_df, numbers.Integral) else max_df * n_documents
+    min_count: float = min_df if isinstance(min_df, numbers.Integral) else min_df * n_documents
+    if max_count < min_count:
+        raise ValueError("max_df corresponds to < documents than min_df")
+    document_frequency: np.ndarray = np.bincount(
+        sp.csr_matrix(bag_term_matrix).indices, minlength=bag_term_matrix.shape[1]
+    )
+    indices: np.ndarray = np.flatnonzero((document_frequency >= min_count) & (document_frequency <= max_count))
+    if len(indices) == 0:
+        raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+    return indices
+
+
+def max_features_indices(bag_term_matrix: sp.spmatrix, max_features: int) -> np.ndarray:
+    """Returns (sorted) indices of the `max_features` most frequent terms (ties broken as in CountVectorizer)"""
+    term_frequency: np.ndarray = np.asarray(bag_term_matrix.sum(axis=0)).ravel()
+    return np.sort((-term_frequency).argsort()[:max_features])
@@ -13,7 +13,7 @@ from ..document_index import (
     KNOWN_TIME_PERIODS,
     DocumentIndexHelper,
     TimePeriodSpecifier,
-    create_time_period_categorizer,
+    categorize_time_period,
 )
 from .interface import IVectorizedCorpus, IVectorizedCorpusProtocol, VectorizedCorpusError
 
@@ -129,8 +129,8 @@ class GroupByMixIn:
                 target_column_name=target_column_name,
             )
 
-        self.document_index[target_column_name] = self.document_index.year.apply(
-            create_time_period_categorizer(time_period_specifier)
+        self.document_index[target_column_name] = categorize_time_period(
+            self.document_index.year, time_period_specifier
         )
 
         corpus = self.group_by_pivot_column(
@@ -151,7 +151,7 @@ class GroupByMixIn:
         target_column_name: str = 'time_period',
     ) -> IVectorizedCorpus:
         """Groups corpus by specified time_period_specifier.
-        Uses scipy sparse lil format during construction.
+        Uses a sparse group indicator matrix during construction.
         Args:
             time_period_specifier (Union[str, dict]): [description]
             aggregate (str, optional): [description]. Defaults to 'sum'.
@@ -251,13 +251,12 @@ class GroupByMixIn:
 
         def default_document_namer(df: pd.DataFrame) -> pd.Series:
             """Default name that just joins the grouping key values to a single string"""
-            return df[[temporal_key] + pivot_keys].apply(lambda x: '_'.join([str(t) for t in x]), axis=1)
+            return join_key_values(df, [temporal_key] + pivot_keys)
 
         def _document_index_aggregates(df: pd.DataFrame, grouping_keys: List[str]) -> dict:
             """Creates an aggregate dict to be used in groupby."""
 
-            """Add for group's document ids"""
-            aggs: dict = dict(document_ids=('document_id', list))
+            aggs: dict = {}
 
             """Sum up all available count columns"""
             for count_column in {'n_tokens', 'n_raw_tokens', 'tokens'}.intersection(set(df.columns)):
@@ -265,7 +264,7 @@ class GroupByMixIn:
 
             """Set year to min year for each group"""
             if 'year' in df.columns and 'year' not in grouping_keys:
-                aggs.update(year=('year', min))  # , year_from=('year', min), year_to=('year', max))
+                aggs.update(year=('year', 'min'))  # , year_from=('year', min), year_to=('year', max))
 
             """Add counter for number of documents in each group"""
             if 'n_documents' not in df.columns:
@@ -282,17 +281,22 @@ class GroupByMixIn:
         fdi: pd.DataFrame = di if not pivot_keys or len(filter_opts or []) == 0 else di[filter_opts.mask(di)]
 
         if temporal_key not in fdi.columns:
-            fdi[temporal_key] = fdi['year'].apply(create_time_period_categorizer(temporal_key))
+            fdi[temporal_key] = categorize_time_period(fdi['year'], temporal_key)
 
-        aggs: dict = _document_index_aggregates(fdi, [temporal_key] + pivot_keys)
+        grouping_keys: List[str] = [temporal_key] + pivot_keys
+        aggs: dict = _document_index_aggregates(fdi, grouping_keys)
 
-        gdi: pd.DataFrame = fdi.groupby([temporal_key] + pivot_keys, as_index=False).agg(**aggs)
+        """Group code of each document, codes are numbered in the (sorted) order of the grouped index"""
+        codes: np.ndarray = fdi.groupby(grouping_keys, sort=True).ngroup().values
+
+        gdi: pd.DataFrame = fdi.groupby(grouping_keys, as_index=False, sort=True).agg(**aggs)
+        gdi['group_code'] = np.arange(len(gdi))
         gdi['document_name'] = document_namer(gdi)
         gdi['filename'] = gdi.document_name
 
         if fill_gaps:
             """Add a dummy document for each missing temporal key value"""
-            gdi = fill_temporal_gaps_in_group_document_index(gdi, temporal_key, pivot_keys, aggs)
+            gdi = fill_temporal_gaps_in_group_document_index(gdi, temporal_key, pivot_keys)
 
         gdi['document_id'] = gdi.index.astype(np.int32)
 
@@ -302,18 +306,57 @@ class GroupByMixIn:
         """Set a fixed name for temporal key as well"""
         gdi['time_period'] = gdi[temporal_key]
 
-        category_indices: Mapping[int, List[int]] = gdi['document_ids'].to_dict()
+        """Translate document group codes to (possibly gap filled) result rows"""
+        grouped_rows: pd.DataFrame = gdi[gdi.group_code >= 0]
+        code_to_row: np.ndarray = np.empty(len(grouped_rows), dtype=np.int64)
+        code_to_row[grouped_rows.group_code.values.astype(np.int64)] = grouped_rows.index.values
 
-        if drop_group_ids:
-            gdi.drop(columns='document_ids', inplace=True, errors='ignore')
+        mask: np.ndarray = codes >= 0
+        group_ids: np.ndarray = code_to_row[codes[mask]]
+        document_ids: np.ndarray = fdi['document_id'].values[mask]
 
-        return self.group_by_indices_mapping(
-            document_index=gdi,
-            category_indices=category_indices,
+        gdi.drop(columns='group_code', inplace=True)
+
+        if not drop_group_ids:
+            gdi.insert(
+                len(grouping_keys),
+                'document_ids',
+                pd.Series(group_indices_to_lists(group_ids, document_ids, len(gdi)), index=gdi.index, dtype=object),
+            )
+
+        matrix: sp.csr_matrix = group_DTM_by_indicator_matrix(
+            self.bag_term_matrix,
+            group_ids=group_ids,
+            document_ids=document_ids,
+            n_groups=len(gdi),
             aggregate=aggregate,
             dtype=dtype,
         )
 
+        grouped_corpus: IVectorizedCorpus = self.create(
+            matrix,
+            token2id=self.token2id,
+            document_index=gdi,
+            overridden_term_frequency=self.overridden_term_frequency,
+            **self.payload,
+        )
+        return grouped_corpus
+
+
+def join_key_values(df: pd.DataFrame, keys: List[str], sep: str = '_') -> pd.Series:
+    """Joins the string values of `keys` columns into a single string (column-wise, i.e. vectorized)"""
+    names: pd.Series = df[keys[0]].astype(str)
+    for key in keys[1:]:
+        names = names + sep + df[key].astype(str)
+    return names
+
+
+def group_indices_to_lists(group_ids: np.ndarray, document_ids: np.ndarray, n_groups: int) -> List[List[int]]:
+    """Returns, for each group, the list of document ids found in `group_ids`"""
+    order: np.ndarray = np.argsort(group_ids, kind='stable')
+    splits: np.ndarray = np.cumsum(np.bincount(group_ids, minlength=n_groups))[:-1]
+    return [x.tolist() for x in np.split(document_ids[order], splits)]
+
 
 def group_DTM_by_category_indices_mapping(
     *,
@@ -322,19 +365,23 @@ def group_DTM_by_category_indices_mapping(
     aggregate: str,
     document_index: pd.DataFrame,
     pivot_column_name: str,
-):
-    shape = (len(document_index), bag_term_matrix.shape[1])
-    dtype = np.int32 if np.issubdtype(bag_term_matrix.dtype, np.integer) and aggregate == 'sum' else np.float64
-    matrix: scipy.sparse.lil_matrix = scipy.sparse.lil_matrix(shape, dtype=dtype)
-
-    for document_id, category_value in document_index[pivot_column_name].to_dict().items():
-        indices = category_indices.get(category_value, [])
-        if len(indices) == 0:
-            continue
-        matrix[document_id, :] = (
-            bag_term_matrix[indices, :].mean(axis=0) if aggregate == 'mean' else bag_term_matrix[indices, :].sum(axis=0)
-        )
-
+) -> scipy.sparse.csr_matrix:
+    """Groups DTM rows into the groups of `document_index`, where each group's rows are given by its category value"""
+    dtype = grouped_dtype(bag_term_matrix.dtype, aggregate, np.int32)
+    group_ids, document_ids = flatten_indices_mapping(
+        {
+            document_id: category_indices.get(category_value, [])
+            for document_id, category_value in document_index[pivot_column_name].to_dict().items()
+        }
+    )
+    matrix: scipy.sparse.csr_matrix = group_DTM_by_indicator_matrix(
+        bag_term_matrix,
+        group_ids=group_ids,
+        document_ids=document_ids,
+        n_groups=len(document_index),
+        aggregate=aggregate,
+        dtype=dtype,
+    )
     return matrix
 
 
@@ -351,28 +398,24 @@ def temporal_key_values_with_no_gaps(series: pd.Series, temporal_key: str):
 
 
 def fill_temporal_gaps_in_group_document_index(
-    df: pd.DataFrame, temporal_key: str, pivot_keys: list[str], aggs: dict
+    df: pd.DataFrame, temporal_key: str, pivot_keys: list[str]
 ) -> pd.DataFrame:
+    """Adds an empty document (zero counts and pivot keys) for each temporal key value missing in `df`"""
     sep: str = "_" if pivot_keys else ""
 
-    def to_row(pivot_keys: List[str], aggs: dict, temporal_value: int | float) -> dict:
-        row: dict = {temporal_key: temporal_value}
-        row.update({k: 0 for k in aggs.keys() if k != 'document_ids'})
-        row.update({'document_ids': []})
-        row.update(document_name=f'{temporal_value}{sep}{sep.join(["0"]*len(pivot_keys))}')
-        return row
-
     temporal_key_values: Sequence[T] = set(
         temporal_key_values_with_no_gaps(df[temporal_key], temporal_key=temporal_key)
     )
 
-    missing_values = temporal_key_values - set(df[temporal_key])
-    missing_documents = [to_row(pivot_keys, aggs, temporal_value) for temporal_value in missing_values]
-    df2: pd.DataFrame = (
-        pd.DataFrame(data=None, columns=df.columns, index=[], dtype=np.int32)
-        .append(other=missing_documents, ignore_index=True)
-        .fillna(0)
-    )
+    missing_values: List[T] = sorted(temporal_key_values - set(df[temporal_key]))
+
+    df2: pd.DataFrame = pd.DataFrame({temporal_key: missing_values}).reindex(columns=df.columns, fill_value=0)
+    df2['document_name'] = pd.Series(missing_values, dtype=object).astype(str) + sep + sep.join(["0"] * len(pivot_keys))
+    if 'group_code' in df.columns:
+        df2['group_code'] = -1
+    if 'document_ids' in df.columns:
+        df2['document_ids'] = [[] for _ in missing_values]
+
     df = pd.concat([df, df2])
     df.sort_values(by=[temporal_key] + pivot_keys, inplace=True, ascending=True)
     df.reset_index(inplace=True, drop=True)
@@ -388,7 +431,7 @@ def group_DTM_by_category_series(
     category_series: pd.Series,
     categories: List[Union[int, str]],
     aggregate: str,
-) -> np.ndarray:
+) -> scipy.sparse.csr_matrix:
     """Returns a new DTM where rows having same values (as specified by category_series) are grouped.
 
     Args:
@@ -398,22 +441,24 @@ def group_DTM_by_category_series(
         aggregate (str):                            How to reduce rows in category group, `sum` (default) or mean
 
     Returns:
-        np.ndarray: Reduced matrix
+        scipy.sparse.csr_matrix: Reduced matrix
     """
     assert aggregate in {'sum', 'mean'}
 
-    shape = (len(categories), bag_term_matrix.shape[1])
-    dtype = np.int64 if np.issubdtype(bag_term_matrix.dtype, np.integer) and aggregate == 'sum' else np.float64
-    matrix = np.zeros(shape=shape, dtype=dtype)
-    for i, value in enumerate(categories):
-        indices = category_series[category_series == value].index.tolist()
-        if len(indices) == 0:
-            continue
-        if aggregate == 'mean':
-            matrix[i, :] = bag_term_matrix[indices, :].mean(axis=0)
-        else:
-            matrix[i, :] = bag_term_matrix[indices, :].sum(axis=0)
+    dtype = grouped_dtype(bag_term_matrix.dtype, aggregate, np.int64)
+
+    group_ids: np.ndarray = pd.Index(categories).get_indexer(category_series.values)
+    document_ids: np.ndarray = category_series.index.values
 
+    mask: np.ndarray = group_ids >= 0
+    matrix: scipy.sparse.csr_matrix = group_DTM_by_indicator_matrix(
+        bag_term_matrix,
+        group_ids=group_ids[mask],
+        document_ids=document_ids[mask],
+        n_groups=len(categories),
+        aggregate=aggregate,
+        dtype=dtype,
+    )
     return matrix
 
 
@@ -423,23 +468,93 @@ def group_DTM_by_indices_mapping(
     category_indices: Mapping[int, List[int]],
     aggregate: str = 'sum',
     dtype: np.dtype = None,
-):
+) -> sp.csr_matrix:
+    """Groups DTM rows into `n_docs` groups, where `category_indices` maps each group to its DTM rows"""
 
-    shape: Tuple[int, int] = (n_docs, dtm.shape[1])
+    dtype: np.dtype = dtype or grouped_dtype(dtm.dtype, aggregate, np.int32)
 
-    dtype: np.dtype = dtype or (np.int32 if np.issubdtype(dtm.dtype, np.integer) and aggregate == 'sum' else np.float64)
+    group_ids, document_ids = flatten_indices_mapping(category_indices)
 
-    matrix: sp.lil_matrix = sp.lil_matrix(shape, dtype=dtype)
+    matrix: sp.csr_matrix = group_DTM_by_indicator_matrix(
+        dtm, group_ids=group_ids, document_ids=document_ids, n_groups=n_docs, aggregate=aggregate, dtype=dtype
+    )
+    return matrix
+
+
+def grouped_dtype(source_dtype: np.dtype, aggregate: str, integer_dtype: np.dtype) -> np.dtype:
+    """Value type of grouped DTM: `integer_dtype` for summed counts, else source float type (or float64)"""
+    if np.issubdtype(source_dtype, np.integer):
+        return integer_dtype if aggregate == 'sum' else np.float64
+    return source_dtype if np.issubdtype(source_dtype, np.floating) else np.float64
+
+
+def flatten_indices_mapping(category_indices: Mapping[int, Sequence[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Flattens a group to document indices mapping into two aligned (group id, document id) arrays"""
+    sizes: np.ndarray = np.fromiter(
+        (len(indices) for indices in category_indices.values()), dtype=np.int64, count=len(category_indices)
+    )
+    group_ids: np.ndarray = np.repeat(
+        np.fromiter(category_indices.keys(), dtype=np.int64, count=len(category_indices)), sizes
+    )
+    document_ids: np.ndarray = np.fromiter(
+        (i for indices in category_indices.values() for i in indices), dtype=np.int64, count=int(sizes.sum())
+    )
+    return group_ids, document_ids
 
-    if aggregate == 'mean':
 
-        for document_id, indices in category_indices.items():
-            if len(indices) > 0:
-                matrix[document_id, :] = dtm[indices, :].mean(axis=0)
-    else:
+def create_indicator_matrix(
+    group_ids: np.ndarray, document_ids: np.ndarray, shape: Tuple[int, int], dtype: np.dtype = np.int32
+) -> sp.csr_matrix:
+    """Returns a sparse G x D matrix that has a one in (g, d) for each pair in (`group_ids`, `document_ids`)"""
+    return sp.csr_matrix(
+        (np.ones(len(group_ids), dtype=dtype), (np.asarray(group_ids), np.asarray(document_ids))), shape=shape
+    )
+
+
+def group_DTM_by_indicator_matrix(
+    dtm: sp.spmatrix,
+    *,
+    group_ids: np.ndarray,
+    document_ids: np.ndarray,
+    n_groups: int,
+    aggregate: str = 'sum',
+    dtype: np.dtype = None,
+) -> sp.csr_matrix:
+    """Groups DTM rows as a single sparse product G x DTM, where G is the group/document indicator matrix.
+
+    The i:th row in the result aggregates the rows `document_ids[group_ids == i]`. Mean is computed as
+    a diagonal rescale of the summed rows. Groups without documents results in empty rows.
+
+    Args:
+        dtm (sp.spmatrix): Original DTM to group
+        group_ids (np.ndarray): Group (result row) of each pair
+        document_ids (np.ndarray): DTM row of each pair
+        n_groups (int): Number of groups (rows in result)
+        aggregate (str, optional): `sum` or `mean`. Defaults to 'sum'.
+        dtype (np.dtype, optional): Value type of result. Defaults to None (int64 or float64).
+
+    Returns:
+        sp.csr_matrix: Grouped (n_groups x terms) DTM
+    """
+    assert aggregate in {'sum', 'mean'}
+
+    if dtype is None:
+        dtype = grouped_dtype(dtm.dtype, aggregate, np.int64)
+
+    work_dtype: np.dtype = dtype if aggregate == 'sum' or np.issubdtype(dtype, np.floating) else np.float64
+
+    indicator: sp.csr_matrix = create_indicator_matrix(
+        group_ids, document_ids, shape=(n_groups, dtm.shape[0]), dtype=work_dtype
+    )
+
+    matrix: sp.csr_matrix = (indicator @ sp.csr_matrix(dtm)).tocsr()
+
+    if aggregate == 'mean':
+        sizes: np.ndarray = np.bincount(np.asarray(group_ids, dtype=np.int64), minlength=n_groups)
+        scale: np.ndarray = np.divide(1.0, sizes, out=np.zeros(n_groups), where=sizes > 0)
+        matrix = (sp.diags(scale) @ matrix).tocsr()
 
-        for document_id, indices in category_indices.items():
-            if len(indices) > 0:
-                matrix[document_id, :] = dtm[indices, :].sum(axis=0)
+    if matrix.dtype != dtype:
+        matrix = matrix.astype(dtype)
 
     return matrix
@@ -37,6 +37,11 @@ class IVectorizedCorpus(abc.ABC):
     def vocabulary(self) -> List[str]:
         ...
 
+    @property
+    @abc.abstractproperty
+    def vocabulary_array(self) -> np.ndarray:
+        ...
+
     @abc.abstractmethod
     def nlargest(self, n_top: int, sort_indices: bool = False, override: bool = False) -> np.ndarray:
         ...
@@ -129,11 +134,13 @@ class IVectorizedCorpus(abc.ABC):
         ...
 
     @abc.abstractmethod
-    def normalize(self, axis: int = 1, norm: str = 'l1', keep_magnitude: bool = False) -> "IVectorizedCorpus":
+    def normalize(
+        self, axis: int = 1, norm: str = 'l1', keep_magnitude: bool = False, inplace: bool = False, dtype=None
+    ) -> "IVectorizedCorpus":
         ...
 
     @abc.abstractmethod
-    def normalize_by_raw_counts(self) -> "IVectorizedCorpus":
+    def normalize_by_raw_counts(self, inplace: bool = False, dtype=None) -> "IVectorizedCorpus":
         ...
 
     @abc.abstractmethod
@@ -173,7 +180,9 @@ class IVectorizedCorpus(abc.ABC):
         ...
 
     @abc.abstractmethod
-    def tf_idf(self, norm: str = 'l2', use_idf: bool = True, smooth_idf: bool = True) -> "IVectorizedCorpus":
+    def tf_idf(
+        self, norm: str = 'l2', use_idf: bool = True, smooth_idf: bool = True, inplace: bool = False, dtype=None
+    ) -> "IVectorizedCorpus":
         ...
 
     @abc.abstractmethod
@@ -269,6 +278,10 @@ class IVectorizedCorpusProtocol(Protocol):
     def id2token(self) -> Mapping[int, str]:
         ...
 
+    @property
+    def vocabulary_array(self) -> np.ndarray:
+        ...
+
     @property
     def token2id(self) -> Mapping[str, int]:
         ...
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import fnmatch
+import re
+from functools import cached_property
+from typing import Callable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse  # pylint: disable=deprecated-module
+
+NGRAM_SIZE: int = 3
+
+VERIFY_BATCH_SIZE: int = 1024
+
+MAX_CODEPOINT: int = 0x10FFFF
+
+
+def token2id_to_array(token2id: Mapping[str, int]) -> np.ndarray:
+    """Returns vocabulary as an array of tokens indexed by token id"""
+    tokens: np.ndarray = np.empty(len(token2id), dtype=object)
+    tokens[np.fromiter(token2id.values(), dtype=np.int64, count=len(token2id))] = list(token2id.keys())
+    return tokens
+
+
+def is_search_expression(word: str) -> bool:
+    """Returns True if `word` is a wildcard (contains `*`) or a regular expression (enclosed in `|`)"""
+    return "*" in word or is_regexp_expression(word)
+
+
+def is_regexp_expression(word: str) -> bool:
+    return len(word) > 1 and word.startswith("|") and word.endswith("|")
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Translates wildcard (fnmatch) `pattern` to a regular expression that doesn't match across newlines"""
+    expr: str = fnmatch.translate(pattern)
+    if expr.endswith("\\Z"):
+        expr = expr[:-2] + "$"
+    return expr.replace("(?s:", "(?:", 1)
+
+
+def glob_literals(pattern: str) -> Tuple[str, List[str]]:
+    """Splits a wildcard (fnmatch) pattern into its leading literal prefix and all its literal segments"""
+    segments: List[str] = []
+    current: List[str] = []
+    i: int = 0
+    while i < len(pattern):
+        c: str = pattern[i]
+        if c in "*?[":
+            segments.append("".join(current))
+            current = []
+            if c == "[":
+                j: int = pattern.find("]", i + 2)
+                i = j if j >= 0 else len(pattern)
+        else:
+            current.append(c)
+        i += 1
+    segments.append("".join(current))
+    return segments[0], [s for s in segments if s]
+
+
+def regex_literals(pattern: re.Pattern) -> Tuple[str, List[str]]:
+    """Splits a regular expression into the literal prefix and the literal segments that any match must contain
+
+    Only the top level sequence of the expression is inspected, and nothing is returned for case insensitive
+    expressions. The prefix holds for matches anchored at the start of the token (as in re.match).
+    """
+    if pattern.flags & re.IGNORECASE:
+        return "", []
+    segments: List[str] = []
+    current: List[str] = []
+    for op, av in sre_parse.parse(pattern.pattern, pattern.flags):
+        if op is sre_parse.LITERAL:
+            current.append(chr(av))
+            continue
+        if op is sre_parse.AT and av in (sre_parse.AT_BEGINNING, sre_parse.AT_BEGINNING_STRING):
+            if not segments and not current:
+                continue
+        segments.append("".join(current))
+        current = []
+    segments.append("".join(current))
+    return segments[0], [s for s in segments if s]
+
+
+class VocabularySearchIndex:
+    """Search index over a vocabulary.
+
+    The index parts are built lazily at first use:
+        - a sorted token array, used for resolving prefixes into id ranges by binary search
+        - posting lists of token ids for each character n-gram, used for infix and wildcard queries
+
+    Regular expressions are resolved through the index by their literal prefix and segments, and by
+    matching each token in a full scan of the vocabulary if they have none that the index can resolve.
+    Candidates found through the index are verified against the full pattern only when needed,
+    and in descending term frequency order so that verification stops when `n_top` words are found.
+    """
+
+    def __init__(self, token2id: Mapping[str, int], ngram_size: int = NGRAM_SIZE):
+        self.token2id: Mapping[str, int] = token2id
+        self.ngram_size: int = ngram_size
+
+    @cached_property
+    def vocabulary(self) -> np.ndarray:
+        return token2id_to_array(self.token2id)
+
+    @cached_property
+    def _sorted(self) -> Tuple[np.ndarray, np.ndarray]:
+        tokens: List[str] = self.vocabulary.tolist()
+        sorted_ids: np.ndarray = np.array(sorted(range(len(tokens)), key=tokens.__getitem__), dtype=np.int64)
+        return sorted_ids, self.vocabulary[sorted_ids]
+
+    @cached_property
+    def _alphabet(self) -> np.ndarray:
+        """Lookup table from codepoint to dense character code (1..), zero for unused codepoints"""
+        used: np.ndarray = np.zeros(MAX_CODEPOINT + 1, dtype=bool)
+        used[self._codepoints] = True
+        used[0] = False
+        return np.where(used, np.cumsum(used), 0).astype(np.int64)
+
+    @cached_property
+    def _base(self) -> int:
+        return int(self._alphabet.max()) + 1
+
+    @cached_property
+    def _codepoints(self) -> np.ndarray:
+        """Codepoints of all tokens, each token followed by a zero separator"""
+        text: str = "\0".join(self.vocabulary.tolist()) + "\0"
+        return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+    @cached_property
+    def _postings(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns unique n-gram keys, offsets into postings and postings (token ids sorted within each n-gram)"""
+
+        n: int = self.ngram_size
+        n_tokens: int = len(self.vocabulary)
+        codepoints: np.ndarray = self._codepoints
+
+        if len(codepoints) < n or n_tokens == 0:
+            empty: np.ndarray = np.zeros(0, dtype=np.int64)
+            return empty, np.zeros(1, dtype=np.int64), empty
+
+        codes: np.ndarray = self._alphabet[codepoints]
+        base: int = self._base
+
+        size: int = len(codes) - n + 1
+        keys: np.ndarray = np.zeros(size, dtype=np.int64)
+        valid: np.ndarray = np.ones(size, dtype=bool)
+        for k in range(n):
+            window: np.ndarray = codes[k : k + size]
+            keys = keys * base + window
+            valid &= window != 0
+
+        separators: np.ndarray = codes == 0
+        token_ids: np.ndarray = np.cumsum(separators) - separators
+
+        if base**n * n_tokens >= np.iinfo(np.int64).max:
+            order: np.ndarray = np.lexsort((token_ids[:size][valid], keys[valid]))
+            keys, ids = keys[valid][order], token_ids[:size][valid][order]
+        else:
+            """Single sort of (n-gram key, token id) packed into one integer, also removes duplicates"""
+            packed: np.ndarray = np.unique(keys[valid] * n_tokens + token_ids[:size][valid])
+            keys, ids = packed // n_tokens, packed % n_tokens
+
+        distinct: np.ndarray = np.ones(len(keys), dtype=bool)
+        distinct[1:] = (keys[1:] != keys[:-1]) | (ids[1:] != ids[:-1])
+        keys, ids = keys[distinct], ids[distinct]
+
+        starts: np.ndarray = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        offsets: np.ndarray = np.append(starts, len(keys))
+
+        return keys[starts], offsets, ids
+
+    def ngram_key(self, ngram: str) -> int:
+        """Returns key of `ngram` in the posting lists, -1 if `ngram` contains characters not in the vocabulary"""
+        key: int = 0
+        for c in ngram:
+            code: int = int(self._alphabet[ord(c)])
+            if code == 0:
+                return -1
+            key = key * self._base + code
+        return key
+
+    def prefix_ids(self, prefix: str) -> np.ndarray:
+        """Returns ids of all tokens starting with `prefix`"""
+        sorted_ids, sorted_tokens = self._sorted
+        lo: int = int(np.searchsorted(sorted_tokens, prefix, side='left'))
+        hi: int = int(np.searchsorted(sorted_tokens, prefix + chr(MAX_CODEPOINT), side='right'))
+        return sorted_ids[lo:hi]
+
+    def prefixes_ids(self, prefixes: Sequence[str]) -> np.ndarray:
+        """Returns (sorted) ids of all tokens starting with any of `prefixes`"""
+        sorted_ids, sorted_tokens = self._sorted
+        starts: np.ndarray = np.array(list(prefixes), dtype=object)
+        bounds: np.ndarray = np.zeros(len(sorted_tokens) + 1, dtype=np.int64)
+        np.add.at(bounds, np.searchsorted(sorted_tokens, starts, side='left'), 1)
+        np.add.at(bounds, np.searchsorted(sorted_tokens, starts + chr(MAX_CODEPOINT), side='right'), -1)
+        return np.sort(sorted_ids[np.cumsum(bounds[:-1]) > 0])
+
+    def infix_ids(self, literal: str) -> Optional[np.ndarray]:
+        """Returns (sorted) ids of tokens containing all n-grams in `literal`, None if `literal` is too short"""
+        if len(literal) < self.ngram_size:
+            return None
+        unique_keys, offsets, postings = self._postings
+        ids: np.ndarray = None
+        for ngram in {literal[i : i + self.ngram_size] for i in range(len(literal) - self.ngram_size + 1)}:
+            key: int = self.ngram_key(ngram)
+            position: int = int(np.searchsorted(unique_keys, key))
+            if key < 0 or position >= len(unique_keys) or unique_keys[position] != key:
+                return np.zeros(0, dtype=np.int64)
+            posting: np.ndarray = postings[offsets[position] : offsets[position + 1]]
+            ids = posting if ids is None else np.intersect1d(ids, posting, assume_unique=True)
+        return ids
+
+    def literal_ids(self, prefix: str, literals: Iterable[str]) -> Optional[np.ndarray]:
+        """Returns ids of tokens starting with `prefix` and containing `literals`, None if none can be resolved"""
+        ids: np.ndarray = self.prefix_ids(prefix) if prefix else None
+        for literal in literals:
+            literal_ids: np.ndarray = self.infix_ids(literal)
+            if literal_ids is not None:
+                ids = literal_ids if ids is None else np.intersect1d(ids, literal_ids)
+        return ids
+
+    def scan_ids(self, pattern: re.Pattern) -> np.ndarray:
+        """Full scan: returns ids of tokens that matches (re.match) `pattern`"""
+        rx_match: Callable[[str], re.Match] = pattern.match
+        return np.fromiter((i for w, i in self.token2id.items() if rx_match(w)), dtype=np.int64)
+
+    def regex_ids(self, pattern: re.Pattern) -> np.ndarray:
+        """Returns (sorted) ids of tokens that matches (re.match) `pattern`, only index candidates are matched"""
+        ids: np.ndarray = self.literal_ids(*regex_literals(pattern))
+        if ids is None:
+            return np.sort(self.scan_ids(pattern))
+        rx_match: Callable[[str], re.Match] = pattern.match
+        found: np.ndarray = np.fromiter(
+            (rx_match(token) is not None for token in self.vocabulary[ids].tolist()), dtype=bool, count=len(ids)
+        )
+        return np.sort(ids[found])
+
+    def candidates(self, expression: str) -> Tuple[np.ndarray, Optional[re.Pattern]]:
+        """Returns candidate token ids for `expression` and a pattern that candidates must match (None if exact)"""
+
+        if not is_search_expression(expression):
+            token_id: int = self.token2id.get(expression)
+            return np.array([] if token_id is None else [token_id], dtype=np.int64), None
+
+        if is_regexp_expression(expression):
+            pattern: re.Pattern = re.compile(expression.strip('|'))
+            prefix, literals = regex_literals(pattern)
+        else:
+            pattern = re.compile(glob_to_regex(expression))
+            prefix, literals = glob_literals(expression)
+            if expression == f"{prefix}*":
+                return self.prefix_ids(prefix) if prefix else np.arange(len(self.vocabulary)), None
+
+        ids: np.ndarray = self.literal_ids(prefix, literals)
+
+        if ids is None:
+            return self.scan_ids(pattern), None
+
+        return ids, pattern
+
+    def search(
+        self,
+        expressions: Iterable[str],
+        term_frequency: np.ndarray,
+        n_top: int = None,
+        descending: bool = False,
+    ) -> np.ndarray:
+        """Returns ids of the `n_top` most frequent tokens that matches any of `expressions`
+
+        Words in `expressions` are either plain words, wildcards (e.g. `info*`) or regular expressions
+        enclosed in `|` (e.g. `|.*tion$|`).
+
+        Args:
+            expressions (Iterable[str]): words and/or patterns
+            term_frequency (np.ndarray): token frequencies used for ranking
+            n_top (int, optional): max number of tokens to return. Defaults to None (all).
+            descending (bool, optional): Return most frequent first. Defaults to False (least frequent first).
+
+        Returns:
+            np.ndarray: matching token ids, ordered by term frequency
+        """
+        exact_ids: List[np.ndarray] = []
+        verify: List[Tuple[np.ndarray, re.Pattern]] = []
+
+        for expression in expressions:
+            if not expression:
+                continue
+            ids, pattern = self.candidates(expression)
+            if pattern is None:
+                exact_ids.append(ids)
+            else:
+                verify.append((ids, pattern))
+
+        exact: np.ndarray = np.unique(np.concatenate(exact_ids)) if exact_ids else np.zeros(0, dtype=np.int64)
+
+        if verify:
+            exact = np.union1d(exact, self._verified_ids(verify, term_frequency, n_top))
+
+        ranked: np.ndarray = exact[np.argsort(-term_frequency[exact], kind='stable')]
+
+        if n_top:
+            ranked = ranked[:n_top]
+
+        return ranked if descending else ranked[::-1]
+
+    def _verified_ids(
+        self, candidates: List[Tuple[np.ndarray, re.Pattern]], term_frequency: np.ndarray, n_top: int
+    ) -> np.ndarray:
+        """Returns ids of (at least `n_top` most frequent) candidates that matches their pattern"""
+        found: List[int] = []
+        for ids, pattern in candidates:
+            ranked: np.ndarray = ids[np.argsort(-term_frequency[ids], kind='stable')]
+            matches: int = 0
+            for start in range(0, len(ranked), VERIFY_BATCH_SIZE):
+                batch: np.ndarray = ranked[start : start + VERIFY_BATCH_SIZE]
+                for token_id, token in zip(batch.tolist(), self.vocabulary[batch].tolist()):
+                    if pattern.match(token):
+                        found.append(token_id)
+                        matches += 1
+                if n_top and matches >= n_top:
+                    break
+        return np.array(found, dtype=np.int64)
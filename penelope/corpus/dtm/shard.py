@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing import get_context
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+import more_itertools
+import numpy as np
+import scipy.sparse as sp
+
+from .counter import create_analyzer, tokens_to_csr, vocabulary_size
+
+DEFAULT_SHARD_SIZE: int = 1000
+
+# Vectorize options shared by all shards, set once per worker process by `_initialize_process_state`
+_shard_opts: dict = None
+
+
+@dataclass
+class DTMShard:
+    """A vectorized chunk of documents stored on disk.
+
+    The shard's DTM is stored in `filename` (CSR, .npz) and its vocabulary in `vocabulary_filename` (.npz, see
+    `save_tokens`).
+    If the vocabulary is local to the shard (no shared vocabulary), it is sorted and the columns of the DTM
+    are in vocabulary order, otherwise columns are the ids of the shared vocabulary.
+    """
+
+    index: int
+    filename: str
+    vocabulary_filename: Optional[str]
+    document_names: List[str]
+    nnz: int
+
+    def load(self) -> Tuple[sp.csr_matrix, Optional[np.ndarray]]:
+        matrix: sp.csr_matrix = sp.load_npz(self.filename).tocsr()
+        vocabulary: np.ndarray = load_tokens(self.vocabulary_filename) if self.vocabulary_filename else None
+        return matrix, vocabulary
+
+
+def save_tokens(filename: str, tokens: Sequence[str]) -> None:
+    """Stores `tokens` length-prefixed, i.e. as concatenated UTF-8 bytes and end offsets, in a .npz file.
+    Unlike a fixed-width string array, the size doesn't depend on the longest token."""
+    encoded: List[bytes] = [token.encode('utf-8') for token in tokens]
+    np.savez(
+        filename,
+        data=np.frombuffer(b''.join(encoded), dtype=np.uint8),
+        offsets=np.cumsum([len(x) for x in encoded], dtype=np.int64),
+    )
+
+
+def load_tokens(filename: str) -> np.ndarray:
+    """Loads tokens stored by `save_tokens` as an object array"""
+    with np.load(filename, allow_pickle=False) as store:
+        data: bytes = store['data'].tobytes()
+        offsets: List[int] = store['offsets'].tolist()
+    tokens: np.ndarray = np.empty(len(offsets), dtype=object)
+    tokens[:] = [data[start:end].decode('utf-8') for start, end in zip([0] + offsets[:-1], offsets)]
+    return tokens
+
+
+def _initialize_process_state(opts: dict) -> None:
+    global _shard_opts  # pylint: disable=global-statement
+    _shard_opts = dict(
+        **opts,
+        analyzer=create_analyzer(
+            already_tokenized=opts['already_tokenized'],
+            lowercase=opts['lowercase'],
+            stop_words=opts['stop_words'],
+            token_pattern=opts['token_pattern'],
+        ),
+    )
+
+
+def _vectorize_shard(args: Tuple[int, List[str], List[Any]]) -> DTMShard:
+    """Vectorizes a chunk of documents and stores the result as a shard in the shard folder"""
+
+    index, document_names, documents = args
+
+    analyzer: Callable[[Any], List[str]] = _shard_opts['analyzer']
+
+    matrix, token2id = tokens_to_csr(
+        (analyzer(document) for document in documents), vocabulary=_shard_opts['vocabulary'], dtype=_shard_opts['dtype']
+    )
+
+    filename: str = os.path.join(_shard_opts['folder'], f"shard_{index:06}.npz")
+    sp.save_npz(filename, matrix, compressed=False)
+
+    vocabulary_filename: str = None
+    if _shard_opts['vocabulary'] is None:
+        vocabulary_filename = os.path.join(_shard_opts['folder'], f"shard_{index:06}_vocabulary.npz")
+        save_tokens(vocabulary_filename, list(token2id))
+
+    return DTMShard(
+        index=index,
+        filename=filename,
+        vocabulary_filename=vocabulary_filename,
+        document_names=document_names,
+        nnz=matrix.nnz,
+    )
+
+
+def vectorize_shards(
+    stream: Iterable[Tuple[str, Any]],
+    *,
+    folder: str,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    vocabulary: Mapping[str, int] = None,
+    already_tokenized: bool = True,
+    lowercase: bool = False,
+    stop_words: Iterable[str] = None,
+    token_pattern: str = r"(?u)\b\w+\b",
+    dtype: Any = np.int32,
+    processes: int = None,
+) -> List[DTMShard]:
+    """Vectorizes chunks of `shard_size` documents from `stream` and stores each chunk as a shard in `folder`.
+
+    If `processes` is given, shards are vectorized concurrently in a (spawned) process pool. The options
+    (and shared vocabulary) are sent once to each worker and at most `processes` shards are in flight,
+    so that memory used while vectorizing depends on shard size and not on corpus size.
+    """
+
+    opts: dict = dict(
+        folder=folder,
+        vocabulary=vocabulary,
+        already_tokenized=already_tokenized,
+        lowercase=lowercase,
+        stop_words=stop_words,
+        token_pattern=token_pattern,
+        dtype=dtype,
+    )
+
+    def task_stream() -> Iterable[Tuple[int, List[str], List[Any]]]:
+        for index, chunk in enumerate(more_itertools.chunked(stream, shard_size)):
+            yield index, [name for name, _ in chunk], [document for _, document in chunk]
+
+    shards: List[DTMShard] = []
+
+    if not processes:
+
+        _initialize_process_state(opts)
+        shards.extend(_vectorize_shard(args) for args in task_stream())
+
+    else:
+
+        """A plain dict is sent to workers since vocabularies can be defaultdicts with unpicklable factories"""
+        if vocabulary is not None:
+            opts['vocabulary'] = dict(vocabulary)
+
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=get_context("spawn"),
+            initializer=_initialize_process_state,
+            initargs=(opts,),
+        ) as executor:
+
+            pending: Set[Future] = set()
+            for args in task_stream():
+                if len(pending) >= processes:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    shards.extend(future.result() for future in done)
+                pending.add(executor.submit(_vectorize_shard, args))
+
+            shards.extend(future.result() for future in wait(pending).done)
+
+    return sorted(shards, key=lambda shard: shard.index)
+
+
+def merge_shards(
+    shards: List[DTMShard], vocabulary: Mapping[str, int] = None, dtype: Any = np.int32
+) -> Tuple[sp.csr_matrix, Mapping[str, int], List[str]]:
+    """Merges shards (in index order) into a single DTM.
+
+    Local shard vocabularies are merged into a sorted vocabulary, and each shard's columns are remapped
+    to the merged vocabulary. The merged matrix is filled in place one shard at a time, so at most one
+    shard is loaded in addition to the result. Note that the result is a full-size in-memory DTM, i.e. the
+    peak memory of the merge is set by the corpus size (plus one shard and the local vocabularies).
+
+    Returns:
+        Tuple[sp.csr_matrix, Mapping[str, int], List[str]]: DTM, token2id and document names (row order)
+    """
+
+    translations: List[np.ndarray] = [None] * len(shards)
+
+    if vocabulary is None:
+        local_vocabularies: List[np.ndarray] = [load_tokens(shard.vocabulary_filename) for shard in shards]
+        tokens: np.ndarray = (
+            np.unique(np.concatenate(local_vocabularies)) if local_vocabularies else np.array([], dtype=object)
+        )
+        translations = [np.searchsorted(tokens, local_vocabulary) for local_vocabulary in local_vocabularies]
+        vocabulary = dict(zip(tokens.tolist(), range(len(tokens))))
+        del local_vocabularies
+
+    document_names: List[str] = [name for shard in shards for name in shard.document_names]
+    nnz: int = sum(shard.nnz for shard in shards)
+
+    index_dtype: np.dtype = np.int32 if max(nnz, vocabulary_size(vocabulary)) < np.iinfo(np.int32).max else np.int64
+    indptr: np.ndarray = np.zeros(len(document_names) + 1, dtype=index_dtype)
+    indices: np.ndarray = np.empty(nnz, dtype=index_dtype)
+    data: np.ndarray = np.empty(nnz, dtype=dtype)
+
+    row, offset = 0, 0
+    for shard, translation in zip(shards, translations):
+        matrix, _ = shard.load()
+        n_rows, n_values = matrix.shape[0], matrix.nnz
+        """Translation is monotone (both vocabularies are sorted), so column indices stay sorted"""
+        indices[offset : offset + n_values] = matrix.indices if translation is None else translation[matrix.indices]
+        data[offset : offset + n_values] = matrix.data
+        indptr[row + 1 : row + n_rows + 1] = matrix.indptr[1:] + offset
+        row, offset = row + n_rows, offset + n_values
+
+    bag_term_matrix: sp.csr_matrix = sp.csr_matrix(
+        (data, indices, indptr), shape=(len(document_names), vocabulary_size(vocabulary)), copy=False
+    )
+
+    return bag_term_matrix, vocabulary, document_names
+
+
+def vectorize_sharded(
+    stream: Iterable[Tuple[str, Any]],
+    *,
+    folder: str = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    vocabulary: Mapping[str, int] = None,
+    dtype: Any = np.int32,
+    processes: int = None,
+    **opts,
+) -> Tuple[sp.csr_matrix, Mapping[str, int], List[str]]:
+    """Vectorizes `stream` in shards (see `vectorize_shards`) and returns the merged DTM, token2id and
+    document names. Shards are stored in `folder` if given, otherwise in a temporary folder that is removed.
+
+    Only the vectorization is bounded by shard size, the merged DTM is built in memory at full size."""
+
+    with tempfile.TemporaryDirectory(dir=folder) as shard_folder:
+        shards: List[DTMShard] = vectorize_shards(
+            stream,
+            folder=shard_folder,
+            shard_size=shard_size,
+            vocabulary=vocabulary,
+            dtype=dtype,
+            processes=processes,
+            **opts,
+        )
+        return merge_shards(shards, vocabulary=vocabulary, dtype=dtype)
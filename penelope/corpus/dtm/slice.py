@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import List, Mapping, Sequence, Tuple, Union
+import re
+from typing import Callable, List, Mapping, Sequence, Tuple, Union
 
 import numpy as np
 import scipy.sparse as sp
@@ -10,9 +11,31 @@ from penelope.vendor import textacy_api
 
 from ..token2id import id2token2token2id
 from .interface import IVectorizedCorpus, IVectorizedCorpusProtocol
+from .search import VocabularySearchIndex
 
 # pylint: disable=no-member, attribute-defined-outside-init, access-member-before-definition
 
+TokenPredicate = Union[Callable[[str], bool], str, re.Pattern, Tuple[str, ...]]
+
+
+def matching_token_ids(index: VocabularySearchIndex, px: TokenPredicate) -> np.ndarray:
+    """Returns ids of tokens in `index` for which predicate `px` is true
+
+    Prefixes are resolved by binary search in the sorted vocabulary, and regular expressions are matched only
+    against the candidates that the index finds for their literal parts. Other predicates are called per token.
+    """
+
+    if isinstance(getattr(px, '__self__', None), re.Pattern) and getattr(px, '__name__', None) == 'match':
+        px = px.__self__
+
+    if isinstance(px, tuple):
+        return index.prefixes_ids(px)
+
+    if isinstance(px, (str, re.Pattern)):
+        return index.regex_ids(re.compile(px))
+
+    return np.fromiter((i for w, i in index.token2id.items() if px(w)), dtype=np.int64)
+
 
 class ISlicedCorpusProtocol(IVectorizedCorpusProtocol):
     def slice_by_tf(self, tf_threshold: int) -> IVectorizedCorpus:
@@ -48,6 +71,10 @@ class ISlicedCorpusProtocol(IVectorizedCorpusProtocol):
     def overridden_term_frequency(self) -> np.ndarray:
         ...
 
+    @property
+    def search_index(self) -> VocabularySearchIndex:
+        ...
+
 
 class SliceMixIn:
     def slice_by_tf(
@@ -106,27 +133,25 @@ class SliceMixIn:
 
         return corpus
 
-    # @autojit
-    def slice_by(self: ISlicedCorpusProtocol, px) -> IVectorizedCorpus:
+    def slice_by(self: ISlicedCorpusProtocol, px: TokenPredicate) -> IVectorizedCorpus:
         """Create a subset corpus based on predicate `px`
 
         Parameters
         ----------
-        px : str -> bool
-            Predicate that tests if a word should be kept.
+        px : str -> bool, str, re.Pattern, Tuple[str, ...]
+            Predicate that tests if a word should be kept. A regular expression (str or compiled, or the `match`
+            method of a compiled expression) is matched, and a tuple of strings is prefix tested, on the entire
+            vocabulary at once.
 
         Returns
         -------
         VectorizedCorpus
             Subset containing words for which `px` evaluates to true.
         """
-        indices = [self.token2id[w] for w in self.token2id.keys() if px(w)]
-
-        corpus = self.slice_by_indices(indices)
+        corpus = self.slice_by_indices(matching_token_ids(self.search_index, px))
 
         return corpus
 
-    # @autojit
     def slice_by_indices(self: ISlicedCorpusProtocol, indices: Sequence[int], inplace=False) -> IVectorizedCorpus:
         """Create (or modifies inplace) a subset corpus from given `indices`"""
 
@@ -136,10 +161,10 @@ class SliceMixIn:
         if len(indices) == self.bag_term_matrix.shape[1]:
             return self
 
-        indices.sort()
+        indices: np.ndarray = np.sort(np.asarray(indices, dtype=np.int64))
 
         bag_term_matrix = self.bag_term_matrix[:, indices]
-        token2id = {self.id2token[indices[i]]: i for i in range(0, len(indices))}
+        token2id = dict(zip(self.vocabulary_array[indices].tolist(), range(len(indices))))
 
         overridden_term_frequency = (
             self._overridden_term_frequency[indices] if self._overridden_term_frequency is not None else None
@@ -152,6 +177,7 @@ class SliceMixIn:
         self._bag_term_matrix = bag_term_matrix
         self._token2id = token2id
         self._id2token = None
+        self._vocabulary_array = None
         self._overridden_term_frequency = overridden_term_frequency
 
         return self
@@ -161,31 +187,33 @@ class SliceMixIn:
     ) -> IVectorizedCorpus:
         """Translates corpus to new vocabulary. Tokens not found in target vocabulary are removed."""
 
-        common_tokens: List[str] = sorted(list(set(id2token.values()).intersection(self.token2id.keys())))
         token2id: Mapping[str, int] = id2token2token2id(id2token)
-        og = self.token2id.get
-        ng = token2id.get
 
         D, T = self.data.shape[0], max(id2token) + 1
 
-        old_indicies = [og(token) for token in common_tokens]
-        new_indicies = [ng(token) for token in common_tokens]
+        """Old to new id translation, -1 if token is not in target vocabulary"""
+        tg = token2id.get
+        translation: np.ndarray = np.fromiter(
+            (tg(token, -1) for token in self.vocabulary_array), dtype=np.int64, count=self.data.shape[1]
+        )
+        found: np.ndarray = translation >= 0
 
-        # {self.id2token[x]: f"{x} => {new_indicies[i]}" for i, x in enumerate(old_indicies)}
+        n_common: int = int(found.sum())
 
-        slice_to_keep = self.data.tocsc()[:, old_indicies].tocoo()
+        dtm: sp.coo_matrix = self.data.tocoo()
+        new_col: np.ndarray = translation[dtm.col]
+        keep: np.ndarray = new_col >= 0
 
-        new_dtm = sp.coo_matrix(
-            (slice_to_keep.data, (slice_to_keep.row, [new_indicies[i] for i in slice_to_keep.col])), shape=(D, T)
-        )
+        new_dtm = sp.coo_matrix((dtm.data[keep], (dtm.row[keep], new_col[keep])), shape=(D, T))
 
         logger.warning(
-            f"corpus translated to new vocabulary: {len(common_tokens)} tokens kept, {len(self.token2id) - len(common_tokens)} ({(len(self.token2id) - len(common_tokens))/len(self.token2id):.1%}) removed. "
+            f"corpus translated to new vocabulary: {n_common} tokens kept, {len(self.token2id) - n_common} ({(len(self.token2id) - n_common)/len(self.token2id):.1%}) removed. "
         )
 
-        o_tf: dict = (
-            self.overridden_term_frequency[old_indicies] if self.overridden_term_frequency is not None else None
-        )
+        o_tf: np.ndarray = None
+        if self.overridden_term_frequency is not None:
+            o_tf = np.zeros(T, dtype=self.overridden_term_frequency.dtype)
+            o_tf[translation[found]] = self.overridden_term_frequency[found]
 
         if not inplace:
             corpus: IVectorizedCorpus = self.create(
@@ -199,6 +227,7 @@ class SliceMixIn:
         self._bag_term_matrix = new_dtm
         self._token2id = token2id
         self._id2token = None
+        self._vocabulary_array = None
         self._overridden_term_frequency = o_tf
 
         return self
@@ -239,7 +268,7 @@ class SliceMixIn:
         if len(keep_ids) == 0:
             return self, {}, []
 
-        ids_translation: Mapping[int, int] = {old_id: new_id for new_id, old_id in enumerate(keep_ids)}
+        ids_translation: Mapping[int, int] = dict(zip(keep_ids.tolist(), range(len(keep_ids))))
 
         corpus: IVectorizedCorpus = self.slice_by_indices(keep_ids, inplace=inplace)
 
@@ -3,6 +3,7 @@ from typing import Container, Dict, List, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 from loguru import logger
 
 from .interface import IVectorizedCorpusProtocol
@@ -10,6 +11,18 @@ from .interface import IVectorizedCorpusProtocol
 # pylint: disable=no-member
 
 
+def top_n_positions(values: np.ndarray, n_top: int) -> np.ndarray:
+    """Returns positions of the `n_top` largest `values` (ties in position order), found by partitioning `values`"""
+    if len(values) <= n_top:
+        return np.arange(len(values))
+    if n_top <= 0:
+        return np.zeros(0, dtype=np.int64)
+    threshold = np.partition(values, len(values) - n_top)[len(values) - n_top]
+    above: np.ndarray = np.flatnonzero(values > threshold)
+    ties: np.ndarray = np.flatnonzero(values == threshold)[: n_top - len(above)]
+    return np.concatenate([above, ties])
+
+
 class StatsMixIn:
     def get_top_n_words(
         self: IVectorizedCorpusProtocol,
@@ -41,6 +54,47 @@ class StatsMixIn:
             indices.sort()
         return indices
 
+    def partitioned_top_n_token_ids(
+        self: IVectorizedCorpusProtocol, *, category_column: str = 'category', n_top: int = 100
+    ) -> Tuple[list, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns top `n_top` token ids and counts per category (as defined by `category_column`).
+
+        Counts per category are computed as a single grouped sum (categories x terms). Each category's
+        top `n_top` tokens (with a positive count) are selected by partitioning its row, and only these are
+        ranked by descending count, ties in token id order.
+
+        Returns:
+            Tuple[list, np.ndarray, np.ndarray, np.ndarray]: sorted categories, offsets into ids and counts
+            (categories[i] has ids[offsets[i]:offsets[i+1]]), token ids and counts
+        """
+        codes, categories = pd.factorize(self.document_index[category_column], sort=True)
+        rows: np.ndarray = self.document_index.index.to_numpy()[codes >= 0]
+
+        sum_dtype: np.dtype = np.zeros(0, dtype=self.data.dtype).sum().dtype
+        grouper: sp.csr_matrix = sp.csr_matrix(
+            (np.ones(len(rows), dtype=sum_dtype), (codes[codes >= 0], rows)),
+            shape=(len(categories), self.data.shape[0]),
+        )
+        grouped: sp.csr_matrix = (grouper @ self.data).tocsr()
+        grouped.sum_duplicates()
+
+        """Select each category's top `n_top` entries within its row, then rank only the selected entries"""
+        positions: List[np.ndarray] = [np.zeros(0, dtype=np.int64)]
+        for row in range(grouped.shape[0]):
+            start, end = grouped.indptr[row], grouped.indptr[row + 1]
+            row_positions: np.ndarray = start + np.flatnonzero(grouped.data[start:end] > 0)
+            positions.append(row_positions[top_n_positions(grouped.data[row_positions], n_top)])
+        selected: np.ndarray = np.concatenate(positions)
+
+        group_ids: np.ndarray = np.repeat(np.arange(grouped.shape[0]), np.diff(grouped.indptr))[selected]
+        ids, counts = grouped.indices[selected], grouped.data[selected]
+        order: np.ndarray = np.lexsort((ids, -counts, group_ids))
+
+        offsets: np.ndarray = np.zeros(len(categories) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(group_ids, minlength=len(categories)))
+
+        return categories.tolist(), offsets, ids[order], counts[order]
+
     def get_partitioned_top_n_words(
         self: IVectorizedCorpusProtocol,
         *,
@@ -62,14 +116,15 @@ class StatsMixIn:
         Returns:
             dict:
         """
-        categories = sorted(self.document_index[category_column].unique().tolist())
-        indices_groups = {
-            category: self.document_index[(self.document_index[category_column] == category)].index
-            for category in categories
-        }
+        categories, offsets, ids, counts = self.partitioned_top_n_token_ids(
+            category_column=category_column, n_top=n_top
+        )
+        tokens: List[str] = self.vocabulary_array[ids].tolist()
+        counts: list = list(counts)
+
         data = {
-            str(category): self.get_top_n_words(n=n_top, indices=indices_groups[category])
-            for category in indices_groups
+            str(category): list(zip(tokens[offsets[i] : offsets[i + 1]], counts[offsets[i] : offsets[i + 1]]))
+            for i, category in enumerate(categories)
         }
 
         if keep_empty is False:
@@ -102,26 +157,32 @@ class StatsMixIn:
             Union[pd.DataFrame, dict]: [description]
         """
 
-        partitioned_top_n_words = self.get_partitioned_top_n_words(
-            category_column=category_column, n_top=n_top, pad='*', keep_empty=False
+        categories, offsets, ids, counts = self.partitioned_top_n_token_ids(
+            category_column=category_column, n_top=n_top
         )
 
-        categories = sorted(partitioned_top_n_words.keys())
+        """Non-empty categories become columns, shorter columns are padded with ('*', 0)"""
+        lengths: np.ndarray = np.diff(offsets)
+        n_rows: int = int(lengths.max()) if len(lengths) > 0 else 0
+        columns: np.ndarray = np.repeat(np.arange(len(categories)), lengths)
+        positions: np.ndarray = np.arange(len(ids)) - offsets[columns]
+
+        tokens: np.ndarray = np.full((n_rows, len(categories)), '*', dtype=object)
+        tokens[positions, columns] = self.vocabulary_array[ids]
+
+        category_names: List[str] = [str(category) for category in categories]
+        non_empty: List[int] = np.flatnonzero(lengths > 0).tolist()
+
         if kind == 'token/count':
-            data = {
-                category: [f'{token}/{count}' for token, count in partitioned_top_n_words[category]]
-                for category in categories
-            }
+            tokens[positions, columns] = tokens[positions, columns] + '/' + counts.astype(str).astype(object)
+            tokens[tokens == '*'] = '*/0'
+            data = {category_names[i]: tokens[:, i] for i in non_empty}
         else:
-            data = {category: [token for token, _ in partitioned_top_n_words[category]] for category in categories}
+            data = {category_names[i]: tokens[:, i] for i in non_empty}
             if kind == 'token+count':
-                data = {
-                    **data,
-                    **{
-                        f'{category}/Count': [count for _, count in partitioned_top_n_words[category]]
-                        for category in categories
-                    },
-                }
+                values: np.ndarray = np.zeros((n_rows, len(categories)), dtype=counts.dtype)
+                values[positions, columns] = counts
+                data = {**data, **{f'{category_names[i]}/Count': values[:, i] for i in non_empty}}
 
         df = pd.DataFrame(data=data)
         df = df[sorted(df.columns.tolist())]
@@ -177,16 +238,21 @@ class StatsMixIn:
         n_top: int,
         descending: bool = False,
     ) -> List[str]:
-        """Returns the `n_top` globally most frequent word in `tokens`"""
+        """Returns the `n_top` globally most frequent word in `tokens`, ordered by frequency"""
         words = list(words)
         n_top = n_top or len(words)
         if len(words) < n_top:
             return words
         # FIXME: What to do if overriden term frequency?
         fg = self.token2id.get
-        tf = self.term_frequency
-        token_counts = [tf[fg(w)] for w in words]
-        most_frequent_words = [words[x] for x in np.argsort(token_counts)[-n_top:]]
+        token_ids: np.ndarray = np.fromiter((fg(w) for w in words), dtype=np.int64, count=len(words))
+        token_counts: np.ndarray = self.term_frequency[token_ids]
+        if n_top < len(words):
+            top: np.ndarray = np.argpartition(-token_counts, n_top - 1)[:n_top]
+        else:
+            top = np.arange(len(words))
+        top = top[np.argsort(token_counts[top], kind='stable')]
         if descending:
-            most_frequent_words = list(sorted(most_frequent_words, reverse=descending))
+            top = top[::-1]
+        most_frequent_words = [words[x] for x in top]
         return most_frequent_words
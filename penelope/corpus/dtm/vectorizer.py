@@ -10,12 +10,8 @@ from penelope.utility import PropsMixIn, list_to_unique_list_with_preserved_orde
 from ..document_index import DocumentIndex
 from ..tokenized_corpus import TokenizedCorpus
 from .corpus import VectorizedCorpus
-
-try:
-    from sklearn.feature_extraction.text import CountVectorizer
-except ImportError:
-    ...
-
+from .counter import create_analyzer, document_frequency_indices, max_features_indices, tokens_to_csr
+from .shard import vectorize_sharded
 
 DocumentTermsStream = Iterable[Tuple[str, Iterable[str]]]
 
@@ -29,14 +25,9 @@ class VectorizeOpts(PropsMixIn["VectorizeOpts"]):
     min_df: int = 1
     min_tf: int = 1
     max_tokens: int = None
-
-
-def _no_tokenize(tokens):
-    return tokens
-
-
-def _no_tokenize_lowercase(tokens):
-    return [t.lower() for t in tokens]
+    shard_size: int = None
+    shard_folder: str = None
+    processes: int = None
 
 
 def isiterable(x: Any) -> bool:
@@ -99,8 +90,11 @@ class CorpusVectorizer:
         dtype: Any = np.int32,
         tokenizer: Callable[[str], Iterable[str]] = None,
         token_pattern=r"(?u)\b\w+\b",
+        shard_size: int = None,
+        shard_folder: str = None,
+        processes: int = None,
     ) -> VectorizedCorpus:
-        """Returns a `VectorizedCorpus` (document-term-matrix, bag-of-word) by applying sklearn's `CountVecorizer` on `corpus`
+        """Returns a `VectorizedCorpus` (document-term-matrix, bag-of-word) of `corpus` (same result as sklearn's `CountVectorizer`)
         If `already_tokenized` is True then the input stream is expected to be tokenized.
         Input stream sort order __MUST__ be the same as document_index sort order.
         Passed `document_index` can be a callable that returns a DocumentIndex. This is necessary
@@ -117,6 +111,9 @@ class CorpusVectorizer:
             min_df (int, optional): Min document frequency (see CountVecorizer). Defaults to 1.
             min_tf (int, optional): Min term frequency. Defaults to None.
             max_tokens (int, optional): Restrict to top max tokens (see `max_features` in CountVectorizer). Defaults to None.
+            shard_size (int, optional): If set, vectorize in shards of this many documents. Defaults to None.
+            shard_folder (str, optional): Folder where (temporary) shards are stored. Defaults to None (system temp).
+            processes (int, optional): Number of processes that vectorize shards. Defaults to None (sequential).
 
         Raises:
             ValueError: [description]
@@ -127,13 +124,16 @@ class CorpusVectorizer:
         Yields:
             Iterator[VectorizedCorpus]: [description]
         """
-        tokenizer: Callable[[str], Iterable[str]] = None
         if vocabulary is None:
             if hasattr(corpus, 'vocabulary'):
                 vocabulary = corpus.vocabulary
             elif hasattr(corpus, 'token2id'):
                 vocabulary = corpus.token2id
 
+        if vocabulary is not None and not isinstance(vocabulary, dict):
+            """Plain lookups only: a Token2Id (open vocabulary) would add unknown tokens"""
+            vocabulary = dict(vocabulary)
+
         if already_tokenized:
 
             heads, corpus = more_itertools.spy(corpus, n=1)
@@ -141,14 +141,8 @@ class CorpusVectorizer:
             if heads:
                 check_tokens_stream(heads[0])
 
-            if lowercase:
-                tokenizer = _no_tokenize_lowercase
-                lowercase = False
-            else:
-                tokenizer = _no_tokenize
-
-        vectorizer_opts: dict = dict(
-            tokenizer=tokenizer,
+        self.vectorizer_opts = dict(
+            already_tokenized=already_tokenized,
             lowercase=lowercase,
             stop_words=stop_words,
             max_df=max_df,
@@ -157,20 +151,40 @@ class CorpusVectorizer:
             max_features=max_tokens,
             token_pattern=token_pattern,
             dtype=dtype,
+            shard_size=shard_size,
         )
 
-        seen_document_names: List[str] = []
-
-        def terms_stream():
-            for name, terms in corpus:
-                seen_document_names.append(name)
-                yield terms
-
-        self.vectorizer = CountVectorizer(**vectorizer_opts)
-        self.vectorizer_opts = vectorizer_opts
-
-        bag_term_matrix = self.vectorizer.fit_transform(terms_stream())
-        token2id: dict = self.vectorizer.vocabulary_
+        if shard_size:
+            bag_term_matrix, token2id, seen_document_names = vectorize_sharded(
+                corpus,
+                folder=shard_folder,
+                shard_size=shard_size,
+                vocabulary=vocabulary,
+                already_tokenized=already_tokenized,
+                lowercase=lowercase,
+                stop_words=stop_words,
+                token_pattern=token_pattern,
+                dtype=dtype,
+                processes=processes,
+            )
+        else:
+            seen_document_names: List[str] = []
+            analyzer: Callable[[Any], List[str]] = create_analyzer(
+                already_tokenized=already_tokenized,
+                lowercase=lowercase,
+                stop_words=stop_words,
+                token_pattern=token_pattern,
+            )
+
+            def terms_stream():
+                for name, terms in corpus:
+                    seen_document_names.append(name)
+                    yield analyzer(terms)
+
+            bag_term_matrix, token2id = tokens_to_csr(terms_stream(), vocabulary=vocabulary, dtype=dtype)
+
+        if vocabulary is None and len(token2id) == 0:
+            raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
 
         document_index_: DocumentIndex = resolve_document_index(corpus, document_index, seen_document_names)
 
@@ -180,6 +194,16 @@ class CorpusVectorizer:
             document_index=document_index_,
         )
 
+        if vocabulary is None:
+            """Same as CountVectorizer: document frequency and max features are ignored for a given vocabulary"""
+            if max_df != 1.0 or min_df != 1:
+                dtm_corpus = dtm_corpus.slice_by_indices(
+                    document_frequency_indices(dtm_corpus.bag_term_matrix, max_df=max_df, min_df=min_df)
+                )
+
+            if max_tokens:
+                dtm_corpus = dtm_corpus.slice_by_indices(max_features_indices(dtm_corpus.bag_term_matrix, max_tokens))
+
         if min_tf and min_tf > 1:
             dtm_corpus = dtm_corpus.slice_by_tf(min_tf)
 
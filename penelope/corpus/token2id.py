@@ -4,9 +4,13 @@ import pathlib
 import zipfile
 from collections import defaultdict
 from collections.abc import MutableMapping
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from fnmatch import fnmatch
+from itertools import repeat
+from multiprocessing import get_context
 from typing import Any, Callable, Container, Iterable, Iterator, Mapping, Optional, Union
 
+import more_itertools
 import pandas as pd
 from loguru import logger
 
@@ -15,6 +19,9 @@ from penelope.utility import path_add_suffix, pickle_to_file, replace_extension,
 
 MAGIC_TOKENS = ["*", GLOBAL_TF_THRESHOLD_MASK_TOKEN]
 
+# Number of documents in each chunk when vocabulary is built in parallel
+DEFAULT_CHUNK_SIZE: int = 1000
+
 # pylint: disable=too-many-public-methods
 
 
@@ -22,12 +29,19 @@ class ClosedVocabularyError(Exception):
     ...
 
 
+def count_tokens(tokens_stream: Iterable[Union[Iterable[str], dict]]) -> tuple[list[str], list[int]]:
+    """Returns tokens in first occurrence order and their counts (a partial vocabulary) for a stream of documents"""
+    partial: Token2Id = Token2Id().ingest_stream(tokens_stream)
+    tf: dict = partial.tf
+    return list(partial.data), [tf[token_id] for token_id in partial.data.values()]
+
+
 def id2token2token2id(id2token: Mapping[int, str]) -> dict:
     if id2token is None:
         return None
     if hasattr(id2token, 'token2id'):
         return id2token.token2id
-    token2id: dict = {v: int(k) for k, v in id2token.items()}
+    token2id: dict = dict(zip(id2token.values(), map(int, id2token.keys())))
     return token2id
 
 
@@ -143,7 +157,17 @@ class Token2Id(MutableMapping):
 
         return self
 
-    def ingest_stream(self, tokens_stream: Iterator[Union[Iterator[str], dict]]) -> "Token2Id":
+    def ingest_stream(
+        self,
+        tokens_stream: Iterator[Union[Iterator[str], dict]],
+        processes: int = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> "Token2Id":
+        """Ingests a stream of documents (tokens or token counts).
+
+        If `processes` is given, partial vocabularies for chunks of `chunk_size` documents are counted in
+        parallel processes and merged in chunk order, which gives the same ids as a sequential ingest.
+        """
         if not self._is_open:
             raise ClosedVocabularyError("cannot ingest into a closed vocabulary")
 
@@ -152,7 +176,10 @@ class Token2Id(MutableMapping):
 
         self._id2token = None
 
-        self._ingest_stream(tokens_stream)
+        if processes:
+            self._ingest_stream_parallel(tokens_stream, processes=processes, chunk_size=chunk_size)
+        else:
+            self._ingest_stream(tokens_stream)
         # self._tf.update(data[t] for tokens in tokens_stream for t in tokens )
         return self
 
@@ -169,6 +196,64 @@ class Token2Id(MutableMapping):
                 for t in d:
                     tf[data[t]] += 1
 
+    def _ingest_stream_parallel(
+        self, tokens_stream: Iterator[Union[Iterator[str], dict]], processes: int, chunk_size: int
+    ) -> None:
+        def chunk_stream() -> Iterable[list[Union[list[str], dict]]]:
+            for chunk in more_itertools.chunked(tokens_stream, chunk_size):
+                yield [d if isinstance(d, dict) else list(d) for d in chunk]
+
+        """Partial vocabularies are merged as soon as all prior chunks are merged, at most 2x`processes` are kept"""
+        pending: dict[Future, int] = {}
+        counted: dict[int, tuple[list[str], list[int]]] = {}
+        n_merged: int = 0
+
+        def merge_counted(futures: Iterable[Future]) -> None:
+            nonlocal n_merged
+            for future in futures:
+                counted[pending.pop(future)] = future.result()
+            while n_merged in counted:
+                self._ingest_counts(*counted.pop(n_merged))
+                n_merged += 1
+
+        with ProcessPoolExecutor(max_workers=processes, mp_context=get_context("spawn")) as executor:
+            for index, chunk in enumerate(chunk_stream()):
+                while len(pending) + len(counted) >= 2 * processes:
+                    merge_counted(wait(pending, return_when=FIRST_COMPLETED).done)
+                pending[executor.submit(count_tokens, chunk)] = index
+            merge_counted(wait(pending).done)
+
+    def _ingest_counts(self, tokens: Iterable[str], counts: Iterable[int]) -> None:
+        tf: defaultdict = self._tf
+        data = self._data
+        for t, v in zip(tokens, counts):
+            tf[data[t]] += v
+
+    def merge(self, other: Union["Token2Id", Mapping[str, int]], tf: Mapping[int, int] = None) -> "Token2Id":
+        """Merges vocabulary `other` (and its TF counts) into this vocabulary.
+
+        New tokens are added in `other`'s id order, hence merging partial vocabularies of consecutive chunks
+        of a stream (in chunk order) gives the same ids as ingesting the entire stream. Tokens have zero TF
+        if `other` has no TF counts.
+        """
+        if not self._is_open:
+            raise ClosedVocabularyError("cannot merge into a closed vocabulary")
+
+        if self._tf is None:
+            self._tf = defaultdict(int)
+
+        self._id2token = None
+
+        if isinstance(other, Token2Id):
+            other, tf = other.data, other.tf if tf is None else tf
+
+        tokens: list[str] = sorted(other, key=other.__getitem__)
+        counts: Iterable[int] = repeat(0) if tf is None else (tf.get(other[t], 0) for t in tokens)
+
+        self._ingest_counts(tokens, counts)
+
+        return self
+
     @property
     def is_open(self) -> bool:
         return self._is_open
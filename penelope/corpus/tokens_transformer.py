@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import inspect
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 
 import numpy as np
 import pandas as pd
@@ -62,46 +62,54 @@ class TokensTransformOpts:
         return {k: v for k, v in self.__dict__.items() if k != 'props' and not k.startswith('_') and not callable(v)}
 
     def mask(self, tokens: pd.Series, token2id: Token2Id = None) -> np.ndarray:
-
-        mask = np.repeat(True, len(tokens))
+        """Returns mask for `tokens` that satisfies opts. Since all criterias are token-wise, the mask is
+        computed for the document's distinct tokens and then expanded to the tokens."""
 
         if len(tokens) == 0:
-            return mask
+            return np.repeat(True, len(tokens))
+
+        codes, uniques = pd.factorize(tokens)
+        if (codes < 0).any():
+            """Missing values are not factorized (no sentinel-free option that is portable between versions)"""
+            codes, uniques = np.arange(len(tokens)), tokens.values
+        uniques: pd.Series = pd.Series(uniques)
 
         if np.issubdtype(tokens.dtype, np.integer):
             if token2id is None:
                 raise ValueError("mask(id): vocabulary is missing")
 
-            tokens = tokens.apply(token2id.id2token.get)
+            uniques = uniques.apply(token2id.id2token.get)
+
+        mask: np.ndarray = np.repeat(True, len(uniques))
 
         if self.min_len > 1:
-            mask &= tokens.str.len() >= self.min_len
+            mask &= uniques.str.len() >= self.min_len
 
         if self.max_len:
-            mask &= tokens.str.len() <= self.max_len
+            mask &= uniques.str.len() <= self.max_len
 
         if self.only_alphabetic:
-            mask &= tokens.apply(lambda t: all(c in transforms.ALPHABETIC_CHARS for c in t))
+            mask &= uniques.apply(lambda t: all(c in transforms.ALPHABETIC_CHARS for c in t))
 
         if self.only_any_alphanumeric:
-            mask &= tokens.apply(lambda t: any(c.isalnum() for c in t))
+            mask &= uniques.apply(lambda t: any(c.isalnum() for c in t))
 
         if self.remove_accents:
             # FIXME Not implemented
             pass
 
         if self.remove_stopwords:
-            mask &= ~tokens.isin(transforms.load_stopwords(self.stopwords, self.extra_stopwords))
+            mask &= ~uniques.isin(transforms.load_stopwords(self.stopwords, self.extra_stopwords))
 
         if not self.keep_numerals:
-            mask &= ~tokens.str.isnumeric()
+            mask &= ~uniques.str.isnumeric()
 
         if not self.keep_symbols:
-            mask &= ~tokens.apply(lambda t: all(c in transforms.SYMBOLS_CHARS for c in t))
+            mask &= ~uniques.apply(lambda t: all(c in transforms.SYMBOLS_CHARS for c in t))
 
-        mask &= tokens != ''
+        mask &= uniques != ''
 
-        return mask
+        return np.asarray(mask, dtype=bool)[codes]
 
     def ingest(self, opts: dict) -> TokensTransformOpts:
         self.to_lower = opts.get('to_lower', self.to_lower)
@@ -132,22 +140,52 @@ def transformer_defaults_filter(opts: Dict[str, Any]):
 
 
 class TokensTransformerBase:
-    """Transforms applied on tokenized text"""
+    """Transforms applied on tokenized text
+
+    If all transforms are elementwise (i.e. token-wise filters and mappers, such as the built-in transforms),
+    the transformer runs in vectorized mode. The composed transform is then computed once per distinct token
+    and stored in a vocabulary map, and a document is transformed in a single pass of lookups regardless of
+    the number of transforms. A single transform is already a single pass and is applied as is."""
 
-    def __init__(self):
+    def __init__(self, vectorize: bool = True):
         self.transforms = []
+        self.vectorize: bool = vectorize
+        self.elementwise: bool = True
+        self.vocabulary: Dict[str, Optional[str]] = {}
 
-    def add(self, transform: Callable[[List[str]], List[str]]) -> TokensTransformer:
+    def add(self, transform: Callable[[List[str]], List[str]], elementwise: bool = False) -> TokensTransformer:
         self.transforms.append(transform)
+        self.elementwise = self.elementwise and elementwise
+        self.vocabulary.clear()
         return self
 
     def transform(self, tokens: List[str]) -> List[str]:
 
+        if self.vectorize and self.elementwise and len(self.transforms) > 1:
+            return self.transform_vectorized(tokens)
+
         for ft in self.transforms:
             tokens = [x for x in ft(tokens)]
 
         return tokens
 
+    def transform_vectorized(self, tokens: Iterable[str]) -> List[str]:
+        tokens = tokens if isinstance(tokens, list) else list(tokens)
+        vocabulary: Dict[str, Optional[str]] = self.vocabulary
+        unseen: Set[str] = set(tokens).difference(vocabulary)
+        if unseen:
+            vocabulary.update(zip(unseen, map(self.transform_token, unseen)))
+        return [x for x in map(vocabulary.__getitem__, tokens) if x is not None]
+
+    def transform_token(self, token: str) -> Optional[str]:
+        """Returns transformed token, or None if token is filtered out"""
+        tokens: List[str] = [token]
+        for ft in self.transforms:
+            tokens = [x for x in ft(tokens)]
+            if not tokens:
+                return None
+        return tokens[0]
+
     # Shortcuts
 
 
@@ -157,38 +195,40 @@ class TokensTransformerMixin:
     def min_chars_filter(self, n_chars) -> TokensTransformer:
         if (n_chars or 0) < 1:
             return self
-        return self.add(transforms.min_chars_filter(n_chars))
+        return self.add(transforms.min_chars_filter(n_chars), elementwise=True)
 
     def max_chars_filter(self, n_chars) -> TokensTransformer:
         if (n_chars or 0) < 1:
             return self
-        return self.add(transforms.max_chars_filter(n_chars))
+        return self.add(transforms.max_chars_filter(n_chars), elementwise=True)
 
     def to_lower(self) -> TokensTransformer:
-        return self.add(transforms.lower_transform())
+        return self.add(transforms.lower_transform(), elementwise=True)
 
     def to_upper(self) -> TokensTransformer:
-        return self.add(transforms.upper_transform())
+        return self.add(transforms.upper_transform(), elementwise=True)
 
     def remove_symbols(self) -> TokensTransformer:
-        return self.add(transforms.remove_symbols()).add(transforms.min_chars_filter(1))
+        return self.add(transforms.remove_symbols(), elementwise=True).add(
+            transforms.min_chars_filter(1), elementwise=True
+        )
 
     def only_alphabetic(self) -> TokensTransformer:
-        return self.add(transforms.only_alphabetic_filter())
+        return self.add(transforms.only_alphabetic_filter(), elementwise=True)
 
     def remove_numerals(self) -> TokensTransformer:
-        return self.add(transforms.remove_numerals())
+        return self.add(transforms.remove_numerals(), elementwise=True)
 
     def remove_stopwords(self, language_or_stopwords=None, extra_stopwords=None) -> TokensTransformer:
         if language_or_stopwords is None:
             return self
-        return self.add(transforms.remove_stopwords(language_or_stopwords, extra_stopwords))
+        return self.add(transforms.remove_stopwords(language_or_stopwords, extra_stopwords), elementwise=True)
 
     def remove_accents(self) -> TokensTransformer:
-        return self.add(transforms.strip_accents)
+        return self.add(lambda tokens: map(transforms.strip_accents, tokens), elementwise=True)
 
     def only_any_alphanumeric(self) -> TokensTransformer:
-        return self.add(transforms.only_any_alphanumeric())
+        return self.add(transforms.only_any_alphanumeric(), elementwise=True)
 
     def ingest(self, opts: TokensTransformOpts):
 
@@ -231,6 +271,6 @@ class TokensTransformerMixin:
 class TokensTransformer(TokensTransformerMixin, TokensTransformerBase):
     """Transforms applied on tokenized text"""
 
-    def __init__(self, transform_opts: TokensTransformOpts):
-        TokensTransformerBase.__init__(self)
+    def __init__(self, transform_opts: TokensTransformOpts, vectorize: bool = True):
+        TokensTransformerBase.__init__(self, vectorize=vectorize)
         self.ingest(transform_opts)
@@ -8,7 +8,6 @@ import ftfy
 import nltk
 
 import penelope.vendor.nltk as nltk_utility
-from penelope.vendor.textacy_api import normalize_whitespace
 
 # pylint: disable=W0601,E0602
 
@@ -94,6 +93,8 @@ def remove_empty_filter():
 
 
 def remove_hyphens(text: str) -> str:
+    if '-' not in text and '¬' not in text:
+        return text
     result = RE_HYPHEN_REGEXP.sub(r"\1\2\n", text)
     return result
 
@@ -146,10 +147,62 @@ def remove_symbols() -> TokensTransformerFunction:
     return lambda tokens: (x.translate(SYMBOLS_TRANSLATION) for x in tokens)
 
 
+class _StripAccentsTranslation(dict):
+    """Lazily filled translation table that maps a character to the ASCII part of its NFD decomposition"""
+
+    def __missing__(self, key: int) -> str:
+        value: str = unicodedata.normalize('NFD', chr(key)).encode('ascii', 'ignore').decode("utf-8")
+        self[key] = value
+        return value
+
+
+STRIP_ACCENTS_TRANSLATION: dict = _StripAccentsTranslation()
+
+
 def strip_accents(text: str) -> str:
-    """https://stackoverflow.com/a/44433664/12383895"""
-    text: str = unicodedata.normalize('NFD', text).encode('ascii', 'ignore').decode("utf-8")
-    return str(text)
+    """https://stackoverflow.com/a/44433664/12383895
+
+    Same as NFD-normalizing the text and dropping non-ASCII characters, but done character by character
+    using a (cached) translation table. This is equivalent since canonical reordering only affects
+    (non-ASCII) combining marks."""
+    if text.isascii():
+        return text
+    return text.translate(STRIP_ACCENTS_TRANSLATION)
+
+
+"""Same passes as textacy's whitespace normalization, but a pass is skipped if a (fast) substring search shows
+that it won't change the text. Line-break and space runs are matched only if they actually change."""
+ZERO_WIDTH_SPACES = '\u200B\u2060\uFEFF'
+RE_ZERO_WIDTH_SPACES: re.Pattern = re.compile(rf"[{ZERO_WIDTH_SPACES}]+")
+RE_LINEBREAK_CHANGES: re.Pattern = re.compile(r"(?:\r\n|[\n\v]){2,}|\r\n|\v")
+RE_NONBREAKING_SPACE_CHANGES: re.Pattern = re.compile(r"[^\S\n\v]{2,}|[^\S\n\v ]")
+
+
+def normalize_whitespace(text: str) -> str:
+    """Replaces zero-width spaces with an empty string, line-breaking spaces with a single newline,
+    and non-breaking spaces with a single space, then strips leading/trailing whitespace."""
+    if any(x in text for x in ZERO_WIDTH_SPACES):
+        text = RE_ZERO_WIDTH_SPACES.sub("", text)
+    if '\r' in text or '\v' in text or '\n\n' in text:
+        text = RE_LINEBREAK_CHANGES.sub("\n", text)
+    text = RE_NONBREAKING_SPACE_CHANGES.sub(" ", text)
+    return text.strip()
+
+
+"""ftfy only changes pure ASCII text that contains HTML entities or control characters"""
+RE_FTFY_ASCII_CANDIDATES: re.Pattern = re.compile(r"[&\x00-\x08\x0b-\x1f\x7f]")
+
+
+def fix_ftfy_text(text: str) -> str:
+    if text.isascii() and RE_FTFY_ASCII_CANDIDATES.search(text) is None:
+        return text
+    return ftfy.fix_text(text)
+
+
+def fix_unicode(text: str) -> str:
+    if text.isascii():
+        return text
+    return unicodedata.normalize("NFC", text)
 
 
 # @deprecated
@@ -159,11 +212,11 @@ def strip_accents(text: str) -> str:
 
 class TEXT_TRANSFORMS:
     fix_hyphenation = remove_hyphens
-    fix_unicode = lambda text: unicodedata.normalize("NFC", text)
+    fix_unicode = fix_unicode
     fix_whitespaces = normalize_whitespace
     fix_accents = strip_accents
     fix_currency_symbols = lambda text: RE_CURRENCY_SYMBOLS.sub("__cur__", text)
-    fix_ftfy_text = ftfy.fix_text
+    fix_ftfy_text = fix_ftfy_text
     fix_encoding = ftfy.fix_encoding
 
 
@@ -29,7 +29,7 @@ def plot_bipartite_dataframe(
         data[[target_name, source_name, 'weight']], target_name, source_name
     )
     args: dict[str, Any] = plot_utility.layout_args(network_layout, network, scale)
-    layout: nu.NodesLayout = (plot_utility.layout_algorithms[network_layout])(network, **args)
+    layout: nu.NodesLayout = plot_utility.compute_layout(network_layout, network, **args)
     p = plot_bipartite_network(network, layout, scale=scale, titles=titles, element_id=element_id)
     bp.show(p)
 
@@ -46,7 +46,7 @@ def plot_highlighted_bipartite_dataframe(
 ):
     network: nx.Graph = nu.create_bipartite_network(network_data, source_name, target_name)
     args = plot_utility.layout_args(network_layout, network, scale)
-    layout_data = (plot_utility.layout_algorithms[network_layout])(network, **args)
+    layout_data = plot_utility.compute_layout(network_layout, network, **args)
     p = plot_bipartite_network(
         network,
         layout_data,
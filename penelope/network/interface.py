@@ -18,3 +18,4 @@ class LayoutAlgorithm:
     engine: Any = None
     layout_function: Any = nx.nx_pydot.pydot_layout
     layout_args: Callable = field(default=noop)
+    warm_start: bool = False
@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Tuple
 from .graphtool.layout import layout_setups as gt_layout_setups
 from .graphviz.layout import layout_setups as gv_layout_setups
 from .interface import LayoutAlgorithm
+from .layout_cache import LAYOUT_CACHE
 from .networkx.layout import layout_setups as nx_layout_setups
 from .networkx.networkx_api import nx
 
@@ -16,8 +17,14 @@ TPoint = Tuple[Number, Number]
 
 
 def layout_network(G: nx.Graph, layout_algorithm: str, **kwargs) -> Tuple[Any, Any]:
+    """Returns layout of `G`, cached for same network structure, algorithm and arguments"""
+    setup: LayoutAlgorithm = layouts[layout_algorithm]
 
-    return layouts[layout_algorithm].layout_network(G, layout_algorithm=layout_algorithm, **kwargs)
+    def compute(pos: dict) -> Tuple[Any, Any]:
+        args: dict = kwargs if pos is None else {**kwargs, 'pos': pos}
+        return setup.layout_network(G, layout_algorithm=layout_algorithm, **args)
+
+    return LAYOUT_CACHE.get(G, layout_algorithm, compute, warm_start=setup.warm_start, **kwargs)
 
 
 def adjust_edge_endpoint(p: TPoint, q: TPoint, d: Number) -> TPoint:
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .networkx.networkx_api import nx
+from .networkx.utility import NodesLayout, edges_to_arrays
+
+DEFAULT_CACHE_SIZE: int = 16
+
+
+def graph_key(network: nx.Graph, weight: str = 'weight') -> str:
+    """Returns a hash of `network`'s nodes, edges and edge weights"""
+    sources, targets, weights = edges_to_arrays(network, weight=weight)
+    digest = hashlib.sha1()
+    for values in (np.array(list(network.nodes), dtype=object), sources, targets, weights.astype(object)):
+        digest.update(pd.util.hash_array(values).tobytes())
+    return digest.hexdigest()
+
+
+class LayoutCache:
+    """LRU cache of network layouts, keyed by network structure and layout algorithm (and its arguments).
+
+    The latest layout computed by each algorithm (and arguments) is kept so that algorithms that support
+    it can be warm started from previous positions when the network changes.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size: int = max_size
+        self.layouts: OrderedDict[str, Any] = OrderedDict()
+        self.latest: Dict[str, NodesLayout] = {}
+
+    def get(
+        self,
+        network: nx.Graph,
+        algorithm: str,
+        compute: Callable[[Optional[NodesLayout]], Any],
+        *,
+        warm_start: bool = False,
+        weight: str = 'weight',
+        **args,
+    ) -> Any:
+        """Returns cached layout of `network`, or computes it by calling `compute` with initial positions
+        (None unless `warm_start` is True and a previous layout exists). Layout can also be a tuple (layout, data)."""
+
+        algorithm_key: str = f"{algorithm}:{weight}:{sorted((k, repr(v)) for k, v in args.items())}"
+        key: str = f"{graph_key(network, weight=weight)}:{algorithm_key}"
+
+        if key in self.layouts:
+            self.layouts.move_to_end(key)
+            return self.layouts[key]
+
+        initial: Optional[NodesLayout] = (
+            self.initial_layout(network, self.latest.get(algorithm_key)) if warm_start else None
+        )
+
+        value: Any = compute(initial)
+
+        self.layouts[key] = value
+        while len(self.layouts) > self.max_size:
+            self.layouts.popitem(last=False)
+
+        self.latest[algorithm_key] = value[0] if isinstance(value, tuple) else value
+
+        return value
+
+    @staticmethod
+    def initial_layout(network: nx.Graph, previous: Optional[NodesLayout]) -> Optional[NodesLayout]:
+        """Returns previous positions of `network`'s nodes, None if no node has a previous position"""
+        if not previous:
+            return None
+        return {node: previous[node] for node in network.nodes if node in previous} or None
+
+    def clear(self) -> None:
+        self.layouts.clear()
+        self.latest.clear()
+
+
+LAYOUT_CACHE: LayoutCache = LayoutCache()
@@ -1,9 +1,10 @@
 from typing import Tuple
 
 import bokeh.models as bm
+import numpy as np
 
 from .networkx.networkx_api import nx
-from .networkx.utility import NodesLayout, layout_edges
+from .networkx.utility import NodesLayout, layout_edges, layout_to_arrays
 
 
 def create_edges_layout_data_source(
@@ -18,7 +19,7 @@ def create_edges_layout_data_source(
 
     _, _, weights, xs, ys = layout_edges(network, layout, weight=weight)
     if isinstance(discrete_divisor, int):
-        weights = [max(1, x // discrete_divisor) for x in weights]
+        weights = np.maximum(1, weights // discrete_divisor)
     # elif project_range is not None:
     #     # same as _project_series_to_range
     #     w_max = max(weights)
@@ -26,12 +27,12 @@ def create_edges_layout_data_source(
     #     weights = [ low + (high - low) * (x / w_max) for x in  weights ]
     elif project_range is not None:
         # same as _project_series_to_range
-        w_max = max(weights)
+        w_max = weights.max()
         low, high = project_range
-        weights = [int(round(max(low, high * (x / w_max)))) for x in weights]
+        weights = np.round(np.maximum(low, high * (weights / w_max))).astype(int)
     else:
-        norm = max(weights) if normalize else 1.0
-        weights = [scale * x / norm for x in weights]
+        norm = weights.max() if normalize else 1.0
+        weights = scale * weights / norm
 
     lines_source = bm.ColumnDataSource(dict(xs=xs, ys=ys, weights=weights))
     return lines_source
@@ -41,12 +42,9 @@ def create_nodes_subset_data_source(
     network: nx.Graph, layout, node_list=None, color_map=None  # pylint: disable=unused-argument
 ) -> bm.ColumnDataSource:
 
-    layout_items = layout.items() if node_list is None else [x for x in layout.items() if x[0] in node_list]
+    nodes, coordinates = layout_to_arrays(layout, node_list)
 
-    nodes, nodes_coordinates = zip(*sorted(layout_items))
-    xs, ys = list(zip(*nodes_coordinates))
-
-    nodes_source = bm.ColumnDataSource(dict(x=xs, y=ys, name=nodes, node_id=nodes))
+    nodes_source = bm.ColumnDataSource(dict(x=coordinates[:, 0], y=coordinates[:, 1], name=nodes, node_id=nodes))
     if color_map is not None:
         nodes_source.add([color_map[x] for x in nodes], "colors")
     return nodes_source
@@ -54,7 +52,6 @@ def create_nodes_subset_data_source(
 
 def create_nodes_data_source(network: nx.Graph, layout) -> bm.ColumnDataSource:  # pylint: disable=unused-argument
 
-    nodes, nodes_coordinates = zip(*sorted([x for x in layout.items()]))
-    nodes_xs, nodes_ys = list(zip(*nodes_coordinates))
-    nodes_source = bm.ColumnDataSource(dict(x=nodes_xs, y=nodes_ys, name=nodes, node_id=nodes))
+    nodes, coordinates = layout_to_arrays(layout)
+    nodes_source = bm.ColumnDataSource(dict(x=coordinates[:, 0], y=coordinates[:, 1], name=nodes, node_id=nodes))
     return nodes_source
@@ -1,6 +1,9 @@
+import numpy as np
+
 from penelope.utility import extend_single
 
 from ..interface import LayoutAlgorithm
+from ..sparse_layout import DEFAULT_ITERATIONS, multilevel_spring_layout
 from .networkx_api import nx
 from .utility import get_bipartite_node_set
 
@@ -15,10 +18,27 @@ def nx_spring_layout(G: nx.Graph, **kwargs):
     k = kwargs.get('K', 0.1)
     args = dict(weight='weight', scale=1.0, k=k)
     args = extend_single(args, kwargs, 'iterations')
+    args = extend_single(args, kwargs, 'pos')
     layout = nx.spring_layout(G, **args)
     return layout, None
 
 
+def nx_multilevel_spring_layout(G: nx.Graph, **kwargs):
+    nodes = list(G)
+    adjacency = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=kwargs.get('weight', 'weight'), format='csr')
+    pos = kwargs.get('pos')
+    initial = None if pos is None else np.array([pos.get(x, (np.nan, np.nan)) for x in nodes], dtype=np.float64)
+    positions = multilevel_spring_layout(
+        adjacency,
+        iterations=kwargs.get('iterations', DEFAULT_ITERATIONS),
+        scale=kwargs.get('scale', 1.0),
+        pos=initial,
+        seed=kwargs.get('seed'),
+    )
+    layout = dict(zip(nodes, positions))
+    return layout, None
+
+
 def nx_shell_layout(G, **kwargs):  # pylint: disable=unused-argument
     if not nx.is_bipartite(G):
         raise Exception("NX: Shell layout only applicable on bipartite graphs")
@@ -38,7 +58,16 @@ def nx_circular_layout(G, **kwargs):  # pylint: disable=unused-argument
 
 
 layout_setups = [
-    LayoutAlgorithm(key='nx_spring_layout', package='nx', name='nx_spring', layout_network=nx_spring_layout),
+    LayoutAlgorithm(
+        key='nx_spring_layout', package='nx', name='nx_spring', layout_network=nx_spring_layout, warm_start=True
+    ),
+    LayoutAlgorithm(
+        key='nx_multilevel_spring_layout',
+        package='nx',
+        name='nx_multilevel_spring',
+        layout_network=nx_multilevel_spring_layout,
+        warm_start=True,
+    ),
     LayoutAlgorithm(key='nx_spectral_layout', package='nx', name='nx_spectral', layout_network=nx_spectral_layout),
     LayoutAlgorithm(key='nx_circular_layout', package='nx', name='nx_circular', layout_network=nx_circular_layout),
     LayoutAlgorithm(key='nx_shell_layout', package='nx', name='nx_shell', layout_network=nx_shell_layout),
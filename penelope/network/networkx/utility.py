@@ -1,9 +1,10 @@
 from numbers import Number
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
-from penelope.utility import clamp_values, extend, list_of_dicts_to_dict_of_lists
+from penelope.utility import extend
 
 from .networkx_api import nx
 
@@ -18,8 +19,44 @@ EdgesLayout = Tuple[Node, Node, Weight, EdgeEndPoints]
 NodesLayout = Dict[Node, Point]
 
 
+def layout_to_arrays(layout: NodesLayout, nodes: Sequence[Node] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns (sorted) nodes in `layout` and their coordinates as a (n, 2) array. Only `nodes` if specified."""
+    if nodes is not None:
+        nodes = set(nodes)
+    keys: List[Node] = sorted(layout.keys() if nodes is None else [x for x in layout.keys() if x in nodes])
+    coordinates: np.ndarray = np.array([layout[x] for x in keys], dtype=np.float64).reshape(len(keys), 2)
+    return np.array(keys, dtype=object), coordinates
+
+
+def edges_to_arrays(network: nx.Graph, weight: str = 'weight') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns edges' source nodes, target nodes and weights as parallel arrays"""
+    edges: List[Tuple[Node, Node, Weight]] = list(network.edges(data=weight))
+    sources, targets, weights = zip(*edges) if edges else ((), (), ())
+    return np.array(sources, dtype=object), np.array(targets, dtype=object), np.asarray(weights)
+
+
+def edges_coordinates(
+    sources: np.ndarray, targets: np.ndarray, layout: NodesLayout
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns xs, ys as (n, 2) arrays of endpoint coordinates, and (n, 2) array of midpoints"""
+    nodes, coordinates = layout_to_arrays(layout)
+    index: pd.Index = pd.Index(nodes)
+    source_idx: np.ndarray = index.get_indexer(sources)
+    target_idx: np.ndarray = index.get_indexer(targets)
+    if (source_idx < 0).any() or (target_idx < 0).any():
+        missing: List[Node] = list(
+            dict.fromkeys(np.concatenate([sources[source_idx < 0], targets[target_idx < 0]]).tolist())
+        )
+        raise KeyError(f"nodes not in layout: {missing}")
+    source_xy: np.ndarray = coordinates[source_idx]
+    target_xy: np.ndarray = coordinates[target_idx]
+    xs: np.ndarray = np.column_stack([source_xy[:, 0], target_xy[:, 0]])
+    ys: np.ndarray = np.column_stack([source_xy[:, 1], target_xy[:, 1]])
+    return xs, ys, (source_xy + target_xy) / 2.0
+
+
 def layout_edges(network: nx.Graph, layout: NodesLayout, weight: str = 'weight') -> EdgesLayout:
-    """Extracts edges´layout data
+    """Extracts edges´layout data as parallel arrays
 
     Args:
         network (nx.Graph): The network.
@@ -27,14 +64,11 @@ def layout_edges(network: nx.Graph, layout: NodesLayout, weight: str = 'weight')
         weight (str, optional): Name if weight attribute. Defaults to 'weight'.
 
     Returns:
-        List[Any, Any, Number, Sequence[Number,Number,Number,Number]]: List of edges as (N, M, w, [Nx, Ny, Mx, My])
+        Tuple[np.ndarray, ...]: Edges as (sources, targets, weights, xs, ys) where xs and ys are lists of [Nx, Mx], [Ny, My]
     """
-    data = [
-        (u, v, d[weight], [layout[u][0], layout[v][0]], [layout[u][1], layout[v][1]])
-        for u, v, d in network.edges(data=True)
-    ]
-
-    return zip(*data)
+    sources, targets, weights = edges_to_arrays(network, weight=weight)
+    xs, ys, _ = edges_coordinates(sources, targets, layout)
+    return sources, targets, weights, list(xs), list(ys)
 
 
 def pandas_to_edges(df: pd.DataFrame, source: str = 'source', target: str = 'target', **edge_attributes) -> List[Edge]:
@@ -52,17 +86,71 @@ def pandas_to_edges(df: pd.DataFrame, source: str = 'source', target: str = 'tar
 
     """
 
-    attr_fields = list(edge_attributes.values())
-    attr_names = {v: k for k, v in edge_attributes.items()}
+    attr_names: List[str] = list(edge_attributes.keys())
+    attr_values: List[list] = [df[column].tolist() for column in edge_attributes.values()]
 
     edges = zip(
-        df[source].values,
-        df[target].values,
-        df[attr_fields].apply(lambda x: {attr_names[k]: v for k, v in x.to_dict().items()}, axis=1),
+        df[source].tolist(),
+        df[target].tolist(),
+        (dict(zip(attr_names, values)) for values in zip(*attr_values)) if attr_names else ({} for _ in range(len(df))),
     )
     return list(edges)
 
 
+def arrays_to_nx(
+    sources: Sequence[Node],
+    targets: Sequence[Node],
+    weights: Sequence[Weight] = None,
+    *,
+    bipartite: bool = False,
+    weight: str = 'weight',
+    attributes: Dict[str, Sequence[Any]] = None,
+) -> nx.Graph:
+    """Creates a new networkx graph from parallel arrays of source nodes, target nodes and (optional) edge values.
+
+    Args:
+        sources (Sequence[Node]): Edges' source nodes.
+        targets (Sequence[Node]): Edges' target nodes.
+        weights (Sequence[Weight], optional): Edges' weights. Defaults to None.
+        bipartite (bool, optional): If True, then a bipartite graph is created. Defaults to False.
+        weight (str, optional): Name of weight attribute. Defaults to 'weight'.
+        attributes (Dict[str, Sequence[Any]], optional): Additional edge attributes (name to values). Defaults to None.
+
+    Returns:
+        nx.Graph: The network
+    """
+    sources, targets = np.asarray(sources).tolist(), np.asarray(targets).tolist()
+
+    G = nx.Graph()
+
+    if bipartite:
+
+        source_nodes: List[Node] = pd.unique(np.asarray(sources, dtype=object)).tolist()
+        target_nodes: List[Node] = pd.unique(np.asarray(targets, dtype=object)).tolist()
+
+        assert (
+            len(set(source_nodes).intersection(target_nodes)) == 0
+        ), "Bipartite graph cannot have overlapping node names!"
+
+        G.add_nodes_from(source_nodes, bipartite=0)
+        G.add_nodes_from(target_nodes, bipartite=1)
+    else:
+        G.add_nodes_from(pd.unique(np.asarray(sources + targets, dtype=object)).tolist())
+
+    if attributes:
+        if weights is not None:
+            attributes = {weight: weights, **attributes}
+        names: List[str] = list(attributes.keys())
+        values: List[list] = [np.asarray(v).tolist() for v in attributes.values()]
+        G.add_edges_from(zip(sources, targets, (dict(zip(names, x)) for x in zip(*values))))
+    elif weights is not None:
+        G.add_weighted_edges_from(zip(sources, targets, np.asarray(weights).tolist()), weight=weight)
+    else:
+        G.add_edges_from(zip(sources, targets))
+
+    return G
+
+
 def df_to_nx(
     df: pd.DataFrame, source: str = 'source', target: str = 'target', bipartite: bool = False, **edge_attributes
 ) -> nx.Graph:
@@ -82,49 +170,26 @@ def df_to_nx(
         df_to_nx(df, source_field='A', target_field='B', weight='W')
 
     """
-    G = nx.Graph()
-
-    if bipartite:
-
-        source_nodes = set(df[source].values)
-        target_nodes = set(df[target].values)
-
-        assert len(source_nodes.intersection(target_nodes)) == 0, "Bipartite graph cannot have overlapping node names!"
-
-        G.add_nodes_from(source_nodes, bipartite=0)
-        G.add_nodes_from(target_nodes, bipartite=1)
-    else:
-        G.add_nodes_from(list(set(df[source]).union(set(df[target]))))
-
-    edges = pandas_to_edges(df, source=source, target=target, **edge_attributes)
-
-    G.add_edges_from(edges)
-
-    return G
+    return arrays_to_nx(
+        df[source].values,
+        df[target].values,
+        bipartite=bipartite,
+        attributes={name: df[column].values for name, column in edge_attributes.items()},
+    )
 
 
 def create_network(
     df: pd.DataFrame, source_field: str = 'source', target_field: str = 'target', weight: str = 'weight'
 ) -> nx.Graph:
     """Creates a network from data in a pandas data frame"""
-    G = nx.Graph()
-    nodes = list(set(list(df[source_field].values) + list(df[target_field].values)))
-    edges = [(x, y, {'weight': z}) for x, y, z in [tuple(x) for x in df[[source_field, target_field, weight]].values]]
-    G.add_nodes_from(nodes)
-    G.add_edges_from(edges)
-    return G
+    return arrays_to_nx(df[source_field].values, df[target_field].values, df[weight].values)
 
 
 def create_bipartite_network(
     df: pd.DataFrame, source_field: str = 'source', target_field: str = 'target', weight: float = 'weight'
 ) -> nx.Graph():
     """Create as bipartite networkx graph from columns in a pandas dataframe"""
-    G = nx.Graph()
-    G.add_nodes_from(set(df[source_field].values), bipartite=0)
-    G.add_nodes_from(set(df[target_field].values), bipartite=1)
-    edges = list(zip(df[source_field].values, df[target_field].values, df[weight].apply(lambda x: dict(weight=x))))
-    G.add_edges_from(edges)
-    return G
+    return arrays_to_nx(df[source_field].values, df[target_field].values, df[weight].values, bipartite=True)
 
 
 def get_sub_network(G: nx.Graph, attribute: str = 'weight', threshold: float = 0.0) -> nx.Graph:
@@ -137,8 +202,8 @@ def get_sub_network(G: nx.Graph, attribute: str = 'weight', threshold: float = 0
     return tng
 
 
-def get_positioned_nodes(network: nx.Graph, layout: NodesLayout, nodes: List[str] = None) -> Dict[str, List]:
-    """Returns nodes layout data as a dict  of lists.
+def get_positioned_nodes(network: nx.Graph, layout: NodesLayout, nodes: List[str] = None) -> Dict[str, np.ndarray]:
+    """Returns nodes layout data as a dict of (column) arrays.
 
     Args:
         network (nx.Graph): The network
@@ -146,19 +211,17 @@ def get_positioned_nodes(network: nx.Graph, layout: NodesLayout, nodes: List[str
         nodes (List[str], optional): Subset of nodes to return.. Defaults to None.
 
     Returns:
-        Dict[List]: Positioned nodes (xs, ys, nodes, node_id, ...attributes) and any additional found attributes
+        Dict[np.ndarray]: Positioned nodes (xs, ys, nodes, node_id, ...attributes) and any additional found attributes
     """
-    layout_items = layout.items() if nodes is None else [x for x in layout.items() if x[0] in nodes]
+    nodes, coordinates = layout_to_arrays(layout, nodes)
 
-    nodes, nodes_coordinates = zip(*sorted(layout_items))
-    xs, ys = list(zip(*nodes_coordinates))
+    attributes: pd.DataFrame = pd.DataFrame.from_dict(dict(network.nodes(data=True)), orient='index')
+    attributes = attributes.reindex(pd.Index(nodes, dtype=object))
 
-    list_of_attribs = [network.nodes[k] for k in nodes]
-    attrib_lists = dict(zip(list_of_attribs[0], zip(*[d.values() for d in list_of_attribs])))
-    attrib_lists.update(dict(x=xs, y=ys, name=nodes, node_id=nodes))
-    dict_of_lists = {k: list(v) for k, v in attrib_lists.items()}
+    data: Dict[str, np.ndarray] = {str(k): attributes[k].to_numpy() for k in attributes.columns}
+    data.update(x=coordinates[:, 0], y=coordinates[:, 1], name=nodes, node_id=nodes)
 
-    return dict_of_lists
+    return data
 
 
 def get_positioned_edges(network: nx.Graph, layout: NodesLayout, sort_attr: str = None) -> List[Dict]:
@@ -245,12 +308,21 @@ def get_positioned_edges_as_dict(network: nx.Graph, layout: NodesLayout, sort_at
 
 
     """
-    list_of_dicts = get_positioned_edges(network, layout, sort_attr)
+    sources, targets, _ = edges_to_arrays(network, weight=None)
+    xs, ys, midpoints = edges_coordinates(sources, targets, layout)
+
+    attributes: pd.DataFrame = pd.DataFrame.from_records([d for _, _, d in network.edges(data=True)])
+
+    data: Dict[str, Any] = dict(
+        source=sources, target=targets, xs=list(xs), ys=list(ys), m_x=midpoints[:, 0], m_y=midpoints[:, 1]
+    )
+    data.update({str(k): attributes[k].to_numpy() for k in attributes.columns})
 
-    dict_of_tuples = list_of_dicts_to_dict_of_lists(list_of_dicts)
-    dict_of_lists = {k: list(v) for k, v in dict_of_tuples.items()}  # convert tuples to lists
+    if sort_attr is not None:
+        order: np.ndarray = np.argsort(data[sort_attr], kind='stable')
+        data = {k: [v[i] for i in order] if isinstance(v, list) else v[order] for k, v in data.items()}
 
-    return dict_of_lists
+    return data
 
 
 def get_positioned_nodes_as_dict(
@@ -260,14 +332,14 @@ def get_positioned_nodes_as_dict(
     nodes = get_positioned_nodes(G, layout)
 
     if node_size in nodes.keys() and node_size_range is not None:
-        nodes['clamped_size'] = clamp_values(nodes[node_size], node_size_range)
+        sizes: np.ndarray = nodes[node_size].astype(np.float64)
+        low, high = node_size_range
+        nodes['clamped_size'] = low + (high - low) * (sizes / sizes.max()) if len(sizes) > 0 else sizes
         node_size = 'clamped_size'
 
     label_y_offset = 'y_offset' if node_size in nodes.keys() else node_size + 8
     if label_y_offset == 'y_offset':
-        nodes['y_offset'] = [y + r for (y, r) in zip(nodes['y'], [r / 2.0 + 8 for r in nodes[node_size]])]
-
-    nodes = {k: list(nodes[k]) for k in nodes}
+        nodes['y_offset'] = nodes['y'] + nodes[node_size] / 2.0 + 8
 
     return nodes
 
@@ -8,7 +8,9 @@ from bokeh.plotting import figure
 from penelope.notebook import widgets_utils as wu
 
 from . import layout_source, metrics
+from .layout_cache import LAYOUT_CACHE
 from .networkx import utility as nu
+from .networkx.layout import nx_multilevel_spring_layout
 from .networkx.networkx_api import nx
 
 # pylint: disable=too-many-arguments,unnecessary-lambda,unsubscriptable-object,unsupported-assignment-operation
@@ -23,8 +25,11 @@ layout_algorithms = {
     'Circular': lambda x, **args: nx.circular_layout(x, **args),
     'Shell': lambda x, **args: nx.shell_layout(x, **args),
     'Kamada-Kawai': lambda x, **args: nx.kamada_kawai_layout(x, **args),
+    'Multilevel Spring': lambda x, **args: nx_multilevel_spring_layout(x, **args)[0],
 }
 
+WARM_START_LAYOUTS = {'Fruchterman-Reingold', 'Multilevel Spring'}
+
 
 def _layout_args(
     layout_algorithm: str, network: nx.Graph, scale: float, weight_name: str = 'weight'
@@ -44,6 +49,9 @@ def _layout_args(
     if layout_algorithm == 'Kamada-Kawai':
         args = dict(dim=2, weight=weight_name, scale=1.0)
 
+    if layout_algorithm == 'Multilevel Spring':
+        args = dict(weight=weight_name, scale=1.0)
+
     if layout_algorithm == "Circular":
         args = dict(dim=2, center=None, scale=1.0)
 
@@ -56,6 +64,18 @@ def _get_layout_algorithm(layout_algorithm: str) -> t.Callable:
     return layout_algorithms.get(layout_algorithm, None)
 
 
+def compute_layout(layout_algorithm: str, network: nx.Graph, **args) -> nu.NodesLayout:
+    """Returns (cached) layout of `network`, warm started from previous layout for spring layouts"""
+    fx: t.Callable = _get_layout_algorithm(layout_algorithm)
+    return LAYOUT_CACHE.get(
+        network,
+        layout_algorithm,
+        lambda pos: fx(network, **args) if pos is None else fx(network, pos=pos, **args),
+        warm_start=layout_algorithm in WARM_START_LAYOUTS,
+        **args,
+    )
+
+
 def _project_series_to_range(series: pd.Series, low: float, high: float) -> pd.Series:
     norm_series = series / series.max()
     return norm_series.apply(lambda x: low + (high - low) * x)
@@ -103,7 +123,7 @@ def _plot_network(
         sub_network = network
 
     args = _layout_args(layout_algorithm, sub_network, scale)
-    layout = (_get_layout_algorithm(layout_algorithm))(sub_network, **args)
+    layout = compute_layout(layout_algorithm, sub_network, **args)
     lines_source = layout_source.create_edges_layout_data_source(
         sub_network,
         layout,
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+DEFAULT_ITERATIONS: int = 50
+
+# Graphs with at most this many nodes are laid out with exact (all pairs) repulsion
+MAX_EXACT_SIZE: int = 300
+
+# Coarsening stops at this size, or when a level doesn't shrink the graph enough
+MIN_COARSE_SIZE: int = 50
+MIN_COARSE_RATIO: float = 0.95
+
+# Approximated repulsion: only nodes within CUTOFF x k repulse, and at most MAX_CELL_SAMPLES nodes
+# are sampled from each cell in a node's 3x3 cell neighbourhood
+CUTOFF: float = 1.5
+MAX_CELL_SAMPLES: int = 4
+NEIGHBOUR_OFFSETS: np.ndarray = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+
+# Levels larger than FULL_ITERATIONS_SIZE get fewer iterations (but at least MIN_LEVEL_ITERATIONS)
+FULL_ITERATIONS_SIZE: int = 1000
+MIN_LEVEL_ITERATIONS: int = 10
+
+# Natural spring length ratio between consecutive (finer/coarser) levels (Walshaw)
+LEVEL_K_RATIO: float = np.sqrt(4.0 / 7.0)
+
+COOLING: float = 0.9
+
+
+def symmetric_adjacency(adjacency: sp.spmatrix) -> sp.csr_matrix:
+    """Returns a symmetric CSR adjacency matrix with (absolute) weights normalized to mean 1, and no self loops"""
+    adjacency = sp.csr_matrix(adjacency, dtype=np.float64)
+    adjacency.data = np.abs(adjacency.data)
+    adjacency = without_self_loops(adjacency.maximum(adjacency.T))
+    if adjacency.nnz > 0:
+        adjacency.data /= adjacency.data.mean()
+    return adjacency
+
+
+def without_self_loops(adjacency: sp.spmatrix) -> sp.csr_matrix:
+    adjacency = sp.csr_matrix(adjacency - sp.diags(adjacency.diagonal()))
+    adjacency.eliminate_zeros()
+    return adjacency
+
+
+def independent_centers(adjacency: sp.csr_matrix, priority: np.ndarray, rounds: int = 10) -> np.ndarray:
+    """Returns a mask of a (maximal) independent set of nodes, picked by `priority` (Luby style rounds).
+
+    In each round, undecided nodes with higher priority than all their undecided neighbours become
+    centers, and their neighbours are covered.
+    """
+    n: int = adjacency.shape[0]
+    rows: np.ndarray = np.repeat(np.arange(n), np.diff(adjacency.indptr))
+    columns: np.ndarray = adjacency.indices
+    center: np.ndarray = np.zeros(n, dtype=bool)
+    undecided: np.ndarray = np.ones(n, dtype=bool)
+
+    for _ in range(rounds):
+        if not undecided.any():
+            break
+        neighbour_priority: np.ndarray = np.full(n, -np.inf)
+        keep: np.ndarray = undecided[columns]
+        np.maximum.at(neighbour_priority, rows[keep], priority[columns[keep]])
+        picked: np.ndarray = undecided & (priority > neighbour_priority)
+        center |= picked
+        undecided &= ~picked
+        undecided[columns[picked[rows]]] = False
+
+    return center | undecided
+
+
+def coarsen(adjacency: sp.csr_matrix, rng: np.random.Generator) -> np.ndarray:
+    """Returns coarse node of each node (0..m-1).
+
+    An independent set of nodes, preferring high degree nodes, are selected as centers, and every
+    other node is merged into its most strongly connected neighbouring center.
+    """
+    n: int = adjacency.shape[0]
+    degree: np.ndarray = np.diff(adjacency.indptr)
+    center: np.ndarray = independent_centers(adjacency, degree + rng.random(n))
+
+    rows: np.ndarray = np.repeat(np.arange(n), degree)
+    keep: np.ndarray = center[adjacency.indices] & ~center[rows]
+    r, c, w = rows[keep], adjacency.indices[keep], adjacency.data[keep]
+    order: np.ndarray = np.lexsort((w, r))
+    r, c = r[order], c[order]
+    last: np.ndarray = np.append(r[1:] != r[:-1], True)
+
+    target: np.ndarray = np.arange(n)
+    target[r[last]] = c[last]
+
+    _, labels = np.unique(target, return_inverse=True)
+    return labels
+
+
+def prolongation(labels: np.ndarray) -> sp.csr_matrix:
+    return sp.csr_matrix((np.ones(len(labels)), (np.arange(len(labels)), labels)))
+
+
+def exact_repulsion(positions: np.ndarray, mass: np.ndarray, k: float) -> np.ndarray:
+    """Returns sum of repulsive forces (k² / distance, scaled by mass) on each node from all other nodes"""
+    delta: np.ndarray = positions[:, None, :] - positions[None, :, :]
+    distance2: np.ndarray = np.maximum((delta**2).sum(axis=2), 1e-9 * k * k)
+    np.fill_diagonal(distance2, np.inf)
+    return (delta * (mass[None, :] * k * k / distance2)[:, :, None]).sum(axis=1)
+
+
+def grid_repulsion(
+    positions: np.ndarray, mass: np.ndarray, k: float, rng: np.random.Generator, max_samples: int = MAX_CELL_SAMPLES
+) -> np.ndarray:
+    """Returns approximate repulsive forces: only nodes within a cutoff distance (found in a grid of cells) repulse.
+
+    At most `max_samples` random nodes are used from each cell in a node's 3x3 cell neighbourhood, and their
+    forces are scaled by the cell's size, which bounds the work per node for crowded cells.
+    """
+    n: int = len(positions)
+    radius: float = CUTOFF * k
+    cells: np.ndarray = np.floor(positions / radius).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    width, height = int(cells[:, 0].max()) + 2, int(cells[:, 1].max()) + 2
+    keys: np.ndarray = cells[:, 0] + cells[:, 1] * width
+
+    order: np.ndarray = np.argsort(keys, kind='stable')
+    if width * height <= 4 * n + 16:
+        cell_size: np.ndarray = np.bincount(keys, minlength=width * height)
+        cell_start: np.ndarray = np.cumsum(cell_size) - cell_size
+        neighbour_keys: np.ndarray = (keys[:, None] + NEIGHBOUR_OFFSETS[:, 0] + NEIGHBOUR_OFFSETS[:, 1] * width).ravel()
+        lo, size = cell_start[neighbour_keys], cell_size[neighbour_keys]
+    else:
+        sorted_keys: np.ndarray = keys[order]
+        neighbour_keys = (keys[:, None] + NEIGHBOUR_OFFSETS[:, 0] + NEIGHBOUR_OFFSETS[:, 1] * width).ravel()
+        lo = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+        size = np.searchsorted(sorted_keys, neighbour_keys, side='right') - lo
+
+    count: np.ndarray = np.minimum(size, max_samples)
+    total: int = int(count.sum())
+
+    i: np.ndarray = np.repeat(np.arange(n), count.reshape(n, -1).sum(axis=1))
+    within: np.ndarray = np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+    sampled_size: np.ndarray = np.repeat(size, count)
+    sampled: np.ndarray = sampled_size > max_samples
+    if sampled.any():
+        within[sampled] = (rng.random(int(sampled.sum())) * sampled_size[sampled]).astype(np.int64)
+    j: np.ndarray = order[np.repeat(lo, count) + within]
+
+    delta: np.ndarray = positions[i] - positions[j]
+    distance2: np.ndarray = (delta**2).sum(axis=1)
+    valid: np.ndarray = (i != j) & (distance2 < radius * radius)
+    i, j, delta = i[valid], j[valid], delta[valid]
+
+    f: np.ndarray = (
+        np.maximum(sampled_size[valid] / max_samples, 1.0)
+        * mass[j]
+        * k
+        * k
+        / np.maximum(distance2[valid], 1e-9 * k * k)
+    )
+    return np.column_stack(
+        [
+            np.bincount(i, weights=delta[:, 0] * f, minlength=n),
+            np.bincount(i, weights=delta[:, 1] * f, minlength=n),
+        ]
+    )
+
+
+def attraction(adjacency: sp.csr_matrix, positions: np.ndarray, k: float) -> np.ndarray:
+    """Returns sum of attractive forces (weight x distance² / k) on each node from its neighbours"""
+    n: int = adjacency.shape[0]
+    rows: np.ndarray = np.repeat(np.arange(n), np.diff(adjacency.indptr))
+    delta: np.ndarray = positions[adjacency.indices] - positions[rows]
+    f: np.ndarray = adjacency.data * np.sqrt((delta**2).sum(axis=1)) / k
+    return np.column_stack(
+        [
+            np.bincount(rows, weights=delta[:, 0] * f, minlength=n),
+            np.bincount(rows, weights=delta[:, 1] * f, minlength=n),
+        ]
+    )
+
+
+def spring_iterations(
+    adjacency: sp.csr_matrix,
+    positions: np.ndarray,
+    mass: np.ndarray,
+    k: float,
+    temperature: float,
+    iterations: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Fruchterman-Reingold iterations (with cooling) starting from `positions`, returns new positions"""
+    exact: bool = len(positions) <= MAX_EXACT_SIZE
+    positions = positions.copy()
+    for _ in range(iterations):
+        repulsion: np.ndarray = (
+            exact_repulsion(positions, mass, k) if exact else grid_repulsion(positions, mass, k, rng)
+        )
+        displacement: np.ndarray = repulsion + attraction(adjacency, positions, k)
+        length: np.ndarray = np.maximum(np.sqrt((displacement**2).sum(axis=1)), 1e-12)
+        step: np.ndarray = np.minimum(length, temperature)
+        positions += displacement * (step / length)[:, None]
+        temperature *= COOLING
+        if step.max() < 1e-3 * k:
+            break
+    return positions
+
+
+def level_iterations(iterations: int, n: int) -> int:
+    """Returns number of iterations for a level with `n` nodes"""
+    return max(MIN_LEVEL_ITERATIONS, int(iterations * min(1.0, np.sqrt(FULL_ITERATIONS_SIZE / n))))
+
+
+def rescale_layout(positions: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """Centers positions at origin and scales them so that max absolute coordinate is `scale`"""
+    if len(positions) == 0:
+        return positions
+    positions = positions - positions.mean(axis=0)
+    extent: float = np.abs(positions).max()
+    return positions * (scale / extent) if extent > 0 else positions
+
+
+def multilevel_spring_layout(
+    adjacency: sp.spmatrix,
+    *,
+    iterations: int = DEFAULT_ITERATIONS,
+    scale: float = 1.0,
+    pos: Optional[np.ndarray] = None,
+    seed: int = None,
+) -> np.ndarray:
+    """Computes a force-directed (spring) layout of a graph given as a sparse adjacency matrix.
+
+    Multilevel Fruchterman-Reingold (Walshaw 2000): the graph is repeatedly coarsened, the coarsest
+    graph is laid out, and the layout is interpolated to and refined at each finer level. Repulsion is
+    exact for small graphs and grid based (with a distance cutoff) otherwise, so that each iteration is
+    linear in the number of nodes and edges.
+
+    Args:
+        adjacency (sp.spmatrix): (Weighted) adjacency matrix, treated as undirected.
+        iterations (int, optional): Max iterations per level. Defaults to DEFAULT_ITERATIONS.
+        scale (float, optional): Max absolute coordinate in result. Defaults to 1.0.
+        pos (Optional[np.ndarray], optional): Initial (n, 2) positions, NaN rows for unknown nodes. If given, only
+            the finest level is refined (warm start). Defaults to None.
+        seed (int, optional): Random seed. Defaults to None.
+
+    Returns:
+        np.ndarray: (n, 2) positions
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    adjacency = symmetric_adjacency(adjacency)
+    n: int = adjacency.shape[0]
+
+    if n <= 1:
+        return np.zeros((n, 2))
+
+    k: float = 1.0 / np.sqrt(n)
+
+    if pos is not None:
+        positions: np.ndarray = warm_start_positions(adjacency, np.asarray(pos, dtype=np.float64), k, rng)
+        positions = spring_iterations(adjacency, positions, np.ones(n), k, k, level_iterations(iterations, n), rng)
+        return rescale_layout(positions, scale)
+
+    levels: List[Tuple[sp.csr_matrix, np.ndarray]] = [(adjacency, np.ones(n))]
+    labels_stack: List[np.ndarray] = []
+    while levels[-1][0].shape[0] > MIN_COARSE_SIZE:
+        fine, fine_mass = levels[-1]
+        labels: np.ndarray = coarsen(fine, rng)
+        m: int = int(labels.max()) + 1
+        if m > MIN_COARSE_RATIO * fine.shape[0]:
+            break
+        P: sp.csr_matrix = prolongation(labels)
+        coarse: sp.csr_matrix = without_self_loops(P.T @ fine @ P)
+        levels.append((coarse, P.T @ fine_mass))
+        labels_stack.append(labels)
+
+    coarsest, mass = levels[-1]
+    k_level: float = k / LEVEL_K_RATIO ** (len(levels) - 1)
+    positions = rng.random((coarsest.shape[0], 2)) * np.sqrt(coarsest.shape[0]) * k_level
+    positions = spring_iterations(coarsest, positions, mass, k_level, np.ptp(positions) / 10.0, 2 * iterations, rng)
+
+    for (fine, fine_mass), labels in zip(reversed(levels[:-1]), reversed(labels_stack)):
+        k_level *= LEVEL_K_RATIO
+        positions = positions[labels] + (rng.random((len(labels), 2)) - 0.5) * 0.1 * k_level
+        positions = spring_iterations(
+            fine, positions, fine_mass, k_level, 2.0 * k_level, level_iterations(iterations, len(labels)), rng
+        )
+
+    return rescale_layout(positions, scale)
+
+
+def warm_start_positions(adjacency: sp.csr_matrix, pos: np.ndarray, k: float, rng: np.random.Generator) -> np.ndarray:
+    """Fills in unknown (NaN) positions with the mean position of known neighbours (or random positions)"""
+    known: np.ndarray = ~np.isnan(pos).any(axis=1)
+    positions: np.ndarray = np.where(known[:, None], pos, 0.0)
+    if known.any():
+        positions[known] = rescale_layout(positions[known], np.sqrt(len(pos)) * k / 2.0)
+    unknown: np.ndarray = ~known
+    if unknown.any():
+        weights: sp.csr_matrix = (adjacency[unknown] @ sp.diags(known.astype(np.float64))).tocsr()
+        total: np.ndarray = np.asarray(weights.sum(axis=1)).ravel()
+        mean: np.ndarray = (weights @ positions) / np.maximum(total, 1e-12)[:, None]
+        spread: float = np.sqrt(len(pos)) * k
+        random: np.ndarray = (rng.random((int(unknown.sum()), 2)) - 0.5) * spread
+        jitter: np.ndarray = (rng.random((int(unknown.sum()), 2)) - 0.5) * 0.1 * k
+        positions[unknown] = np.where((total > 0)[:, None], mean + jitter, random)
+    return positions
@@ -59,7 +59,7 @@ class EditTopicLabelsGUI(mx.AlertMixIn, mx.TopicsStateGui):
 
     def save(self, *_):
         try:
-            self.inferred_topics.topic_token_overview['label'] = self._grid.data['label']
+            self.inferred_topics.update_topic_labels(self._grid.data['label'])
             self.inferred_topics.topic_token_overview.to_csv(
                 jj(self.folder, "topic_token_overview_label.csv"), sep='\t'
             )
@@ -16,7 +16,7 @@ from .. import topic_modelling as ntm
 from .. import widgets_utils as wu
 from . import mixins as mx
 
-LAYOUT_OPTIONS = ['Circular', 'Kamada-Kawai', 'Fruchterman-Reingold']
+LAYOUT_OPTIONS = ['Circular', 'Kamada-Kawai', 'Fruchterman-Reingold', 'Multilevel Spring']
 OUTPUT_OPTIONS = {'Network': 'network', 'Table': 'table', 'Excel': 'XLSX', 'CSV': 'CSV', 'Clipboard': 'clipboard'}
 
 
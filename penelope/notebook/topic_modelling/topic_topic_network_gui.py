@@ -15,7 +15,7 @@ from .. import widgets_utils as wu
 from . import mixins as mx
 from .topic_topic_network_gui_utility import display_topic_topic_network
 
-LAYOUT_OPTIONS = ['Circular', 'Kamada-Kawai', 'Fruchterman-Reingold']
+LAYOUT_OPTIONS = ['Circular', 'Kamada-Kawai', 'Fruchterman-Reingold', 'Multilevel Spring']
 OUTPUT_OPTIONS = {'Network': 'network', 'Table': 'table', 'Excel': 'XLSX', 'CSV': 'CSV', 'Clipboard': 'clipboard'}
 
 # pylint: disable=too-many-instance-attributes
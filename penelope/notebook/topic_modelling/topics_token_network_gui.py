@@ -1,12 +1,18 @@
+from __future__ import annotations
+
 import os
-from typing import Any, Callable, List
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
 
 import ipycytoscape
 import ipywidgets as widgets  # type: ignore
+import numpy as np
 import pandas as pd
 from IPython.display import display
 
 from penelope import topic_modelling, utility
+from penelope.network.layout import layout_network
+from penelope.network.networkx import utility as nu
 from penelope.network.networkx.networkx_api import nx
 from penelope.plot import get_color_palette
 from penelope.utility.filename_fields import FilenameFieldSpecs
@@ -33,6 +39,11 @@ DEFAULT_LAYOUT_ARGUMENTS = {
 }
 MAX_TOPIC_TOKEN_COUNT = 500
 
+# Layouts computed in Python (with positions cached between redraws) and displayed using cytoscape's preset layout
+PRESET_LAYOUTS: Dict[str, str] = {'multilevel spring': 'nx_multilevel_spring_layout'}
+DEFAULT_PRESET_LAYOUT: str = 'nx_multilevel_spring_layout'
+PRESET_LAYOUT_SCALE: float = 1000.0
+
 DEFAULT_TOPIC_NODE_STYLE = {
     'content': 'data(id)',
     'text-valign': 'center',
@@ -96,98 +107,123 @@ def css_styles(topic_ids: List[int], custom_styles: dict) -> dict:
     return styles
 
 
-def to_dict(topics_tokens: pd.DataFrame) -> dict:
+@dataclass
+class TopicsTokensNetworkData:
+    """Topics-tokens bipartite network as parallel arrays.
 
-    unique_topics = topics_tokens.groupby(['topic', 'topic_id']).size().reset_index()[['topic', 'topic_id']]
-    unique_tokens = topics_tokens.groupby('token')['topic_id'].apply(list)
-
-    source_network_data = {
-        'nodes': [
-            {
-                "data": {
-                    "id": node['topic'],
-                    "label": node['topic'],
-                    "node_type": "topic",
-                    "topic_id": str(node['topic_id']),
-                },
-            }
-            for node in unique_topics.to_dict('records')
+    Topic nodes are sorted by label and token nodes by token. Edges are in row order of the source
+    data frame and refer to nodes by index into `topics` and `tokens`.
+    """
+
+    topics: np.ndarray
+    topic_ids: np.ndarray
+    tokens: np.ndarray
+    token_topic_ids: np.ndarray
+    sources: np.ndarray
+    targets: np.ndarray
+    weights: np.ndarray
+
+    @property
+    def edge_topic_ids(self) -> np.ndarray:
+        return self.topic_ids[self.sources]
+
+    def node_data(self) -> List[dict]:
+        """Returns data of topic nodes followed by token nodes"""
+        topic_nodes: List[dict] = [
+            {"id": topic, "label": topic, "node_type": "topic", "topic_id": str(topic_id)}
+            for topic, topic_id in zip(self.topics.tolist(), self.topic_ids.tolist())
         ]
-        + [
-            {
-                "data": {
-                    "id": w,
-                    "label": w,
-                    "node_type": "token",
-                    "topic_id": str(unique_tokens[w][0]) if len(unique_tokens[w]) == 1 else "",
-                },
-            }
-            for w in unique_tokens.index
-        ],
-        'edges': [
-            {
-                "data": {
-                    "id": f"{edge['topic_id']}_{edge['token']}",
-                    "source": edge['topic'],
-                    "target": edge['token'],
-                    "weight": 10.0 * edge['weight'],
-                    "topic_id": str(edge['topic_id']),
-                },
-            }
-            for edge in topics_tokens[['topic', 'token', 'topic_id', 'weight']].to_dict('records')
-        ],
+        token_nodes: List[dict] = [
+            {"id": token, "label": token, "node_type": "token", "topic_id": topic_id}
+            for token, topic_id in zip(self.tokens.tolist(), self.token_topic_ids.tolist())
+        ]
+        return topic_nodes + token_nodes
+
+    def edge_data(self) -> List[dict]:
+        return [
+            {"id": f"{topic_id}_{token}", "source": topic, "target": token, "weight": weight, "topic_id": str(topic_id)}
+            for topic, token, weight, topic_id in zip(
+                self.topics[self.sources].tolist(),
+                self.tokens[self.targets].tolist(),
+                self.weights.tolist(),
+                self.edge_topic_ids.tolist(),
+            )
+        ]
+
+    def to_networkx(self) -> nx.Graph:
+        g: nx.Graph = nx.Graph()
+        g.add_nodes_from((data['id'], data) for data in self.node_data())
+        g.add_edges_from((data.pop('source'), data.pop('target'), data) for data in self.edge_data())
+        return g
+
+    def layout(self, layout_algorithm: str = DEFAULT_PRESET_LAYOUT, scale: float = PRESET_LAYOUT_SCALE) -> dict:
+        """Returns node positions computed by `layout_algorithm`, cached between redraws of the same network"""
+        g: nx.Graph = nu.arrays_to_nx(
+            self.topics[self.sources], self.tokens[self.targets], self.weights, bipartite=True
+        )
+        positions, _ = layout_network(g, layout_algorithm, scale=scale)
+        return positions
+
+
+def create_network_data(topics_tokens: pd.DataFrame) -> TopicsTokensNetworkData:
+    """Creates topics-tokens network data (nodes and edges) from topic-token weights"""
+
+    topic_codes, topics = pd.factorize(topics_tokens['topic'], sort=True)
+    token_codes, tokens = pd.factorize(topics_tokens['token'], sort=True)
+    topic_id_values: np.ndarray = topics_tokens['topic_id'].to_numpy()
+
+    topic_ids: np.ndarray = np.empty(len(topics), dtype=topic_id_values.dtype)
+    topic_ids[topic_codes] = topic_id_values
+
+    """A token is assigned the topic id of its first edge if it only belongs to a single topic"""
+    _, first_edge = np.unique(token_codes, return_index=True)
+    token_topics: np.ndarray = topic_id_values[first_edge].astype(str).astype(object)
+    token_topics[np.bincount(token_codes, minlength=len(tokens)) != 1] = ""
+
+    return TopicsTokensNetworkData(
+        topics=np.asarray(topics, dtype=object),
+        topic_ids=topic_ids,
+        tokens=np.asarray(tokens, dtype=object),
+        token_topic_ids=token_topics,
+        sources=topic_codes,
+        targets=token_codes,
+        weights=10.0 * topics_tokens['weight'].to_numpy(dtype=np.float64),
+    )
+
+
+def to_dict(topics_tokens: pd.DataFrame) -> dict:
+    data: TopicsTokensNetworkData = create_network_data(topics_tokens)
+    return {
+        'nodes': [{"data": node} for node in data.node_data()],
+        'edges': [{"data": edge} for edge in data.edge_data()],
     }
-    return source_network_data
 
 
-def create_network(topics_tokens: pd.DataFrame) -> ipycytoscape.CytoscapeWidget:
+def create_network(
+    topics_tokens: pd.DataFrame | TopicsTokensNetworkData, positions: dict = None
+) -> ipycytoscape.CytoscapeWidget:
 
-    unique_topics = topics_tokens.groupby(['topic', 'topic_id']).size().reset_index()[['topic', 'topic_id']]
-    unique_tokens = topics_tokens.groupby('token')['topic_id'].apply(list)
-    topic_nodes = [
-        ipycytoscape.Node(
-            data={
-                "id": node['topic'],
-                "label": node['topic'],
-                "node_type": "topic",
-                "topic_id": str(node['topic_id']),
-            }
-        )
-        for node in unique_topics.to_dict('records')
-    ]
-    token_nodes = [
-        ipycytoscape.Node(
-            data={
-                "id": w,
-                "label": w,
-                "node_type": "token",
-                "topic_id": str(unique_tokens[w][0]) if len(unique_tokens[w]) == 1 else "",
-            }
-        )
-        for w in unique_tokens.index
-    ]
-    edges = [
-        ipycytoscape.Edge(
-            data={
-                "id": f"{edge['topic_id']}_{edge['token']}",
-                "source": edge['topic'],
-                "target": edge['token'],
-                "weight": 10.0 * edge['weight'],
-                "topic_id": str(edge['topic_id']),
-            }
-        )
-        for edge in topics_tokens[['topic', 'token', 'topic_id', 'weight']].to_dict('records')
-    ]
+    data: TopicsTokensNetworkData = (
+        topics_tokens if isinstance(topics_tokens, TopicsTokensNetworkData) else create_network_data(topics_tokens)
+    )
     w = ipycytoscape.CytoscapeWidget(
         layout={'height': '800px'},
         pixelRatio=1.0,
     )
-    w.graph.add_nodes(topic_nodes)
-    w.graph.add_nodes(token_nodes)
-    w.graph.add_edges(edges)
+    w.graph.add_nodes([ipycytoscape.Node(data=node) for node in data.node_data()])
+    w.graph.add_edges([ipycytoscape.Edge(data=edge) for edge in data.edge_data()])
+    if positions is not None:
+        set_positions(w, positions)
     return w
 
 
+def set_positions(network: ipycytoscape.CytoscapeWidget, positions: dict) -> None:
+    """Assigns (preset) positions to the nodes in `network`"""
+    for node in network.graph.nodes:
+        x, y = positions.get(node.data['id'], (0.0, 0.0))
+        node.position = {'x': float(x), 'y': float(y)}
+
+
 def create_network2(topics_tokens: pd.DataFrame) -> ipycytoscape.CytoscapeWidget:
     source_network_data = to_dict(topics_tokens=topics_tokens)
     w = ipycytoscape.CytoscapeWidget(
@@ -200,64 +236,11 @@ def create_network2(topics_tokens: pd.DataFrame) -> ipycytoscape.CytoscapeWidget
     return w
 
 
-def create_network3(topics_tokens: pd.DataFrame) -> ipycytoscape.CytoscapeWidget:
-    source_network_data = to_dict(topics_tokens=topics_tokens)
-    w = ipycytoscape.CytoscapeWidget(
-        layout={'height': '800px'},
-        pixelRatio=1.0,
-    )
-    w.min_zoom = 0.2
-    w.max_zoom = 1.5
-    w.graph.add_graph_from_json(source_network_data)
-    return w
+create_network3 = create_network2
 
 
 def create_networkx(topics_tokens: pd.DataFrame) -> nx.Graph:
-
-    unique_topics = topics_tokens.groupby(['topic', 'topic_id']).size().reset_index()[['topic', 'topic_id']]
-    unique_tokens = topics_tokens.groupby('token')['topic_id'].apply(list)
-
-    topic_nodes = [
-        (
-            node['topic'],
-            {
-                "id": node['topic'],
-                "label": node['topic'],
-                "node_type": "topic",
-                "topic_id": str(node['topic_id']),
-            },
-        )
-        for node in unique_topics.to_dict('records')
-    ]
-    token_nodes = [
-        (
-            w,
-            {
-                "id": w,
-                "label": w,
-                "node_type": "token",
-                "topic_id": str(unique_tokens[w][0]) if len(unique_tokens[w]) == 1 else "",
-            },
-        )
-        for w in unique_tokens.index
-    ]
-    edges = [
-        (
-            edge['topic'],
-            edge['token'],
-            {
-                "id": f"{edge['topic_id']}_{edge['token']}",
-                "weight": 10.0 * edge['weight'],
-                "topic_id": str(edge['topic_id']),
-            },
-        )
-        for edge in topics_tokens[['topic', 'token', 'topic_id', 'weight']].to_dict('records')
-    ]
-    g: nx.Graph = nx.Graph()
-    g.add_nodes_from(topic_nodes)
-    g.add_nodes_from(token_nodes)
-    g.add_edges_from(edges)
-    return g
+    return create_network_data(topics_tokens).to_networkx()
 
 
 class ViewModel:
@@ -267,6 +250,7 @@ class ViewModel:
 
         self.inferred_topics: topic_modelling.InferredTopicsData = None
         self._top_topic_tokens: pd.DataFrame = None
+        self._network_data: Tuple[Tuple[Tuple[int, ...], int], TopicsTokensNetworkData] = None
 
     @property
     def top_topic_tokens(self) -> pd.DataFrame:
@@ -281,6 +265,7 @@ class ViewModel:
             return self
 
         self._top_topic_tokens = self.inferred_topics.top_topic_token_weights(MAX_TOPIC_TOKEN_COUNT)
+        self._network_data = None
 
         return self
 
@@ -290,9 +275,16 @@ class ViewModel:
             (topics_tokens.index.isin(topic_ids) & (topics_tokens.position <= top_count))
         ].reset_index()
 
-        topics_tokens['topic'] = topics_tokens.topic_id.apply(lambda x: f"Topic #{x}")
+        topics_tokens['topic'] = "Topic #" + topics_tokens.topic_id.astype(str)
         return topics_tokens[['topic', 'token', 'weight', 'topic_id', 'position']]
 
+    def get_network_data(self, topic_ids: List[int], top_count: int) -> TopicsTokensNetworkData:
+        """Returns network data for `topic_ids` and `top_count`, reused until selection or model changes"""
+        key: Tuple[Tuple[int, ...], int] = (tuple(sorted(topic_ids)), top_count)
+        if self._network_data is None or self._network_data[0] != key:
+            self._network_data = (key, create_network_data(self.get_topics_tokens(topic_ids, top_count)))
+        return self._network_data[1]
+
     @property
     def num_topics(self):
         if not self.inferred_topics:
@@ -317,7 +309,8 @@ def default_displayer(opts: "TopicsTokenNetworkGUI") -> None:
     topics_tokens = opts.model.get_topics_tokens(opts.topics_ids, opts.top_count)
 
     if opts.output_format == "network":
-        network = create_network(topics_tokens)
+        data: TopicsTokensNetworkData = opts.model.get_network_data(opts.topics_ids, opts.top_count)
+        network = create_network(data)
         opts.network = network
         opts.set_layout()
         css_style = css_styles(topics_tokens.topic_id.unique(), opts.custom_styles)
@@ -372,6 +365,7 @@ class TopicsTokenNetworkGUI:
                 'klay',
                 'circle',
                 'concentric',
+                *PRESET_LAYOUTS,
                 # 'cise',
                 # 'springy',
                 # 'ngraph.forcelayout',
@@ -451,6 +445,11 @@ class TopicsTokenNetworkGUI:
         self.alert("Layout: " + self.network_layout)
         if not self.network:
             return
+        if self.network_layout in PRESET_LAYOUTS:
+            data: TopicsTokensNetworkData = self.model.get_network_data(self.topics_ids, self.top_count)
+            set_positions(self.network, data.layout(PRESET_LAYOUTS[self.network_layout]))
+            self.network.set_layout(name='preset', animate=self.animate)
+            return
         self.network.set_layout(
             name=self.network_layout,
             animate=self.animate,
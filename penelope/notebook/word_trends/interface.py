@@ -1,8 +1,11 @@
 import abc
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Sequence
+from typing import Callable, Hashable, List, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
+import scipy.sparse as sp
 
 from penelope import corpus as pc
 from penelope import utility as pu
@@ -11,6 +14,8 @@ from penelope.co_occurrence.keyness import ComputeKeynessOpts
 from penelope.common import goodness_of_fit as gof
 from penelope.common import keyness as pk
 
+DEFAULT_CACHE_BYTES: int = 2 * 1024**3
+
 
 @dataclass
 class TrendsComputeOpts:
@@ -39,43 +44,124 @@ class TrendsComputeOpts:
         return other
 
     def invalidates_corpus(self, other: "TrendsComputeOpts") -> bool:
-        if (
-            self.normalize != other.normalize  # pylint: disable=too-many-boolean-expressions
-            or self.keyness != other.keyness
-            or self.temporal_key != other.temporal_key
-            or self.pivot_keys_id_names != other.pivot_keys_id_names
-            or self.filter_opts != other.filter_opts
-            or self.fill_gaps != other.fill_gaps
-            or self.keyness_source != other.keyness_source
-        ):
-            return True
-        return False
+        return self.corpus_key != other.corpus_key
+
+    @property
+    def corpus_key(self) -> tuple:
+        """Hashable key of all options that affect the transformed corpus"""
+        return (
+            self.grouping_key,
+            self.normalize,
+        )
+
+    @property
+    def grouping_key(self) -> tuple:
+        """Hashable key of options that affect the grouped (not yet normalized) corpus"""
+        return (
+            self.keyness,
+            self.keyness_source,
+            self.temporal_key,
+            tuple(self.pivot_keys_id_names or []),
+            tuple(sorted((k, str(v)) for k, v in self.filter_opts.props.items())) if self.filter_opts else (),
+            self.fill_gaps,
+        )
 
     def update(self, **newdata):
         for key, value in newdata.items():
             setattr(self, key, value)
 
 
+class TransformedCorpusCache:
+    """Least recently used cache of transformed corpora, evicted when total size exceeds `max_bytes`"""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes: int = max_bytes
+        self.entries: OrderedDict[Hashable, Tuple[pc.VectorizedCorpus, int]] = OrderedDict()
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of cached corpora (a corpus cached under several keys is counted once)"""
+        return sum({id(corpus): size for corpus, size in self.entries.values()}.values())
+
+    def get(self, key: Hashable, compute: Callable[[], pc.VectorizedCorpus]) -> pc.VectorizedCorpus:
+        """Returns cached corpus for `key`, calls `compute` and caches the result if not found"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+        corpus: pc.VectorizedCorpus = compute()
+
+        size: int = corpus_nbytes(corpus)
+        if size <= self.max_bytes:
+            self.entries[key] = (corpus, size)
+            while self.nbytes > self.max_bytes:
+                self.entries.popitem(last=False)
+
+        return corpus
+
+    def clear(self) -> "TransformedCorpusCache":
+        self.entries.clear()
+        return self
+
+
+def corpus_nbytes(corpus: pc.VectorizedCorpus) -> int:
+    return int((corpus.nbytes() or 0) + corpus.document_index.memory_usage(index=True).sum())
+
+
 class TabularCompiler:
+    def __init__(self):
+        self._csc_cache: Tuple[TrendsComputeOpts, pc.VectorizedCorpus, sp.csc_matrix] = None
+
     def compile(
-        self, *, corpus: pc.VectorizedCorpus, temporal_key: str, pivot_keys_id_names: List[str], indices: Sequence[int]
+        self,
+        *,
+        corpus: pc.VectorizedCorpus,
+        temporal_key: str,
+        pivot_keys_id_names: List[str],
+        indices: Sequence[int],
+        compute_opts: TrendsComputeOpts = None,
     ) -> pd.DataFrame:
-        """Extracts trend vectors for tokens ´indices` and returns a pd.DataFrame."""
+        """Extracts trend vectors for tokens ´indices` and returns a pd.DataFrame.
+
+        All columns are extracted in a single slice. If `compute_opts` is given, the slice is taken from
+        a CSC copy of the DTM that is cached for as long as `corpus` and `compute_opts` are unchanged.
+        """
+
+        token_ids: np.ndarray = pd.unique(np.asarray(indices, dtype=np.int64))
+        tokens: List[str] = corpus.vocabulary_array[token_ids].tolist()
 
-        data: dict = {
-            **{temporal_key: corpus.document_index[temporal_key]},
-            **{key: corpus.document_index[key] for key in pivot_keys_id_names},
-            **{corpus.id2token[token_id]: corpus.bag_term_matrix.getcol(token_id).A.ravel() for token_id in indices},
-        }
+        matrix: sp.spmatrix = corpus.bag_term_matrix if compute_opts is None else self.csc(corpus, compute_opts)
 
-        return pd.DataFrame(data=data)
+        data: pd.DataFrame = pd.DataFrame(
+            data=matrix[:, token_ids].toarray(), index=corpus.document_index.index, columns=tokens
+        )
+
+        key_columns: List[str] = [key for key in [temporal_key, *pivot_keys_id_names] if key not in data.columns]
+
+        return pd.concat([corpus.document_index[key_columns], data], axis=1)
+
+    def csc(self, corpus: pc.VectorizedCorpus, compute_opts: TrendsComputeOpts) -> sp.csc_matrix:
+        """Returns the DTM of `corpus` in CSC form, cached by `corpus` and `compute_opts`"""
+        if self._csc_cache is not None:
+            cached_opts, cached_corpus, matrix = self._csc_cache
+            if cached_corpus is corpus and not cached_opts.invalidates_corpus(compute_opts):
+                return matrix
+
+        matrix: sp.csc_matrix = corpus.bag_term_matrix.tocsc()
+        self._csc_cache = (compute_opts.clone, corpus, matrix)
+        return matrix
+
+    def reset(self) -> "TabularCompiler":
+        self._csc_cache = None
+        return self
 
 
 class TrendsDataBase(abc.ABC):
-    def __init__(self, corpus: pc.VectorizedCorpus, n_top: int = 100000):
+    def __init__(self, corpus: pc.VectorizedCorpus, n_top: int = 100000, cache_bytes: int = DEFAULT_CACHE_BYTES):
         self.corpus: pc.VectorizedCorpus = corpus
         self.n_top: int = n_top
         self._gof_data: gof.GofData = None
+        self._cache: TransformedCorpusCache = TransformedCorpusCache(max_bytes=cache_bytes)
 
         self._transformed_corpus: pc.VectorizedCorpus = None
         self._compute_opts: TrendsComputeOpts = TrendsComputeOpts(
@@ -87,6 +173,9 @@ class TrendsDataBase(abc.ABC):
     def _transform_corpus(self, opts: TrendsComputeOpts) -> pc.VectorizedCorpus:
         ...
 
+    def _cached_transform_corpus(self, opts: TrendsComputeOpts) -> pc.VectorizedCorpus:
+        return self._cache.get(('transformed', opts.corpus_key), lambda: self._transform_corpus(opts))
+
     @property
     def transformed_corpus(self) -> pc.VectorizedCorpus:
         return self._transformed_corpus
@@ -102,13 +191,13 @@ class TrendsDataBase(abc.ABC):
         return self._gof_data
 
     def find_word_indices(self, opts: TrendsComputeOpts) -> List[int]:
-        indices: List[int] = self._transform_corpus(opts).find_matching_words_indices(
+        indices: List[int] = self._cached_transform_corpus(opts).find_matching_words_indices(
             opts.words, opts.top_count, descending=opts.descending
         )
         return indices
 
     def find_words(self, opts: TrendsComputeOpts) -> List[str]:
-        words: List[int] = self._transform_corpus(opts).find_matching_words(
+        words: List[int] = self._cached_transform_corpus(opts).find_matching_words(
             opts.words, opts.top_count, descending=opts.descending
         )
         return words
@@ -125,7 +214,7 @@ class TrendsDataBase(abc.ABC):
             if not self._compute_opts.invalidates_corpus(opts):
                 return self
 
-        self._transformed_corpus = self._transform_corpus(opts)
+        self._transformed_corpus = self._cached_transform_corpus(opts)
         self._compute_opts = opts.clone
         self._gof_data = None
 
@@ -137,6 +226,7 @@ class TrendsDataBase(abc.ABC):
             temporal_key=self.compute_opts.temporal_key,
             pivot_keys_id_names=self.compute_opts.pivot_keys_id_names,
             indices=indices,
+            compute_opts=self.compute_opts,
         )
         if filter_opts and len(filter_opts) > 0:
             data = data[filter_opts.mask(data)]
@@ -146,24 +236,43 @@ class TrendsDataBase(abc.ABC):
         self._transformed_corpus = None
         self._compute_opts = TrendsComputeOpts(normalize=False, keyness=pk.KeynessMetric.TF, temporal_key='year')
         self._gof_data = None
+        self._cache.clear()
+        self.tabular_compiler.reset()
         return self
 
 
 class TrendsData(TrendsDataBase):
-    def __init__(self, corpus: pc.VectorizedCorpus, n_top: int = 100000):
-        super().__init__(corpus=corpus, n_top=n_top)
+    def __init__(self, corpus: pc.VectorizedCorpus, n_top: int = 100000, cache_bytes: int = DEFAULT_CACHE_BYTES):
+        super().__init__(corpus=corpus, n_top=n_top, cache_bytes=cache_bytes)
 
     def _transform_corpus(self, opts: TrendsComputeOpts) -> pc.VectorizedCorpus:
+        """Transforms the corpus in three steps (keyness, grouping and normalization).
+        Intermediate results are cached so that options sharing a prefix of the chain reuse them."""
+
+        corpus: pc.VectorizedCorpus = self._cache.get(
+            ('grouped', opts.grouping_key), lambda: self._group_corpus(self._keyness_corpus(opts.keyness), opts)
+        )
+
+        if opts.normalize:
+            """Grouped corpus is cached, so it must not be normalized in place"""
+            corpus = corpus.normalize_by_raw_counts()
+
+        return corpus
 
-        corpus: pc.VectorizedCorpus = (
-            self.corpus.tf_idf()
-            if opts.keyness == pk.KeynessMetric.TF_IDF
-            else self.corpus.normalize_by_raw_counts()
-            if opts.keyness == pk.KeynessMetric.TF_normalized
-            else self.corpus
+    def _keyness_corpus(self, keyness: pk.KeynessMetric) -> pc.VectorizedCorpus:
+
+        if keyness not in (pk.KeynessMetric.TF_IDF, pk.KeynessMetric.TF_normalized):
+            return self.corpus
+
+        return self._cache.get(
+            ('keyness', keyness),
+            lambda: self.corpus.tf_idf()
+            if keyness == pk.KeynessMetric.TF_IDF
+            else self.corpus.normalize_by_raw_counts(),
         )
 
-        corpus = corpus.group_by_pivot_keys(
+    def _group_corpus(self, corpus: pc.VectorizedCorpus, opts: TrendsComputeOpts) -> pc.VectorizedCorpus:
+        return corpus.group_by_pivot_keys(
             temporal_key=opts.temporal_key,
             pivot_keys=list(opts.pivot_keys_id_names),
             filter_opts=opts.filter_opts,
@@ -172,11 +281,6 @@ class TrendsData(TrendsDataBase):
             aggregate='sum',
         )
 
-        if opts.normalize:
-            corpus = corpus.normalize_by_raw_counts()
-
-        return corpus
-
 
 class BundleTrendsData(TrendsDataBase):
     def __init__(self, bundle: Bundle = None, n_top: int = 100000, category_column: str = 'category'):
@@ -186,6 +290,12 @@ class BundleTrendsData(TrendsDataBase):
         self.tf_threshold: int = 1
         self.category_column: str = category_column
 
+    def _cached_transform_corpus(self, opts: TrendsComputeOpts) -> pc.VectorizedCorpus:
+        return self._cache.get(
+            ('transformed', opts.corpus_key, self.keyness_source, self.tf_threshold, self.category_column),
+            lambda: self._transform_corpus(opts),
+        )
+
     def _transform_corpus(self, opts: TrendsComputeOpts) -> pc.VectorizedCorpus:
 
         transformed_corpus: pc.VectorizedCorpus = self.bundle.keyness_transform(
@@ -5,4 +5,11 @@ from .checkpoint import CheckpointData, load_archive, store_archive
 from .interface import CheckpointOpts, IContentSerializer
 from .load import load_payload, load_payloads_multiprocess, load_payloads_singleprocess
 from .serialize import CsvContentSerializer, TextContentSerializer, TokensContentSerializer, create_serializer
-from .utility import CorruptCheckpointError, EmptyCheckpointError, find_checkpoints, read_document_index
+from .utility import (
+    CorruptCheckpointError,
+    DocumentFilter,
+    EmptyCheckpointError,
+    filter_document_index,
+    find_checkpoints,
+    read_document_index,
+)
@@ -21,6 +21,7 @@ from .interface import (
 )
 from .load import PayloadLoader, load_payloads_multiprocess, load_payloads_singleprocess
 from .serialize import create_serializer
+from .utility import DocumentFilter, filter_document_index
 
 
 class CheckpointData:
@@ -36,6 +37,7 @@ class CheckpointData:
         checkpoint_opts: CheckpointOpts = None,
         payload_loader_override: PayloadLoader = None,
         reader_opts: TextReaderOpts = None,
+        document_filter: DocumentFilter = None,
     ):
         self.source_name: Any = source_name
         self.document_index: DocumentIndex = document_index
@@ -43,6 +45,7 @@ class CheckpointData:
         self.checkpoint_opts: CheckpointOpts = checkpoint_opts
         self.filenames: List[str] = filenames
         self.reader_opts: TextReaderOpts = reader_opts
+        self.document_filter: DocumentFilter = document_filter
         self.content_type: ContentType = checkpoint_opts.content_type
 
         self.document_index: DocumentIndex = (
@@ -79,6 +82,12 @@ class CheckpointData:
         if self.document_index is not None:
             self.document_index = self.document_index[self.document_index.filename.isin(self.filenames)]
 
+            if self.document_filter is not None:
+                """Resolved against the document index, only selected documents are read from the archive"""
+                self.document_index = filter_document_index(self.document_index, self.document_filter)
+                selected: set = set(self.document_index.filename)
+                self.filenames = [x for x in self.filenames if x in selected]
+
     def _sync_filenames(self, verbose: bool = True) -> None:
         """Syncs sort order for archive filenames and filenames in document index"""
 
@@ -136,6 +145,7 @@ def load_archive(
     checkpoint_opts: CheckpointOpts = None,
     reader_opts: TextReaderOpts = None,
     payload_loader: PayloadLoader = None,
+    document_filter: DocumentFilter = None,
 ) -> CheckpointData:
     """Load a TAGGED FRAME checkpoint stored in a ZIP FILE with CSV-filed and optionally a document index
 
@@ -143,6 +153,8 @@ def load_archive(
         source_name (str): [description]
         checkpoint_opts (CheckpointOpts, optional): deserialize opts. Defaults to None.
         reader_opts (TextReaderOpts, optional): Settings for creating a document index or filtering files. Defaults to None.
+        document_filter (DocumentFilter, optional): Documents to load, a document index predicate, property-value
+            criterias or document names. Resolved before any document is read. Defaults to None (all documents).
 
     Raises:
         PipelineError: Something is wrong
@@ -161,6 +173,7 @@ def load_archive(
             checkpoint_opts=zf.checkpoint_opts or checkpoint_opts,
             payload_loader_override=payload_loader,
             reader_opts=reader_opts,
+            document_filter=document_filter,
         )
 
 
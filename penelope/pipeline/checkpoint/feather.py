@@ -1,16 +1,31 @@
+from __future__ import annotations
+
 import glob
 import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import get_context
 from os.path import join as jj
-from typing import List, Optional
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import more_itertools
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
-from penelope.utility import replace_extension, strip_paths
+from penelope.utility import replace_extension, strip_path_and_extension, strip_paths
 
 from ..interfaces import ContentType, DocumentPayload, PipelineError
 
 FEATHER_DOCUMENT_INDEX_NAME = 'document_index.feathering'
 
+# Consolidated layout: documents are record batches in a few large Arrow IPC files, located by an offset index
+FEATHER_ARCHIVE_INDEX_NAME = 'archive_index.feathering'
+FEATHER_ARCHIVE_PART_NAME = 'archive_{:04}.arrow'
+DEFAULT_ARCHIVE_PART_SIZE: int = 2**30
+DEFAULT_SCAN_CHUNK_SIZE: int = 256
+
 
 def write_payload(folder: str, payload: DocumentPayload) -> DocumentPayload:
 
@@ -23,10 +38,15 @@ def write_payload(folder: str, payload: DocumentPayload) -> DocumentPayload:
 
 def payload_exists(folder: str, payload: DocumentPayload) -> DocumentPayload:
     filename = jj(folder, replace_extension(payload.filename, ".feather"))
-    return os.path.isfile(filename)
+    if os.path.isfile(filename):
+        return True
+    return archive_exists(folder) and payload.filename in open_archive(folder)
 
 
 def read_payload(filename: str) -> DocumentPayload:
+    folder: str = os.path.dirname(filename)
+    if archive_exists(folder) and filename in open_archive(folder):
+        return open_archive(folder).read_payload(filename)
     filename = replace_extension(filename, ".feather")
     return DocumentPayload(
         content_type=ContentType.TAGGED_FRAME,
@@ -35,12 +55,241 @@ def read_payload(filename: str) -> DocumentPayload:
     )
 
 
+def read_payloads(
+    folder: str, filenames: Sequence[str], columns: Sequence[str] = None, processes: int = None
+) -> Iterable[DocumentPayload]:
+    """Yields payloads for `filenames` (in given order) from a consolidated archive or from per-document files"""
+    if archive_exists(folder):
+        return open_archive(folder).scan(filenames, columns=columns, processes=processes)
+    return (_project(read_payload(jj(folder, filename)), columns) for filename in filenames)
+
+
+def _project(payload: DocumentPayload, columns: Optional[Sequence[str]]) -> DocumentPayload:
+    if columns is not None:
+        payload.content = payload.content[list(columns)]
+    return payload
+
+
 def get_matching_paths(*, folder: str) -> List[str]:
+    if archive_exists(folder):
+        return [jj(folder, replace_extension(x, ".feather")) for x in open_archive(folder).index.filename]
     pattern: str = jj(folder, "*.feather")
     paths: List[str] = sorted(glob.glob(pattern))
     return paths
 
 
+def archive_exists(folder: Optional[str]) -> bool:
+    if not folder:
+        return False
+    return os.path.isfile(jj(folder, FEATHER_ARCHIVE_INDEX_NAME))
+
+
+def open_archive(folder: str) -> FeatherArchive:
+    """Returns a (cached) reader of the consolidated archive in `folder`"""
+    filename: str = jj(folder, FEATHER_ARCHIVE_INDEX_NAME)
+    return _open_archive(os.path.abspath(folder), os.path.getmtime(filename))
+
+
+@lru_cache(maxsize=8)
+def _open_archive(folder: str, _: float) -> FeatherArchive:
+    return FeatherArchive(folder)
+
+
+class FeatherArchiveWriter:
+    """Writes documents (tagged frames) as record batches appended to a few large Arrow IPC files.
+
+    A new part file is started when current part exceeds `part_size` bytes, or when a document's
+    columns differs from (and can't be cast to) the part's schema. The offset index, i.e. the part and
+    batch of each document, is written when the writer is closed.
+    """
+
+    def __init__(self, folder: str, part_size: int = DEFAULT_ARCHIVE_PART_SIZE, compression: str = "lz4"):
+        self.folder: str = folder
+        self.part_size: int = part_size
+        self.compression: str = compression
+        self.index: List[Tuple[str, str, int, int, int]] = []
+        self._part: int = -1
+        self._batch: int = 0
+        self._sink: pa.OSFile = None
+        self._writer: pa.ipc.RecordBatchFileWriter = None
+        self._schema: pa.Schema = None
+
+        os.makedirs(folder, exist_ok=True)
+        _remove_archive(folder)
+
+    def write(self, payload: DocumentPayload) -> DocumentPayload:
+        batch: pa.RecordBatch = self._to_batch(payload.content)
+        if self._writer is None or self._sink.tell() >= self.part_size:
+            self._open_part(batch.schema)
+        elif not batch.schema.equals(self._schema):
+            try:
+                batch = _cast_batch(batch, self._schema)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError, ValueError, KeyError):
+                self._open_part(batch.schema)
+        self._writer.write_batch(batch)
+        self.index.append(
+            (strip_path_and_extension(payload.filename), payload.filename, self._part, self._batch, batch.num_rows)
+        )
+        self._batch += 1
+        return payload
+
+    def close(self) -> None:
+        self._close_part()
+        pd.DataFrame(self.index, columns=['document_name', 'filename', 'part', 'batch', 'n_rows']).to_feather(
+            jj(self.folder, FEATHER_ARCHIVE_INDEX_NAME)
+        )
+
+    def __enter__(self) -> FeatherArchiveWriter:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def _to_batch(self, tagged_frame: pd.DataFrame) -> pa.RecordBatch:
+        table: pa.Table = pa.Table.from_pandas(tagged_frame, preserve_index=False).combine_chunks()
+        schema: pa.Schema = pa.schema(
+            [pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in table.schema]
+        )
+        table = table.cast(schema)
+        batches: List[pa.RecordBatch] = table.to_batches()
+        return batches[0] if batches else pa.RecordBatch.from_pylist([], schema=schema)
+
+    def _open_part(self, schema: pa.Schema) -> None:
+        self._close_part()
+        self._part, self._batch, self._schema = self._part + 1, 0, schema
+        self._sink = pa.OSFile(jj(self.folder, FEATHER_ARCHIVE_PART_NAME.format(self._part)), 'wb')
+        self._writer = pa.ipc.new_file(self._sink, schema, options=pa.ipc.IpcWriteOptions(compression=self.compression))
+
+    def _close_part(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+            self._writer, self._sink = None, None
+
+
+def _cast_batch(batch: pa.RecordBatch, schema: pa.Schema) -> pa.RecordBatch:
+    if batch.schema.names != schema.names:
+        raise ValueError("columns differs")
+    return pa.RecordBatch.from_arrays([c.cast(f.type) for c, f in zip(batch.columns, schema)], schema=schema)
+
+
+def _remove_archive(folder: str) -> None:
+    for filename in glob.glob(jj(folder, FEATHER_ARCHIVE_INDEX_NAME)) + glob.glob(jj(folder, "archive_*.arrow")):
+        os.remove(filename)
+
+
+class FeatherArchive:
+    """Reader of a consolidated feather archive (see `FeatherArchiveWriter`).
+
+    Part files are memory mapped and opened lazily. Any document can be read by name (random access),
+    optionally only a subset of its columns (only those columns are read and decompressed). Sequences of
+    documents are read in chunks, optionally in parallel by a (spawned) process pool.
+    """
+
+    def __init__(self, folder: str):
+        self.folder: str = folder
+        self.index: pd.DataFrame = pd.read_feather(jj(folder, FEATHER_ARCHIVE_INDEX_NAME)).set_index(
+            'document_name', drop=False
+        )
+        self._readers: Dict[Tuple[int, Optional[Tuple[str, ...]]], pa.ipc.RecordBatchFileReader] = {}
+
+    def __contains__(self, filename: str) -> bool:
+        return strip_path_and_extension(filename) in self.index.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def reader(self, part: int, columns: Sequence[str] = None) -> pa.ipc.RecordBatchFileReader:
+        key: Tuple[int, Optional[Tuple[str, ...]]] = (part, None if columns is None else tuple(columns))
+        if key not in self._readers:
+            source: pa.MemoryMappedFile = pa.memory_map(jj(self.folder, FEATHER_ARCHIVE_PART_NAME.format(part)))
+            options: pa.ipc.IpcReadOptions = None
+            if columns is not None:
+                schema: pa.Schema = pa.ipc.open_file(source).schema
+                options = pa.ipc.IpcReadOptions(included_fields=[schema.get_field_index(c) for c in columns])
+            self._readers[key] = pa.ipc.open_file(source, options=options)
+        return self._readers[key]
+
+    def read(self, filename: str, columns: Sequence[str] = None) -> pd.DataFrame:
+        """Returns document `filename` as a tagged frame, only `columns` if specified"""
+        position: int = self.index.index.get_loc(strip_path_and_extension(filename))
+        part, batch = int(self.index.part.values[position]), int(self.index.batch.values[position])
+        return _select(self.reader(part, columns).get_batch(batch).to_pandas(), columns)
+
+    def read_payload(self, filename: str, columns: Sequence[str] = None) -> DocumentPayload:
+        return _create_payload(filename, self.read(filename, columns=columns))
+
+    def read_chunk(self, filenames: Sequence[str], columns: Sequence[str] = None) -> List[DocumentPayload]:
+        """Returns payloads for `filenames`. Runs of documents stored consecutively in the same part are
+        read as a single table that is split into documents (much faster than one conversion per document)"""
+        positions: np.ndarray = self.index.index.get_indexer([strip_path_and_extension(x) for x in filenames])
+        if (positions < 0).any():
+            raise KeyError(f"documents not found in archive: {np.asarray(filenames)[positions < 0].tolist()}")
+        parts: np.ndarray = self.index.part.values[positions]
+        batches: np.ndarray = self.index.batch.values[positions]
+        breaks: np.ndarray = np.flatnonzero((np.diff(parts) != 0) | (np.diff(batches) != 1)) + 1
+        payloads: List[DocumentPayload] = []
+        for run in np.split(np.arange(len(positions)), breaks):
+            if len(run) == 0:
+                continue
+            reader: pa.ipc.RecordBatchFileReader = self.reader(int(parts[run[0]]), columns)
+            record_batches: List[pa.RecordBatch] = [reader.get_batch(int(i)) for i in batches[run]]
+            frame: pd.DataFrame = _select(pa.Table.from_batches(record_batches).to_pandas(), columns)
+            offsets: np.ndarray = np.cumsum([0] + [x.num_rows for x in record_batches])
+            payloads.extend(
+                _create_payload(filenames[i], frame.iloc[start:stop].reset_index(drop=True))
+                for i, start, stop in zip(run, offsets[:-1], offsets[1:])
+            )
+        return payloads
+
+    def scan(
+        self,
+        filenames: Sequence[str] = None,
+        columns: Sequence[str] = None,
+        processes: int = None,
+        chunk_size: int = DEFAULT_SCAN_CHUNK_SIZE,
+    ) -> Iterable[DocumentPayload]:
+        """Yields payloads for `filenames` (defaults to all documents in stored order).
+
+        If `processes` is given, chunks of `chunk_size` documents are read in parallel, with at most
+        2 x `processes` chunks in flight. Payloads are yielded in the order of `filenames` in any case.
+        """
+        filenames = self.index.filename.tolist() if filenames is None else list(filenames)
+
+        if not processes:
+            for chunk in more_itertools.chunked(filenames, chunk_size):
+                yield from self.read_chunk(chunk, columns=columns)
+            return
+
+        with ProcessPoolExecutor(max_workers=processes, mp_context=get_context("spawn")) as executor:
+            pending: Deque[Future] = deque()
+            for chunk in more_itertools.chunked(filenames, chunk_size):
+                if len(pending) >= 2 * processes:
+                    yield from pending.popleft().result()
+                pending.append(executor.submit(_read_archive_chunk, self.folder, chunk, columns))
+            while pending:
+                yield from pending.popleft().result()
+
+
+def _select(tagged_frame: pd.DataFrame, columns: Optional[Sequence[str]]) -> pd.DataFrame:
+    """Projected batches have columns in stored order, reorder only if requested order differs"""
+    if columns is None or tagged_frame.columns.tolist() == list(columns):
+        return tagged_frame
+    return tagged_frame[list(columns)]
+
+
+def _create_payload(filename: str, tagged_frame: pd.DataFrame) -> DocumentPayload:
+    return DocumentPayload(
+        content_type=ContentType.TAGGED_FRAME,
+        content=tagged_frame,
+        filename=replace_extension(strip_paths(filename), ".csv"),
+    )
+
+
+def _read_archive_chunk(folder: str, filenames: List[str], columns: Optional[Sequence[str]]) -> List[DocumentPayload]:
+    return open_archive(folder).read_chunk(filenames, columns=columns)
+
+
 def document_index_exists(folder: Optional[str]) -> bool:
     if folder is None:
         return False
@@ -1,29 +1,50 @@
+import contextlib
 import os
+import queue
+import threading
 import zipfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from multiprocessing import get_context
-from typing import Callable, Iterable, List, Tuple, Union
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Tuple, Union
 
+import more_itertools
 import pandas as pd
+import pyarrow as pa
 from loguru import logger
 from tqdm import tqdm
 
 from penelope.type_alias import TaggedFrame
-from penelope.utility.zip_utils import zipfile_or_filename
+from penelope.utility import zip_utils
 
 from ..interfaces import ContentType, DocumentPayload
+from . import feather
 from .interface import CheckpointOpts, IContentSerializer, Serializer, TaggedFrameStore
 from .serialize import create_serializer
 
 PayloadLoader = Callable[[str, CheckpointOpts, List[str], bool], Iterable[DocumentPayload]]
 
+# (filename, member content) pairs, content is None for documents that are read from the feather cache
+MemberChunk = List[Tuple[str, Optional[bytes]]]
+
+# (shared memory block name, (offset, size) of each exported tagged frame or None if payload kept its content)
+SharedFrames = Tuple[Optional[str], List[Optional[Tuple[int, int]]]]
+
 
-@zipfile_or_filename(mode='r')
 def load_tagged_frame(
-    *, zip_or_filename: TaggedFrameStore, filename: str, checkpoint_opts: CheckpointOpts, serializer: Serializer
+    *,
+    zip_or_filename: TaggedFrameStore,
+    filename: str,
+    checkpoint_opts: CheckpointOpts,
+    serializer: Serializer,
+    content: bytes = None,
 ) -> TaggedFrame:
+    """Deserializes `filename` in archive, or `content` if already read from the archive"""
+    if content is None:
+        content = zip_utils.read_file_content(zip_or_filename=zip_or_filename, filename=filename, as_binary=True)
     tagged_frame: TaggedFrame = serializer.deserialize(
-        content=zip_or_filename.read(filename).decode(encoding='utf-8'),
-        options=checkpoint_opts,
+        content=content.decode(encoding='utf-8'), options=checkpoint_opts
     )
     if checkpoint_opts.lower_lemma:
         tagged_frame[checkpoint_opts.lemma_column] = pd.Series(
@@ -33,27 +54,46 @@ def load_tagged_frame(
 
 
 def load_feathered_tagged_frame(
-    *, zip_or_filename: TaggedFrameStore, filename: str, checkpoint_opts: CheckpointOpts, serializer: Serializer
+    *,
+    zip_or_filename: TaggedFrameStore,
+    filename: str,
+    checkpoint_opts: CheckpointOpts,
+    serializer: Serializer,
+    content: bytes = None,
 ) -> pd.DataFrame:
+    feather_folder: str = checkpoint_opts.feather_folder
     feather_filename: str = checkpoint_opts.feather_filename(filename)
-    if os.path.isfile(feather_filename):
-        tagged_frame: pd.DataFrame = pd.read_feather(feather_filename)
-        if checkpoint_opts.lower_lemma:
-            if len(tagged_frame) > 0:
-                tagged_frame[checkpoint_opts.lemma_column] = tagged_frame[checkpoint_opts.lemma_column].str.lower()
+    if feather.archive_exists(feather_folder) and filename in feather.open_archive(feather_folder):
+        tagged_frame: pd.DataFrame = feather.open_archive(feather_folder).read(filename)
+    elif os.path.isfile(feather_filename):
+        tagged_frame = pd.read_feather(feather_filename)
     else:
         tagged_frame = load_tagged_frame(
             zip_or_filename=zip_or_filename,
             filename=filename,
             checkpoint_opts=checkpoint_opts,
             serializer=serializer,
+            content=content,
         )
         tagged_frame.reset_index(drop=True).to_feather(feather_filename, compression="lz4")
+        return tagged_frame
+    if checkpoint_opts.lower_lemma:
+        if len(tagged_frame) > 0:
+            tagged_frame[checkpoint_opts.lemma_column] = tagged_frame[checkpoint_opts.lemma_column].str.lower()
     return tagged_frame
 
 
-def get_checkpoint_loader(checkpoint_opts: CheckpointOpts) -> Callable:
+def is_feathered(filename: str, checkpoint_opts: CheckpointOpts) -> bool:
+    """True if `filename` can be read from the feather cache (i.e. archive content is not needed)"""
+    feather_folder: str = checkpoint_opts.feather_folder
+    if not feather_folder:
+        return False
+    if feather.archive_exists(feather_folder) and filename in feather.open_archive(feather_folder):
+        return True
+    return os.path.isfile(checkpoint_opts.feather_filename(filename))
 
+
+def get_checkpoint_loader(checkpoint_opts: CheckpointOpts) -> Callable:
     if checkpoint_opts.content_type == ContentType.TAGGED_FRAME:
         if checkpoint_opts.feather_folder:
             return load_feathered_tagged_frame
@@ -63,7 +103,11 @@ def get_checkpoint_loader(checkpoint_opts: CheckpointOpts) -> Callable:
 
 
 def load_payload(
-    zip_or_filename: str, filename: str, checkpoint_opts: CheckpointOpts, serializer: IContentSerializer
+    zip_or_filename: str,
+    filename: str,
+    checkpoint_opts: CheckpointOpts,
+    serializer: IContentSerializer,
+    content: bytes = None,
 ) -> DocumentPayload:
 
     payload: DocumentPayload = DocumentPayload(
@@ -73,6 +117,7 @@ def load_payload(
             filename=filename,
             checkpoint_opts=checkpoint_opts,
             serializer=serializer,
+            content=content,
         ),
         filename=filename,
     )
@@ -95,49 +140,226 @@ def load_payloads_singleprocess(
     return (load_payload(zip_or_filename, filename, checkpoint_opts, serializer) for filename in filenames)
 
 
-def _multiprocess_load_task(args: Tuple) -> DocumentPayload:
-    filename, zip_or_filename, serializer, checkpoint_opts = args
+def read_members(
+    *,
+    zip_or_filename: Union[str, zipfile.ZipFile],
+    checkpoint_opts: CheckpointOpts,
+    filenames: List[str],
+    chunksize: int,
+) -> Iterator[MemberChunk]:
+    """Yields chunks of (filename, content) read from archive. Content of feathered documents is not read."""
+    with (
+        contextlib.nullcontext(zip_or_filename)
+        if isinstance(zip_or_filename, zipfile.ZipFile)
+        else zipfile.ZipFile(zip_or_filename, mode='r')
+    ) as zf:
+        for chunk in more_itertools.chunked(filenames, chunksize):
+            yield [(x, None if is_feathered(x, checkpoint_opts) else zf.read(x)) for x in chunk]
+
+
+def prefetch(items: Iterable, maxsize: int) -> Iterator:
+    """Iterates `items` in a reader thread that stays at most `maxsize` items ahead of the consumer"""
+    buffer: queue.Queue = queue.Queue(maxsize=maxsize)
+    done: object = object()
+    stopped: threading.Event = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(done)
+        except Exception as ex:  # pylint: disable=broad-except
+            put(ex)
+
+    reader: threading.Thread = threading.Thread(target=produce, name="checkpoint-reader", daemon=True)
+    reader.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+        reader.join()
+
+
+def export_frames(frames: List[Optional[pd.DataFrame]]) -> SharedFrames:
+    """Writes `frames` as Arrow IPC streams into a single shared memory block (owned by caller of `import_frames`)"""
+    tables: List[Optional[pa.Table]] = [None if frame is None else pa.Table.from_pandas(frame) for frame in frames]
+    sizes: List[int] = [0 if table is None else _ipc_size(table) for table in tables]
+    if sum(sizes) == 0:
+        return None, [None] * len(frames)
+
+    shm: SharedMemory = SharedMemory(create=True, size=sum(sizes))
+    extents: List[Optional[Tuple[int, int]]] = []
+    offset: int = 0
+    for table, size in zip(tables, sizes):
+        if table is None:
+            extents.append(None)
+            continue
+        with shm.buf[offset : offset + size] as view:
+            sink: pa.FixedSizeBufferWriter = pa.FixedSizeBufferWriter(pa.py_buffer(view))
+            writer: pa.ipc.RecordBatchStreamWriter = pa.ipc.new_stream(sink, table.schema)
+            writer.write_table(table)
+            writer.close()
+            sink.close()
+            del writer, sink
+        extents.append((offset, size))
+        offset += size
+    shm.close()
+    return shm.name, extents
+
+
+def import_frames(shared_frames: SharedFrames) -> List[Optional[pd.DataFrame]]:
+    """Reads frames exported by `export_frames` and releases the shared memory block"""
+    name, extents = shared_frames
+    if name is None:
+        return [None] * len(extents)
+    shm: SharedMemory = SharedMemory(name=name)
+    try:
+        frames: List[Optional[pd.DataFrame]] = []
+        for extent in extents:
+            if extent is None:
+                frames.append(None)
+                continue
+            offset, size = extent
+            with shm.buf[offset : offset + size] as view:
+                reader: pa.ipc.RecordBatchStreamReader = pa.ipc.open_stream(pa.py_buffer(view))
+                frames.append(reader.read_all().to_pandas())
+                del reader
+        return frames
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _ipc_size(table: pa.Table) -> int:
+    sink: pa.MockOutputStream = pa.MockOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.size()
+
+
+def _multiprocess_load_task(
+    zip_or_filename: str, chunk: MemberChunk, checkpoint_opts: CheckpointOpts, serializer: IContentSerializer
+) -> Tuple[List[DocumentPayload], SharedFrames]:
+    """Deserializes a chunk of documents. Tagged frames are returned in shared memory, payloads without content."""
     try:
-        payload = load_payload(zip_or_filename, filename, checkpoint_opts, serializer)
-        return payload
+        payloads: List[DocumentPayload] = [
+            load_payload(zip_or_filename, filename, checkpoint_opts, serializer, content=content)
+            for filename, content in chunk
+        ]
+        frames: List[Optional[pd.DataFrame]] = [
+            x.content if isinstance(x.content, pd.DataFrame) else None for x in payloads
+        ]
+        shared_frames: SharedFrames = export_frames(frames)
+        for payload, frame in zip(payloads, frames):
+            if frame is not None:
+                payload.content = None
+        return payloads, shared_frames
     except Exception as ex:
-        logger.error(f"Filename: {filename}")
+        logger.error(f"Filenames: {[filename for filename, _ in chunk]}")
         logger.exception(ex)
         raise ex
-        # return ex
+
+
+def _collect_payloads(future: Future) -> List[DocumentPayload]:
+    payloads, shared_frames = future.result()
+    for payload, frame in zip(payloads, import_frames(shared_frames)):
+        if frame is not None:
+            payload.content = frame
+    return payloads
+
+
+def _release_payloads(pending: Iterable[Future]) -> None:
+    """Waits for chunks that will not be consumed and releases their shared memory blocks"""
+    for future in pending:
+        if future.cancel():
+            continue
+        try:
+            _, shared_frames = future.result()
+            import_frames(shared_frames)
+        except Exception:  # pylint: disable=broad-except
+            pass
 
 
 def load_payloads_multiprocess(
     *,
-    zip_or_filename: str,
+    zip_or_filename: Union[str, zipfile.ZipFile],
     checkpoint_opts: CheckpointOpts,
     filenames: List[str],
-    ordered: bool = False,
+    ordered: bool = True,
 ) -> Iterable[DocumentPayload]:
+    """Yields a payload stream deserialized by a (spawned) process pool.
 
+    A reader thread reads archive members ahead of the workers. Workers deserialize chunks of
+    `deserialize_chunksize` documents and hand back tagged frames as Arrow IPC streams in shared memory,
+    so only small payload shells are pickled. At most 2 x `deserialize_processes` chunks are in flight.
+    Payloads are yielded in order of `filenames` if `ordered`, otherwise as chunks complete. If the stream
+    is not consumed to the end, the shared memory of chunks still in flight is released when it is closed.
+    """
     try:
+        processes: int = max(1, checkpoint_opts.deserialize_processes or 1)
+        chunksize: int = max(1, checkpoint_opts.deserialize_chunksize or 1)
 
-        logger.trace(f"Using parallel deserialization with {checkpoint_opts.deserialize_processes} processes.")
+        logger.trace(f"Using parallel deserialization with {processes} processes.")
         if checkpoint_opts.feather_folder:
             logger.trace(f"Using feather checkpoint folder {checkpoint_opts.feather_folder}.")
 
         serializer: IContentSerializer = create_serializer(checkpoint_opts)
+        source: str = zip_or_filename.filename if isinstance(zip_or_filename, zipfile.ZipFile) else zip_or_filename
 
-        args: Iterable[Tuple] = tqdm(
-            [(filename, zip_or_filename, serializer, checkpoint_opts) for filename in filenames], desc="read"
+        chunks: Iterator[MemberChunk] = prefetch(
+            read_members(
+                zip_or_filename=zip_or_filename,
+                checkpoint_opts=checkpoint_opts,
+                filenames=filenames,
+                chunksize=chunksize,
+            ),
+            maxsize=2 * processes,
         )
 
-        with get_context("spawn").Pool(processes=checkpoint_opts.deserialize_processes) as executor:
+        with tqdm(total=len(filenames), desc="read") as progress, ProcessPoolExecutor(
+            max_workers=processes, mp_context=get_context("spawn")
+        ) as executor:
+            pending: Deque[Future] = deque()
+
+            def completed() -> Iterable[DocumentPayload]:
+                if ordered:
+                    future: Future = pending.popleft()
+                else:
+                    future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+                    pending.remove(future)
+                payloads: List[DocumentPayload] = _collect_payloads(future)
+                progress.update(len(payloads))
+                return payloads
 
-            mapper = executor.imap_unordered if not ordered else executor.imap
-            payloads_futures: Iterable[DocumentPayload] = mapper(
-                _multiprocess_load_task, args, chunksize=checkpoint_opts.deserialize_chunksize
-            )
+            try:
+                for chunk in chunks:
+                    if len(pending) >= 2 * processes:
+                        yield from completed()
+                    pending.append(executor.submit(_multiprocess_load_task, source, chunk, checkpoint_opts, serializer))
 
-            for payload in payloads_futures:
-                yield payload
+                while pending:
+                    yield from completed()
+            finally:
+                """Consumer may stop early (close, exception): release blocks exported by in-flight chunks"""
+                chunks.close()
+                _release_payloads(pending)
 
     except Exception as ex:
         logger.exception(ex)
         raise ex
-        # return ex
@@ -3,13 +3,17 @@ import os
 import pathlib
 import zipfile
 from io import StringIO
-from typing import List
+from typing import Any, Callable, Iterable, List, Union
 
 import numpy as np
 import pandas as pd
 
+from penelope.utility import PropertyValueMaskingOpts, create_mask, strip_path_and_extension
+
 from .interface import DOCUMENT_INDEX_FILENAME, FILE_PATTERN
 
+DocumentFilter = Union[Callable[[pd.DataFrame], Any], PropertyValueMaskingOpts, dict, Iterable[str]]
+
 
 def find_checkpoints(source_folder: str, file_pattern: str = FILE_PATTERN) -> List[str]:
     filenames = sorted(pathlib.Path(source_folder).rglob(file_pattern))
@@ -51,3 +55,33 @@ def read_document_index(archive_filename: str) -> pd.DataFrame:
         if os.stat(archive_filename).st_size == 0:
             raise EmptyCheckpointError() from ex
         raise CorruptCheckpointError() from ex
+
+
+def filter_document_index(document_index: pd.DataFrame, document_filter: DocumentFilter) -> pd.DataFrame:
+    """Returns documents in `document_index` that satisfies `document_filter`
+
+    Args:
+        document_index (pd.DataFrame): Document index
+        document_filter (DocumentFilter): Either a predicate that returns a mask given the document index,
+            property-value criterias (see `PropertyValueMaskingOpts`) e.g. dict(year=(1960, 1969)), or
+            a list of document names (or filenames).
+    """
+    if document_filter is None:
+        return document_index
+
+    if isinstance(document_filter, PropertyValueMaskingOpts):
+        document_filter = document_filter.props
+
+    if isinstance(document_filter, dict):
+        mask: np.ndarray = np.asarray(create_mask(document_index, document_filter), dtype=bool)
+    elif callable(document_filter):
+        mask = np.asarray(document_filter(document_index), dtype=bool)
+    else:
+        document_names: pd.Series = (
+            document_index.document_name
+            if 'document_name' in document_index.columns
+            else document_index.filename.map(strip_path_and_extension)
+        )
+        mask = document_names.isin({strip_path_and_extension(x) for x in document_filter}).values
+
+    return document_index[mask]
@@ -38,15 +38,17 @@ class StreamVectorizer:
         name2id: dict = self.document_index['document_id'].to_dict().get
 
         if content_type == interfaces.ContentType.TOKENS:
-            if self.token2id is not None:
+            if self.token2id is not None and not self.vectorize_opts.shard_size:
                 fg: dict = self.token2id.data.get
                 tokens2series = lambda tokens: pd.Series([fg(t) for t in tokens], dtype=np.int32)
                 stream = [(name2id(p.document_name), tokens2series(p.content)) for p in payloads]
                 vectorized_corpus: pc.VectorizedCorpus = self.from_token_id_stream(stream)
             else:
+                """Sharded vectorization against the shared vocabulary if `shard_size` is set"""
                 stream = ((p.document_name, p.content) for p in payloads)
                 vectorized_corpus: pc.VectorizedCorpus = pc.CorpusVectorizer().fit_transform_(
                     stream,
+                    vocabulary=self.token2id.data if self.token2id is not None else None,
                     document_index=self.document_index,
                     vectorize_opts=self.vectorize_opts.update(already_tokenized=True),
                 )
@@ -11,7 +11,7 @@ if TYPE_CHECKING:
     from penelope.corpus.readers import ExtractTaggedTokensOpts, TextReaderOpts, TextTransformOpts
 
     from . import pipelines
-    from .checkpoint import CheckpointOpts
+    from .checkpoint import CheckpointOpts, DocumentFilter
 
 # pylint: disable=too-many-public-methods, no-member
 
@@ -49,10 +49,16 @@ class PipelineShortcutMixIn:
         filename: str,
         checkpoint_opts: CheckpointOpts,
         extra_reader_opts: TextReaderOpts = None,
+        document_filter: DocumentFilter = None,
     ) -> pipelines.CorpusPipeline:
         """_ => DATAFRAME"""
         return self.add(
-            tasks.LoadTaggedCSV(filename=filename, checkpoint_opts=checkpoint_opts, extra_reader_opts=extra_reader_opts)
+            tasks.LoadTaggedCSV(
+                filename=filename,
+                checkpoint_opts=checkpoint_opts,
+                extra_reader_opts=extra_reader_opts,
+                document_filter=document_filter,
+            )
         )
 
     def load_id_tagged_frame(
@@ -101,9 +107,15 @@ class PipelineShortcutMixIn:
         self: pipelines.CorpusPipeline,
         folder: str,
         force: bool = False,
+        consolidated: bool = False,
+        document_filter: DocumentFilter = None,
     ) -> pipelines.CorpusPipeline:
         """[DATAFRAME] => [CHECKPOINT] => PASSTHROUGH"""
-        return self.add(tasks.CheckpointFeather(folder=folder, force=force))
+        return self.add(
+            tasks.CheckpointFeather(
+                folder=folder, force=force, consolidated=consolidated, document_filter=document_filter
+            )
+        )
 
     def tokens_to_text(self: pipelines.CorpusPipeline) -> pipelines.CorpusPipeline:
         """[TOKEN] => TEXT"""
@@ -153,6 +165,7 @@ class PipelineShortcutMixIn:
         tf_threshold: int = None,
         tf_keeps: Container[Union[int, str]] = None,
         close: bool = True,
+        processes: int = None,
     ) -> pipelines.CorpusPipeline:
 
         token_type: tasks.Vocabulary.TokenType = (
@@ -165,6 +178,7 @@ class PipelineShortcutMixIn:
                 tf_threshold=tf_threshold,
                 tf_keeps=tf_keeps,
                 close=close,
+                processes=processes,
             )
         )
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import collections
 import contextlib
 import itertools
 import os
@@ -225,6 +226,7 @@ class LoadTaggedCSV(PoSCountMixIn, ITask):
     extra_reader_opts: Optional[TextReaderOpts] = None
     checkpoint_data: cp.CheckpointData = field(default=None, init=None, repr=None)
     stop_at_index: int = None
+    document_filter: cp.DocumentFilter = None
 
     def __post_init__(self):
         self.in_content_type = ContentType.NONE
@@ -238,7 +240,7 @@ class LoadTaggedCSV(PoSCountMixIn, ITask):
     def exit(self):
         super().exit()
         # self.flush_pos_counts()
-        if self.checkpoint_opts.feather_folder:
+        if self.checkpoint_opts.feather_folder and self.document_filter is None:
             cp.feather.write_document_index(self.checkpoint_opts.feather_folder, self.document_index)
 
     def setup(self) -> ITask:
@@ -247,11 +249,17 @@ class LoadTaggedCSV(PoSCountMixIn, ITask):
         self.checkpoint_opts = self.checkpoint_opts or self.pipeline.config.checkpoint_opts
         self.checkpoint_data: cp.CheckpointData = self.load_archive()
 
-        document_index: pd.DataFrame = cp.feather.get_document_index(
-            self.checkpoint_opts.feather_folder, self.checkpoint_data.document_index
-        )
-
-        self.pipeline.payload.set_reader_index(document_index)
+        if self.document_filter is None:
+            document_index: pd.DataFrame = cp.feather.get_document_index(
+                self.checkpoint_opts.feather_folder, self.checkpoint_data.document_index
+            )
+            self.pipeline.payload.set_reader_index(document_index)
+        else:
+            """Stored (complete) feather document index is neither used nor overwritten by a partial load"""
+            self.pipeline.payload.set_reader_index(self.checkpoint_data.document_index)
+            self.pipeline.payload.effective_document_index = cp.filter_document_index(
+                self.document_index, self.checkpoint_data.filenames
+            )
 
         self.pipeline.put("reader_opts", self.extra_reader_opts.props)
         self.pipeline.put("checkpoint_opts", self.checkpoint_opts.props)
@@ -271,6 +279,7 @@ class LoadTaggedCSV(PoSCountMixIn, ITask):
             self.filename,
             checkpoint_opts=self.checkpoint_opts,
             reader_opts=self.extra_reader_opts,
+            document_filter=self.document_filter,
         )
 
     def process_payload(self, payload: DocumentPayload) -> DocumentPayload:
@@ -287,6 +296,8 @@ class CheckpointFeather(DefaultResolveMixIn, ITask):
 
     folder: str = None
     force: bool = field(default=False)
+    consolidated: bool = field(default=False)
+    document_filter: cp.DocumentFilter = None
 
     def __post_init__(self):
         self.in_content_type = ContentType.TAGGED_FRAME
@@ -300,19 +311,31 @@ class CheckpointFeather(DefaultResolveMixIn, ITask):
         self.force = False
 
     def create_instream(self) -> Iterable[DocumentPayload]:
-        return (
-            ReadFeather(folder=self.folder, pipeline=self.pipeline)
-            if cp.feather.document_index_exists(folder=self.folder)
-            else WriteFeather(folder=self.folder, prior=self.prior, pipeline=self.pipeline, force=self.force)
-        ).outstream()
+        if not cp.feather.document_index_exists(folder=self.folder):
+            writer: Iterable[DocumentPayload] = WriteFeather(
+                folder=self.folder,
+                prior=self.prior,
+                pipeline=self.pipeline,
+                force=self.force,
+                consolidated=self.consolidated,
+            ).outstream()
+            if self.document_filter is None:
+                return writer
+            """The checkpoint is always complete, selected documents are then read from the new checkpoint"""
+            collections.deque(writer, maxlen=0)
+        return ReadFeather(folder=self.folder, pipeline=self.pipeline, document_filter=self.document_filter).outstream()
 
 
 @dataclass
 class WriteFeather(ITask):
-    """Stores sequence of tagged data frame documents to archive."""
+    """Stores sequence of tagged data frame documents to archive.
+    If `consolidated` is True, then documents are appended to a few large Arrow files instead of one file per document.
+    """
 
     folder: str = None
     force: bool = False
+    consolidated: bool = False
+    writer: cp.feather.FeatherArchiveWriter = field(default=None, init=None, repr=None)
 
     def __post_init__(self):
         self.in_content_type = ContentType.TAGGED_FRAME
@@ -320,13 +343,20 @@ class WriteFeather(ITask):
 
     def enter(self):
         os.makedirs(self.folder, exist_ok=True)
+        if self.consolidated:
+            self.writer = cp.feather.FeatherArchiveWriter(self.folder)
 
     def process_payload(self, payload: DocumentPayload) -> Iterable[DocumentPayload]:
-        if self.force or not cp.feather.payload_exists(folder=self.folder, payload=payload):
+        if self.writer is not None:
+            self.writer.write(payload)
+        elif self.force or not cp.feather.payload_exists(folder=self.folder, payload=payload):
             cp.feather.write_payload(folder=self.folder, payload=payload)
         return payload
 
     def exit(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
         cp.feather.write_document_index(self.folder, self.document_index)
 
 
@@ -335,19 +365,19 @@ class ReadFeather(DefaultResolveMixIn, ITask):
     """Stores sequence of tagged data frame documents to archive."""
 
     folder: str = None
+    document_filter: cp.DocumentFilter = None
 
     def __post_init__(self):
         self.in_content_type = ContentType.NONE
         self.out_content_type = ContentType.TAGGED_FRAME
 
     def enter(self):
-        self.pipeline.payload.effective_document_index = cp.feather.read_document_index(self.folder)
+        self.pipeline.payload.effective_document_index = cp.filter_document_index(
+            cp.feather.read_document_index(self.folder), self.document_filter
+        )
 
     def process_stream(self) -> Iterable[DocumentPayload]:
-        return (
-            cp.feather.read_payload(os.path.join(self.folder, filename))
-            for filename in self.document_index.filename.tolist()
-        )
+        return cp.feather.read_payloads(self.folder, self.document_index.filename.tolist())
 
 
 @dataclass
@@ -706,6 +736,7 @@ class Vocabulary(ITask):
     close: bool = True
     tf_threshold: int = None
     tf_keeps: Container[Union[int, str]] = field(default_factory=set)
+    processes: int = None
     translation: dict[int, int] = field(default=None, init=False)
     is_built: bool = field(default=False, init=False)
     target: str = field(init=False, default="")
@@ -738,8 +769,10 @@ class Vocabulary(ITask):
             self.token2id.ingest(extra_tokens)
 
         total: int = len(self.document_index.index) if self.document_index is not None else None
-        for payload in self.prior.outstream(total=total, desc="Vocab"):
-            self.token2id.ingest_stream([self._payload_to_token_stream(payload)])
+        self.token2id.ingest_stream(
+            (self._payload_to_token_stream(payload) for payload in self.prior.outstream(total=total, desc="Vocab")),
+            processes=self.processes,
+        )
 
         if self.tf_threshold and self.tf_threshold > 1:
             _, self.translation = self.token2id.compress(
@@ -1,7 +1,18 @@
-from typing import Any, Dict
-
+import hashlib
+import itertools
+import json
+import os
+import time
+from multiprocessing import get_context
+from os.path import isfile
+from os.path import join as jj
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
 from loguru import logger
 
+from penelope.utility import read_json, write_json
 from penelope.vendor.gensim_api import corpora as gensim_corpora
 from penelope.vendor.gensim_api import models as gensim_models
 
@@ -20,6 +31,19 @@ def compute_score(id2word, model, corpus) -> float:
     return None
 
 
+def compute_model_scores(model: Any, corpus: Any, dictionary: gensim_corpora.Dictionary) -> Dict[str, float]:
+    """Returns u_mass coherence and (if supported by model) perplexity for a trained model"""
+    coherence_score: float = gensim_models.CoherenceModel(
+        model=model, corpus=corpus, dictionary=dictionary, coherence='u_mass'
+    ).get_coherence()
+
+    perplexity_score: float = (
+        float(np.exp2(-model.log_perplexity(corpus, len(corpus)))) if hasattr(model, 'log_perplexity') else None
+    )
+
+    return dict(coherence_score=coherence_score, perplexity_score=perplexity_score)
+
+
 def compute_scores(
     engine_key: options.EngineKey,
     id2word: Dict[int, str],
@@ -33,20 +57,17 @@ def compute_scores(
     metrics = []
 
     dictionary = gensim_corpora.from_id2token_to_dictionary(id2word)
+    engine_spec: options.EngineSpec = options.get_engine_specification(engine_key=engine_key)
 
     for num_topics in range(start, stop, step):
 
-        engine_spec: options.EngineSpec = options.get_engine_specification(engine_key=engine_key)
-
-        model = engine_spec.engine(**engine_spec.get_options(corpus=corpus, id2word=id2word, engine_args=engine_args))
-
-        coherence_score = gensim_models.CoherenceModel(
-            model=model, corpus=corpus, dictionary=dictionary, coherence='u_mass'
+        model = engine_spec.engine(
+            **engine_spec.get_options(
+                corpus=corpus, id2word=id2word, engine_args={**(engine_args or {}), 'n_topics': num_topics}
+            )
         )
 
-        perplexity_score = 2 ** model.log_perplexity(corpus, len(corpus))
-
-        metric = dict(num_topics=num_topics, coherence_score=coherence_score, perplexity_score=perplexity_score)
+        metric = dict(num_topics=num_topics, **compute_model_scores(model, corpus, dictionary))
         metrics.append(metric)
 
     # filename = os.path.join(target_folder, "metric_scores.json")
@@ -57,6 +78,134 @@ def compute_scores(
     return metrics
 
 
+SWEEP_CORPUS_FILENAME: str = "sweep_corpus.mm"
+SWEEP_SCORES_FILENAME: str = "sweep_scores.csv"
+SWEEP_FINGERPRINT_FILENAME: str = "sweep_corpus.json"
+
+
+def sweep_configurations(
+    n_topics: Iterable[int], random_seeds: Iterable[int] = (None,), alphas: Iterable[Any] = ('symmetric',)
+) -> List[Dict[str, Any]]:
+    """Returns engine args overrides for each combination of topic count, seed and alpha"""
+    return [
+        dict(n_topics=n, random_seed=seed, alpha=alpha)
+        for n, seed, alpha in itertools.product(n_topics, random_seeds, alphas)
+    ]
+
+
+def sweep_key(configuration: Dict[str, Any]) -> str:
+    return json.dumps(configuration, sort_keys=True, default=str)
+
+
+def _sweep_task(args: Tuple[str, str, Dict[int, str], Dict[str, Any], Dict[str, Any]]) -> Dict[str, Any]:
+    """Trains and scores a single configuration on the (memory-mapped) sweep corpus"""
+    engine_key, corpus_filename, id2word, engine_args, configuration = args
+    try:
+        started: float = time.time()
+        corpus: gensim_corpora.MmCorpus = gensim_corpora.MmCorpus(corpus_filename)
+        dictionary = gensim_corpora.from_id2token_to_dictionary(id2word)
+        engine_spec: options.EngineSpec = options.get_engine_specification(engine_key=engine_key)
+        model = engine_spec.engine(
+            **engine_spec.get_options(
+                corpus=corpus, id2word=id2word, engine_args={**(engine_args or {}), **configuration}
+            )
+        )
+        scores: Dict[str, float] = compute_model_scores(model, corpus, dictionary)
+        return dict(key=sweep_key(configuration), **configuration, **scores, duration=round(time.time() - started, 2))
+    except Exception as ex:
+        logger.exception(ex)
+        raise ex
+
+
+def corpus_fingerprint(corpus: Any) -> Dict[str, Any]:
+    """Returns number of documents, number of non-zero entries and a SHA-1 hash of the (id, weight) pairs of `corpus`"""
+    digest = hashlib.sha1()
+    n_documents, nnz = 0, 0
+    for document in corpus:
+        pairs: np.ndarray = np.array(document, dtype=np.float64).reshape(-1, 2)
+        digest.update(np.int64(len(pairs)).tobytes())
+        digest.update(pairs.tobytes())
+        n_documents, nnz = n_documents + 1, nnz + len(pairs)
+    return dict(n_documents=n_documents, nnz=nnz, sha1=digest.hexdigest())
+
+
+def sweep(
+    engine_key: options.EngineKey,
+    id2word: Dict[int, str],
+    corpus: Any,
+    *,
+    configurations: List[Dict[str, Any]],
+    folder: str,
+    engine_args: Dict[str, Any] = None,
+    processes: int = None,
+) -> pd.DataFrame:
+    """Trains and scores (u_mass coherence, perplexity) one model per configuration.
+
+    The training corpus is serialized once to `folder` in Matrix Market format and each worker streams
+    from that (page-cached) file. Scores are appended to `folder/sweep_scores.csv` as each model finishes,
+    and configurations already found in that file are skipped, so an interrupted sweep can be resumed.
+    A fingerprint of the corpus is stored with the file. If `corpus` doesn't match the fingerprint on resume,
+    the corpus file is rebuilt and the stale scores are moved aside (to `sweep_scores.<sha1>.csv`).
+
+    Args:
+        engine_key (options.EngineKey): engine to use
+        id2word (Dict[int, str]): vocabulary
+        corpus (Any): a gensim BoW corpus (e.g. a Sparse2Corpus)
+        configurations (List[Dict[str, Any]]): engine args overrides (see `sweep_configurations`)
+        folder (str): sweep folder (corpus and results)
+        engine_args (Dict[str, Any], optional): engine args common to all configurations. Defaults to None.
+        processes (int, optional): number of worker processes. Defaults to None (sequential).
+
+    Returns:
+        pd.DataFrame: scores of all configurations computed so far
+    """
+
+    os.makedirs(folder, exist_ok=True)
+
+    corpus_filename: str = jj(folder, SWEEP_CORPUS_FILENAME)
+    scores_filename: str = jj(folder, SWEEP_SCORES_FILENAME)
+
+    fingerprint_filename: str = jj(folder, SWEEP_FINGERPRINT_FILENAME)
+
+    fingerprint: Dict[str, Any] = corpus_fingerprint(corpus)
+    stored_fingerprint: Dict[str, Any] = read_json(fingerprint_filename) if isfile(fingerprint_filename) else None
+
+    if stored_fingerprint != fingerprint:
+        if isfile(scores_filename):
+            stale_filename: str = jj(folder, f"sweep_scores.{(stored_fingerprint or {}).get('sha1', 'unknown')}.csv")
+            logger.warning(f"sweep: corpus has changed, moving scores of previous corpus to {stale_filename}")
+            os.replace(scores_filename, stale_filename)
+        gensim_corpora.MmCorpus.serialize(corpus_filename, corpus)
+        write_json(fingerprint_filename, fingerprint)
+
+    done: Set[str] = set(pd.read_csv(scores_filename, sep='\t').key) if isfile(scores_filename) else set()
+    pending: List[Dict[str, Any]] = [c for c in configurations if sweep_key(c) not in done]
+
+    if len(done) > 0:
+        logger.info(f"sweep: resuming, {len(done)} done, {len(pending)} remaining")
+
+    args: List[Tuple] = [(engine_key, corpus_filename, dict(id2word), engine_args, c) for c in pending]
+
+    def append_result(result: Dict[str, Any]) -> None:
+        if isfile(scores_filename):
+            columns: List[str] = pd.read_csv(scores_filename, sep='\t', nrows=0).columns.tolist()
+            pd.DataFrame([result]).reindex(columns=columns).to_csv(
+                scores_filename, sep='\t', mode='a', header=False, index=False
+            )
+        else:
+            pd.DataFrame([result]).to_csv(scores_filename, sep='\t', header=True, index=False)
+
+    if not processes:
+        for arg in args:
+            append_result(_sweep_task(arg))
+    else:
+        with get_context("spawn").Pool(processes=processes) as pool:
+            for result in pool.imap_unordered(_sweep_task, args):
+                append_result(result)
+
+    return pd.read_csv(scores_filename, sep='\t') if isfile(scores_filename) else pd.DataFrame()
+
+
 # Can take a long time to run.
 # model_list, coherence_values = compute_coherence_values(dictionary=id2word, corpus=corpus, texts=data_lemmatized, start=2, limit=40, step=6)
 # # Show graph
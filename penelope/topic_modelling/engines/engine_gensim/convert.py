@@ -1,10 +1,12 @@
 # pylint: disable=unused-argument
 from __future__ import annotations
 
+import csv
 from os.path import isfile
 from os.path import join as jj
-from typing import Any, Mapping, Tuple, Union
+from typing import Any, Iterable, Mapping, Tuple, Union
 
+import more_itertools
 import numpy as np
 import pandas as pd
 import scipy.sparse as sp
@@ -24,52 +26,82 @@ def probe_filenames(folder: str, filenames: list[str]) -> str | None:
     return None
 
 
-def convert_topic_tokens(folder: str, source_filename: str = None) -> pd.DataFrame:
+def write_feather_chunks(target_filename: str, chunks: Iterable[pd.DataFrame], empty: pd.DataFrame) -> int:
+    """Writes a stream of data frames as record batches to a single (LZ4 compressed) FEATHER v2 file"""
+
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+    writer: pa.ipc.RecordBatchFileWriter = None
+    n_rows: int = 0
+    try:
+        for chunk in chunks:
+            table: pa.Table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pa.ipc.new_file(
+                    target_filename, table.schema, options=pa.ipc.IpcWriteOptions(compression='lz4')
+                )
+            writer.write_table(table)
+            n_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        empty.to_feather(target_filename)
+
+    return n_rows
+
+
+def convert_topic_tokens(folder: str, source_filename: str = None, chunk_size: int = 5_000_000) -> None:
+    """Converts a MALLET topic-word-weights file into a topic-token-weights FEATHER file.
+
+    The file is read in chunks of `chunk_size` rows (twice, since the smoothing weight i.e. the global
+    minimum weight must be known before filtering), so peak memory is bounded by chunk size."""
 
     mallet_folder: str = jj(folder, "mallet")
 
-    target_filename = jj(folder, 'topic_token_weights.zip')
+    target_filename = jj(folder, 'topic_token_weights.feather')
 
-    if isfile(target_filename):
-        return None
+    if isfile(target_filename) or isfile(jj(folder, 'topic_token_weights.zip')):
+        return
 
     source_filename: str = source_filename or probe_filenames(
         mallet_folder, ["topicwordweights.txt.gz", "topicwordweights.txt", "topicwordweights.zip"]
     )
 
-    id2token: dict[int, str] = pd.read_json(jj(folder, "topic_model_id2token.json.gz"), typ="series")
-    token2id: dict[str, int] = {v: k for k, v in id2token.items()}
+    id2token: pd.Series = pd.read_json(jj(folder, "topic_model_id2token.json.gz"), typ="series")
+    vocabulary: pd.Index = pd.Index(id2token.values)
+    token_ids: np.ndarray = id2token.index.to_numpy()
 
-    ttw: pd.DataFrame = pd.read_csv(
-        source_filename,
+    csv_opts: dict = dict(
         names=['topic_id', 'token', 'weight'],
-        dtype={'topic_id': np.int16, 'weight': np.float64},
+        dtype={'topic_id': np.int16, 'token': str, 'weight': np.float64},
         header=None,
         sep='\t',
+        quoting=csv.QUOTE_NONE,
+        keep_default_na=False,
+        chunksize=chunk_size,
     )
 
-    ttw = ttw[ttw.weight > ttw.weight.min()]  # pylint: disable=no-member
+    with pd.read_csv(source_filename, usecols=['weight'], **csv_opts) as reader:
+        min_weight: float = min(chunk.weight.min() for chunk in reader)
 
-    ttw['token_id'] = ttw.token.apply(token2id.get)
+    def chunks() -> Iterable[pd.DataFrame]:
+        with pd.read_csv(source_filename, **csv_opts) as reader:
+            for ttw in reader:
+                ttw = ttw[ttw.weight > min_weight]
+                indexer: np.ndarray = vocabulary.get_indexer(ttw.token)
+                if (indexer < 0).any():
+                    raise ValueError(f"unknown tokens in {source_filename}: {ttw.token[indexer < 0].head().tolist()}")
+                yield pd.DataFrame(
+                    data=dict(
+                        topic_id=ttw.topic_id.to_numpy(dtype=np.int16),
+                        token_id=token_ids[indexer].astype(np.int32),
+                        weight=ttw.weight.to_numpy(dtype=np.float32),
+                    )
+                )
 
-    ttw.drop(columns='token', inplace=True)
-
-    ttw['topic_id'] = ttw.topic_id.astype(np.int16)
-    ttw['token_id'] = ttw.token_id.astype(np.int32)
-
-    # df['weight'] = df.weight.astype(np.float32)
-
-    ttw = ttw[['topic_id', 'token_id', 'weight']].reset_index(drop=True)
-
-    # ttw.to_feather(jj(folder, "topic_token_weights.feather"))
-
-    ttw.to_csv(
-        target_filename,
-        sep='\t',
-        compression=dict(method='zip', archive_name="topic_token_weights.csv"),
-        header=True,
-    )
-    return ttw
+    write_feather_chunks(target_filename, chunks(), empty=pd.DataFrame(columns=['topic_id', 'token_id', 'weight']))
 
 
 def convert_overview(folder: str) -> None:
@@ -92,55 +124,80 @@ def convert_overview(folder: str) -> None:
     # df.to_feather(jj(folder, 'topic_token_overview.feather'))
 
 
-def doctopics_to_dataframe(source_filename: str, normalize: bool = False, epsilon: float = 0.005) -> pd.DataFrame:
+def doctopics_chunk_to_dataframe(rows: list[str], normalize: bool = False, epsilon: float = 0.005) -> pd.DataFrame:
+    """Parses a chunk of sparse (doc, name, topic, weight, topic, weight, ...) doc-topics rows.
 
-    ds, ts, ws = [], [], []
+    All rows are parsed in a single call, pairs are gathered by index arithmetic on the flat value array."""
 
-    with smart_open(source_filename, mode='rt') as fp:
+    rows = [row.strip() for row in rows]
+    n_values: np.ndarray = np.fromiter((row.count('\t') + 1 for row in rows), dtype=np.int64, count=len(rows))
+    values: np.ndarray = np.fromstring('\t'.join(rows), sep='\t')  # pylint: disable=no-member
+
+    if len(values) != n_values.sum():
+        raise ValueError("doctopics: unexpected (non-numeric) value encountered")
 
-        for row in tqdm(fp, mininterval=1.0):
+    starts: np.ndarray = np.cumsum(n_values) - n_values
+    n_pairs: np.ndarray = (n_values - 2) // 2
 
-            if row[0] == '#':
-                continue
+    pair_rows: np.ndarray = np.repeat(np.arange(len(rows)), n_pairs)
+    pair_index: np.ndarray = np.arange(len(pair_rows)) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+    topic_positions: np.ndarray = starts[pair_rows] + 2 + 2 * pair_index
 
-            values: list[float] = np.array(list(float(x) for x in row.strip().split('\t')))
+    topic_ids: np.ndarray = values[topic_positions]
+    weights: np.ndarray = values[topic_positions + 1]
 
-            document_id: int = int(values[0])
-            topic_ids: np.ndarray = values[2::2]
-            weights: np.ndarray = values[3::2]
+    keep: np.ndarray = weights >= epsilon
+    pair_rows, topic_ids, weights = pair_rows[keep], topic_ids[keep], weights[keep]
 
-            keep_ids: np.ndarray = np.argwhere(weights >= epsilon).T[0]
+    if normalize:
+        weights /= np.bincount(pair_rows, weights=weights, minlength=len(rows))[pair_rows]
 
-            topic_ids: np.ndarray = topic_ids[keep_ids].astype(int)
-            weights: np.ndarray = weights[keep_ids]
+    return pd.DataFrame(
+        data=dict(
+            document_id=values[starts][pair_rows].astype(np.int32),
+            topic_id=topic_ids.astype(np.int16),
+            weight=weights,
+        )
+    )
 
-            if normalize and len(weights) > 0:
-                weights /= weights.sum()
 
-            ds.append((document_id, len(topic_ids)))
-            ts.append(topic_ids)
-            ws.append(weights)
+def doctopics_to_chunks(
+    source_filename: str, normalize: bool = False, epsilon: float = 0.005, chunk_size: int = 100_000
+) -> Iterable[pd.DataFrame]:
+    """Parses a MALLET doc-topics file in chunks of `chunk_size` documents"""
+    with smart_open(source_filename, mode='rt') as fp:
+        rows: Iterable[str] = (row for row in fp if row[0] != '#' and not row.isspace())
+        for chunk in tqdm(more_itertools.chunked(rows, chunk_size), mininterval=1.0):
+            yield doctopics_chunk_to_dataframe(chunk, normalize=normalize, epsilon=epsilon)
+
 
-    dtw: pd.DataFrame = pd.DataFrame(
-        data={
-            'document_id': (t for tx in ([d] * n for d, n in ds) for t in tx),
-            'topic_id': (t for tx in ts for t in tx),
-            'weight': (w for wx in ws for w in wx),
-        },
+def doctopics_to_dataframe(
+    source_filename: str, normalize: bool = False, epsilon: float = 0.005, chunk_size: int = 100_000
+) -> pd.DataFrame:
+
+    dtw: pd.DataFrame = pd.concat(
+        doctopics_to_chunks(source_filename, normalize=normalize, epsilon=epsilon, chunk_size=chunk_size),
+        ignore_index=True,
     )
-    dtw['topic_id'] = dtw.topic_id.astype(np.int16)
-    dtw['document_id'] = dtw.document_id.astype(np.int32)
+
     return dtw
 
 
 def convert_document_topics(
-    folder: str, source_filename: str = None, normalize: bool = True, epsilon: float = 0.005
-) -> pd.DataFrame:
-    """Converts a 2.0.8+ MALLET doc-topics file into data frame stored in FEATHER format."""
+    folder: str,
+    source_filename: str = None,
+    normalize: bool = True,
+    epsilon: float = 0.005,
+    chunk_size: int = 100_000,
+) -> None:
+    """Converts a 2.0.8+ MALLET doc-topics file into data frame stored in FEATHER format.
+
+    Chunks of `chunk_size` documents are parsed and appended to the target file, so peak memory
+    is bounded by chunk size (and the document index)."""
     mallet_folder: str = jj(folder, "mallet")
-    target_filename: str = jj(folder, 'document_topic_weights.zip')
+    target_filename: str = jj(folder, 'document_topic_weights.feather')
 
-    if isfile(target_filename):
+    if isfile(target_filename) or isfile(jj(folder, 'document_topic_weights.zip')):
         return
 
     source_filename: str = source_filename or probe_filenames(
@@ -155,22 +212,19 @@ def convert_document_topics(
             "doctopics.txt",
         ],
     )
-    dtw: pd.DataFrame = doctopics_to_dataframe(source_filename, normalize, epsilon)
 
-    dtw.to_feather(jj(mallet_folder, "doctopics.feather"))
+    di: pd.DataFrame = pd.read_csv(jj(folder, "documents.zip"), sep='\t', usecols=['document_id', 'year'])
 
-    di: pd.DataFrame = pd.read_csv(jj(folder, "documents.zip"), sep='\t').set_index('document_id', drop=False)
-    dtw = dtw.merge(di[['year']], left_on='document_id', right_index=True, how='left')
-    dtw['year'] = dtw.year.astype(np.int16)
+    year_lookup: np.ndarray = np.zeros(di.document_id.max() + 1, dtype=np.int16)
+    year_lookup[di.document_id.to_numpy()] = di.year.to_numpy(dtype=np.int16)
 
-    dtw.to_csv(
-        target_filename,
-        sep='\t',
-        compression=dict(method='zip', archive_name="document_topic_weights.csv"),
-        header=True,
-    )
+    def chunks() -> Iterable[pd.DataFrame]:
+        for dtw in doctopics_to_chunks(source_filename, normalize=normalize, epsilon=epsilon, chunk_size=chunk_size):
+            yield dtw.assign(weight=dtw.weight.astype(np.float32), year=year_lookup[dtw.document_id.to_numpy()])
 
-    # dtw.to_feather(jj(folder, 'document_topic_weights.feather'))
+    write_feather_chunks(
+        target_filename, chunks(), empty=pd.DataFrame(columns=['document_id', 'topic_id', 'weight', 'year'])
+    )
 
 
 def explode_pickle(folder: str) -> None:
@@ -231,7 +285,7 @@ class Id2TokenMissingError(NotImplementedError):
 
 class TranslateCorpus:
     def translate(
-        self, source: Any, *, id2token: Mapping[int, str] = None
+        self, source: Any, *, id2token: Mapping[int, str] = None, mmap_folder: str = None
     ) -> Tuple[gensim_corpora.Sparse2Corpus, gensim_corpora.Dictionary]:
 
         """Gensim doc says:
@@ -240,6 +294,10 @@ class TranslateCorpus:
         If you have a CSC in-memory matrix, you can convert it to a
         streamed corpus with the help of gensim.matutils.gensim_corpora.Sparse2Corpus.
         If not given, the model is left untrained ...."
+
+        If `mmap_folder` is given, the corpus is serialized once to memory-mapped arrays in a (content hashed)
+        subfolder of that folder, unless `source` already is such a corpus, and the returned corpus streams
+        from the mapped files.
         """
         vocabulary: Union[gensim_corpora.Dictionary, Mapping[str, int]] = None
         corpus: gensim_corpora.Sparse2Corpus = None
@@ -259,6 +317,9 @@ class TranslateCorpus:
             )
             corpus = gensim_corpora.from_stream_of_tokens_to_sparse2corpus(source, vocabulary)
 
+        if mmap_folder is not None and not isinstance(corpus, gensim_corpora.MmapSparse2Corpus):
+            corpus = gensim_corpora.MmapSparse2Corpus.serialize(mmap_folder, corpus)
+
         if vocabulary is None:
             """Build from corpus, `id2token` must be supplied"""
             if id2token is None:
@@ -64,7 +64,7 @@ class LdaEngineSpec(EngineSpec):
             num_topics=get_int(engine_args, 'n_topics', 100),
             passes=get_int(engine_args, 'passes', 1),
             per_word_topics=engine_args.get('per_word_topics', False),
-            random_state=engine_args.get('random_state'),
+            random_state=engine_args.get('random_state', get_int(engine_args, 'random_seed', None)),
             update_every=get_int(engine_args, 'update_every', 1),
             minimum_probability=engine_args.get('minimum_probability', 0.005),
             # decay= 0.1, # 0.5
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from os.path import join as jj
 from typing import Any, Dict
 
 from loguru import logger
@@ -24,6 +25,7 @@ def train(
         The method to use (see `options` module for mappings)
     engine_args : Dict[str, Any]
         Generic topic modelling options that are translated to algorithm-specific options (see `options` module for translation)
+        If `mmap_corpus` is True, the training corpus is stored as memory-mapped arrays below `work_folder`/mmap_corpus
     kwargs : Dict[str,Any], optional
         Additional vectorize options:
             `tfidf_weighing` if TF-IDF weiging should be applied, ony valid when terms/id2word are specified, by default False
@@ -40,7 +42,15 @@ def train(
             extra_options       Any other compute option passed as a kwarg
     """
 
-    corpus, dictionary = convert.TranslateCorpus().translate(train_corpus.corpus, id2token=train_corpus.id2token)
+    mmap_folder: str = (
+        jj(engine_args.get('work_folder') or options.DEFAULT_WORK_FOLDER, 'mmap_corpus')
+        if engine_args.get('mmap_corpus', False)
+        else None
+    )
+
+    corpus, dictionary = convert.TranslateCorpus().translate(
+        train_corpus.corpus, id2token=train_corpus.id2token, mmap_folder=mmap_folder
+    )
 
     if kwargs.get('tfidf_weighing', False):
         logger.warning("TF-IDF weighing of effective corpus has been disabled")
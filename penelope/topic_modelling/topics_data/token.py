@@ -1,41 +1,112 @@
 from __future__ import annotations
 
-from typing import Mapping, Protocol
+from typing import Any, Mapping, Protocol, Tuple
 
+import numpy as np
 import pandas as pd
 
 # pylint: disable=no-member, useless-super-delegation
 
 
-def get_topic_titles(
-    topic_token_weights: pd.DataFrame, topic_id: int = None, n_tokens: int = 100, id2token: dict[int, str] = None
-) -> pd.Series:
-    """Create string of `n_tokens` most probable words per topic."""
+def _topic_id_values(topic_token_weights: pd.DataFrame) -> np.ndarray:
+    if 'topic_id' in topic_token_weights.columns:
+        return topic_token_weights['topic_id'].to_numpy()
+    return topic_token_weights.index.get_level_values('topic_id').to_numpy()
+
+
+def id2token_to_array(id2token: Mapping[int, str]) -> np.ndarray:
+    """Returns vocabulary as an (object) string array indexed by token id"""
+    token_ids: np.ndarray = np.fromiter(id2token.keys(), dtype=np.int64, count=len(id2token))
+    vocabulary: np.ndarray = np.empty(token_ids.max() + 1 if len(token_ids) > 0 else 0, dtype=object)
+    vocabulary[token_ids] = list(id2token.values())
+    return vocabulary
+
+
+def top_topic_token_arrays(topic_token_weights: pd.DataFrame, n_top: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns top `n_top` tokens per topic as (n_topics x n_top) token id and weight arrays sorted by weight.
+
+    The topic token weights are laid out as a (n_topics x max-tokens-per-topic) weight array in which
+    top tokens are selected using `np.argpartition` per row. Rows are padded with token id -1 and weight -inf.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: topic ids, token ids and weights
+    """
+    topic_ids: np.ndarray = _topic_id_values(topic_token_weights)
+    order: np.ndarray = np.argsort(topic_ids, kind='stable')
+
+    topic_ids = topic_ids[order]
+    token_ids: np.ndarray = topic_token_weights['token_id'].to_numpy()[order]
+    weights: np.ndarray = topic_token_weights['weight'].to_numpy()[order]
 
-    weights: pd.DataFrame = (
-        topic_token_weights if topic_id is None else topic_token_weights[(topic_token_weights.topic_id == topic_id)]
+    unique_topic_ids, starts, counts = np.unique(topic_ids, return_index=True, return_counts=True)
+    width: int = int(counts.max()) if len(counts) > 0 else 0
+
+    rows: np.ndarray = np.repeat(np.arange(len(unique_topic_ids)), counts)
+    columns: np.ndarray = np.arange(len(topic_ids)) - np.repeat(starts, counts)
+
+    weight_matrix: np.ndarray = np.full((len(unique_topic_ids), width), -np.inf, dtype=np.float64)
+    weight_matrix[rows, columns] = weights
+
+    n_top = min(n_top, width)
+    top: np.ndarray = (
+        np.argpartition(-weight_matrix, n_top - 1, axis=1)[:, :n_top]
+        if 0 < n_top < width
+        else np.tile(np.arange(n_top), (len(unique_topic_ids), 1))
     )
+    # sort selected tokens by weight descending, ties in source order
+    top = np.take_along_axis(top, np.lexsort((top, -np.take_along_axis(weight_matrix, top, axis=1)), axis=-1), 1)
 
+    token_matrix: np.ndarray = np.full((len(unique_topic_ids), width), -1, dtype=np.int64)
+    token_matrix[rows, columns] = token_ids
+
+    return (
+        unique_topic_ids,
+        np.take_along_axis(token_matrix, top, axis=1),
+        np.take_along_axis(weight_matrix, top, axis=1),
+    )
+
+
+def _topic_token_vocabulary(topic_token_weights: pd.DataFrame, id2token: Mapping[int, str] = None) -> np.ndarray:
+    if id2token is not None:
+        return id2token_to_array(id2token)
     if 'token' not in topic_token_weights.columns:
+        raise TypeError("get_topic_titles: either TTW must contain `token` or `id2token` must be supplied")
+    token_ids: np.ndarray = topic_token_weights['token_id'].to_numpy()
+    vocabulary: np.ndarray = np.empty(token_ids.max() + 1 if len(token_ids) > 0 else 0, dtype=object)
+    vocabulary[token_ids] = topic_token_weights['token'].to_numpy()
+    return vocabulary
 
-        if id2token is None:
-            raise TypeError("get_topic_titles: either TTW must contain `token` or `id2token` must be supplied")
-
-        fg = id2token.get
-        topic_titles: pd.Series = (
-            weights.sort_values('weight', ascending=False)
-            .groupby('topic_id')
-            .agg(token=('token_id', lambda x: ' '.join(map(fg, list(x)[:n_tokens]))))
-        ).token
-
-    else:
-        topic_titles: pd.Series = (
-            weights.sort_values('weight', ascending=False)
-            .groupby('topic_id')
-            .apply(lambda x: ' '.join(x.token[:n_tokens].str.title()))
-        )
 
-    return topic_titles
+def get_topic_titles(
+    topic_token_weights: pd.DataFrame,
+    topic_id: int = None,
+    n_tokens: int = 100,
+    id2token: dict[int, str] = None,
+    top_tokens: Tuple[np.ndarray, np.ndarray, np.ndarray] = None,
+) -> pd.Series:
+    """Create string of `n_tokens` most probable words per topic.
+
+    Top tokens are gathered from a vocabulary string array. Precomputed `top_tokens`
+    arrays (see `top_topic_token_arrays`, at least `n_tokens` wide) can be supplied."""
+
+    if 'token' not in topic_token_weights.columns and id2token is None:
+        raise TypeError("get_topic_titles: either TTW must contain `token` or `id2token` must be supplied")
+
+    topic_ids, token_ids, _ = top_tokens or top_topic_token_arrays(topic_token_weights, n_tokens)
+    token_ids = token_ids[:, :n_tokens]
+
+    if topic_id is not None:
+        token_ids = token_ids[topic_ids == topic_id]
+        topic_ids = topic_ids[topic_ids == topic_id]
+
+    tokens: np.ndarray = _topic_token_vocabulary(topic_token_weights, id2token)[np.maximum(token_ids, 0)]
+
+    if 'token' in topic_token_weights.columns:
+        tokens = np.vectorize(str.title, otypes=[object])(tokens) if tokens.size > 0 else tokens
+
+    titles: list[str] = [' '.join(row[mask]) for row, mask in zip(tokens, token_ids >= 0)]
+
+    return pd.Series(data=titles, index=pd.Index(topic_ids, name='topic_id'), name='token', dtype=object)
 
 
 def get_topic_title(
@@ -67,16 +138,30 @@ def _get_topic_top_tokens(
     return top_tokens
 
 
-def top_topic_token_weights(topic_token_weights: pd.DataFrame, id2term: dict, n_top: int) -> pd.DataFrame:
+def top_topic_token_weights(
+    topic_token_weights: pd.DataFrame,
+    id2term: dict,
+    n_top: int,
+    top_tokens: Tuple[np.ndarray, np.ndarray, np.ndarray] = None,
+) -> pd.DataFrame:
     """Find top `n_top` tokens for each topic and their position."""
-    data: pd.DataFrame = (
-        topic_token_weights.groupby(['topic_id'])[['topic_id', 'token_id', 'weight']]
-        .apply(lambda x: x.nlargest(n_top, columns=['weight']))
-        .reset_index(drop=True)
+
+    topic_ids, token_ids, weights = top_tokens or top_topic_token_arrays(topic_token_weights, n_top)
+    token_ids, weights = token_ids[:, :n_top], weights[:, :n_top]
+
+    mask: np.ndarray = token_ids >= 0
+    token_ids = token_ids[mask]
+
+    data: pd.DataFrame = pd.DataFrame(
+        data={
+            'token_id': token_ids.astype(topic_token_weights['token_id'].dtype),
+            'weight': weights[mask].astype(topic_token_weights['weight'].dtype),
+            'token': id2token_to_array(id2term)[token_ids],
+            'position': np.broadcast_to(np.arange(1, mask.shape[1] + 1), mask.shape)[mask],
+        },
+        index=pd.Index(np.broadcast_to(topic_ids[:, None], mask.shape)[mask], name='topic_id'),
     )
-    data['token'] = data['token_id'].apply(lambda x: id2term[x])
-    data['position'] = data.groupby('topic_id').cumcount() + 1
-    return data.set_index('topic_id')
+    return data
 
 
 def filter_topic_tokens_overview(
@@ -109,21 +194,51 @@ class IMixIn(Protocol):
 class TopicTokensMixIn:
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
+        self._top_tokens_cache: dict[str, Any] = {}
+
+    def invalidate_top_tokens_cache(self) -> None:
+        self._top_tokens_cache = {}
+
+    def _top_tokens(self: IMixIn, n_top: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns (cached) top token arrays at least `n_top` wide"""
+        cache: dict[str, Any] = self._top_tokens_cache
+        if cache.get('source') is not self.topic_token_weights or cache.get('n_top', -1) < n_top:
+            cache.clear()
+            cache.update(
+                source=self.topic_token_weights,
+                n_top=n_top,
+                arrays=top_topic_token_arrays(self.topic_token_weights, n_top),
+            )
+        return cache['arrays']
 
     def top_topic_token_weights(self: IMixIn, n_top: int) -> pd.DataFrame:
-        return top_topic_token_weights(self.topic_token_weights, id2term=self.id2term, n_top=n_top)
+        return top_topic_token_weights(
+            self.topic_token_weights, id2term=self.id2term, n_top=n_top, top_tokens=self._top_tokens(n_top)
+        )
 
     def get_topic_titles(self: IMixIn, topic_id: int = None, n_tokens: int = 100) -> pd.Series:
         """Return strings of `n_tokens` most probable words per topic."""
-        return get_topic_titles(self.topic_token_weights, topic_id, n_tokens=n_tokens, id2token=self.id2term)
+        key: tuple = ('titles', topic_id, n_tokens)
+        top_tokens = self._top_tokens(n_tokens)
+        if key not in self._top_tokens_cache:
+            self._top_tokens_cache[key] = get_topic_titles(
+                self.topic_token_weights, topic_id, n_tokens=n_tokens, id2token=self.id2term, top_tokens=top_tokens
+            )
+        return self._top_tokens_cache[key]
 
     def get_topic_title(self: IMixIn, topic_id: int, n_tokens: int = 100) -> str:
         """Return string of `n_tokens` most probable words per topic"""
-        return get_topic_title(self.topic_token_weights, topic_id, n_tokens=n_tokens, id2token=self.id2term)
+        return self.get_topic_titles(n_tokens=n_tokens).loc[topic_id]
 
     def get_topic_title2(self: IMixIn, topic_id: int, n_tokens: int = 100) -> str:
         """Return string of `n_tokens` most probable words per topic"""
-        return get_topic_title2(self.topic_token_weights, topic_id, n_tokens=n_tokens, id2token=self.id2term)
+        titles: pd.Series = self.get_topic_titles(n_tokens=n_tokens)
+        tokens: str = (
+            titles.loc[topic_id]
+            if topic_id in titles.index
+            else "Topics has no significant presence in any documents in the entire corpus"
+        )
+        return f'ID {topic_id}: {tokens}'
 
     def get_topic_top_tokens(self: IMixIn, topic_id: int, n_tokens: int = 100) -> pd.DataFrame:
         """Return most probable tokens for given topic sorted by probability descending"""
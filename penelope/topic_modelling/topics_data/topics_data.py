@@ -258,7 +258,7 @@ class InferredTopicsData(SlimItMixIn, MemoryUsageMixIn, tt.TopicTokensMixIn):
     ):
         """Loads previously stored aggregate"""
 
-        if not isfile(jj(folder, "topic_token_weights.zip")):
+        if not any(isfile(jj(folder, f"topic_token_weights.{x}")) for x in ("zip", "feather")):
             return PickleUtility.explode(source=folder, target_folder=folder)
 
         document_index: pd.DataFrame = (
@@ -338,6 +338,12 @@ class InferredTopicsData(SlimItMixIn, MemoryUsageMixIn, tt.TopicTokensMixIn):
             return {}
         return self.topic_token_overview['label'].to_dict()
 
+    def update_topic_labels(self, labels: pd.Series) -> None:
+        """Sets topic labels and invalidates cached labels and topic titles"""
+        self.topic_token_overview['label'] = labels
+        self.__dict__.pop('topic_labels', None)
+        self.invalidate_top_tokens_cache()
+
 
 def fix_renamed_columns(di: pd.DataFrame) -> pd.DataFrame:
     """Add count columns `n_tokens` and `n_rws_tokens" if missing and other/renamed column exists."""
@@ -21,6 +21,10 @@ def find_model(path: str, model_name: str) -> dict:
 
 def find_inferred_topics_folders(folder: str) -> List[str]:
     """Return inferred data in sub-folders to `folder`"""
-    filenames = glob.glob(os.path.join(folder, "**/*document_topic_weights.zip"), recursive=True)
-    folders = [os.path.split(filename)[0] for filename in filenames]
+    filenames = [
+        filename
+        for extension in ("zip", "feather")
+        for filename in glob.glob(os.path.join(folder, f"**/*document_topic_weights.{extension}"), recursive=True)
+    ]
+    folders = list(dict.fromkeys(os.path.split(filename)[0] for filename in filenames))
     return folders
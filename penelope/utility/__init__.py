@@ -120,6 +120,8 @@ from .utils import (
     create_dataclass_instance_from_kwargs,
     create_dummy_function,
     create_instance,
+    csr_float_matrix,
+    csr_row_blocks,
     dataframe_to_tuples,
     deep_clone,
     dict_of_key_values_inverted_to_dict_of_value_key,
@@ -153,6 +155,7 @@ from .utils import (
     lists_of_dicts_merged_by_key,
     ls_sorted,
     multiple_replace,
+    multiply_sparse_matrix_by_vector,
     noop,
     normalize_array,
     normalize_sparse_matrix_by_vector,
@@ -165,8 +168,10 @@ from .utils import (
     remove_snake_case,
     revdict,
     right_chop,
+    scale_sparse_matrix_by_vector,
     slim_title,
     sort_chained,
+    sparse_matrix_norms,
     split,
     take,
     timecall,
@@ -194,7 +194,7 @@ def project_to_range(value: Sequence[Number], low: Number, high: Number) -> Sequ
 
 def clamp_values(values: Sequence[Number], low_high: Tuple[Number, Number]) -> Sequence[Number]:
     """Clamps value to supplied interval."""
-    if not values:
+    if len(values) == 0:
         return values
     mw = max(values)
     return [project_to_range(w / mw, low_high[0], low_high[1]) for w in values]
@@ -528,6 +528,78 @@ def normalize_sparse_matrix_by_vector(spm: scipy.sparse.spmatrix, vector: np.nda
     return nspm
 
 
+def csr_float_matrix(
+    spm: scipy.sparse.csr_matrix, dtype: np.dtype = None, inplace: bool = False
+) -> scipy.sparse.csr_matrix:
+    """Returns `spm` with float values (float64 if not specified or already float).
+
+    If `inplace` then only the data array of `spm` is replaced (if needed), otherwise a copy is returned."""
+    dtype = dtype or (spm.dtype if np.issubdtype(spm.dtype, np.floating) else np.float64)
+    if inplace:
+        if spm.data.dtype != dtype:
+            spm.data = spm.data.astype(dtype)
+        return spm
+    return scipy.sparse.csr_matrix(
+        (spm.data.astype(dtype), spm.indices.copy(), spm.indptr.copy()), shape=spm.shape, copy=False
+    )
+
+
+def csr_row_blocks(spm: scipy.sparse.csr_matrix, block_size: int = 2**20) -> Iterable[Tuple[int, int]]:
+    """Splits rows of CSR matrix `spm` into (start, stop) row ranges having about `block_size` stored values.
+
+    Used for bounding size of temporary arrays when processing the data array block by block."""
+    n_rows: int = spm.shape[0]
+    starts: np.ndarray = np.unique(np.searchsorted(spm.indptr, np.arange(0, spm.nnz, block_size), side='right') - 1)
+    bounds: np.ndarray = np.append(starts[starts < n_rows], n_rows)
+    if bounds[0] != 0:
+        bounds = np.insert(bounds, 0, 0)
+    return zip(bounds[:-1].tolist(), bounds[1:].tolist())
+
+
+def sparse_matrix_norms(spm: scipy.sparse.csr_matrix, axis: int = 1, norm: str = 'l1') -> np.ndarray:
+    """Returns `l1`, `l2` or `max` norms of each row (axis=1) or column (axis=0) in CSR matrix `spm`"""
+
+    if norm not in ('l1', 'l2', 'max'):
+        raise ValueError(f"unknown norm {norm}")
+
+    size: int = spm.shape[1 - axis]
+    norms: np.ndarray = np.zeros(size, dtype=np.float64)
+
+    for i, j in csr_row_blocks(spm):
+        lo, hi = spm.indptr[i], spm.indptr[j]
+        values: np.ndarray = np.abs(spm.data[lo:hi]).astype(np.float64, copy=False)
+        ids: np.ndarray = (
+            spm.indices[lo:hi] if axis == 0 else np.repeat(np.arange(i, j), np.diff(spm.indptr[i : j + 1]))
+        )
+        if norm == 'max':
+            np.maximum.at(norms, ids, values)
+        else:
+            norms += np.bincount(ids, weights=values if norm == 'l1' else np.square(values), minlength=size)
+
+    return np.sqrt(norms) if norm == 'l2' else norms
+
+
+def scale_sparse_matrix_by_vector(
+    spm: scipy.sparse.csr_matrix, vector: np.ndarray, axis: int = 1, dtype: np.dtype = None, inplace: bool = False
+) -> scipy.sparse.csr_matrix:
+    """Divides each row (axis=1) or column (axis=0) in CSR matrix `spm` by `vector`, rows/columns with zero divisor
+    are set to zero. The division is done directly on the data array (of `spm` if `inplace` else a float copy)."""
+    spm = csr_float_matrix(spm, dtype=dtype, inplace=inplace)
+    vector: np.ndarray = np.asarray(vector, dtype=np.float64)
+    factors: np.ndarray = np.divide(1.0, vector, out=np.zeros(len(vector)), where=vector != 0).astype(spm.dtype)
+    multiply_sparse_matrix_by_vector(spm, factors, axis=axis)
+    return spm
+
+
+def multiply_sparse_matrix_by_vector(spm: scipy.sparse.csr_matrix, vector: np.ndarray, axis: int = 1) -> None:
+    """Multiplies (in place) each row (axis=1) or column (axis=0) in CSR matrix `spm` by `vector`"""
+    for i, j in csr_row_blocks(spm):
+        lo, hi = spm.indptr[i], spm.indptr[j]
+        spm.data[lo:hi] *= (
+            vector[spm.indices[lo:hi]] if axis == 0 else np.repeat(vector[i:j], np.diff(spm.indptr[i : j + 1]))
+        )
+
+
 # def sparse_normalize(spm: scipy.sparse.spmatrix) -> scipy.sparse.spmatrix:
 #     # https://stackoverflow.com/questions/42225269/scipy-sparse-matrix-division
 #     row_sums = spm.sum(axis=1).A1
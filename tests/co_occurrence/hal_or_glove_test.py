@@ -0,0 +1,109 @@
+import pandas as pd
+import pytest
+
+from penelope.co_occurrence import compute_hal_or_glove_co_occurrences
+from penelope.co_occurrence.hal_or_glove import HyperspaceAnalogueToLanguageVectorizer, compute_hal_or_glove
+from penelope.co_occurrence.hal_or_glove.compute_hal_or_glove import CoOccurrenceError, is_partitioned_in_runs
+from penelope.corpus import generate_token2id
+
+# pylint: disable=redefined-outer-name
+
+SIMPLE_CORPUS = [
+    ('document_01.txt', 1960, 'the horse raced past the barn fell .'),
+    ('document_02.txt', 1960, 'the basic concept of the word association'),
+    ('document_03.txt', 1961, 'the horse fell past the word barn .'),
+    ('document_04.txt', 1962, 'a basic horse of the barn'),
+    ('document_05.txt', 1961, 'the concept raced past the association'),
+]
+
+
+@pytest.fixture(scope="module")
+def corpus() -> list:
+    return [(filename, text.split()) for filename, _, text in SIMPLE_CORPUS]
+
+
+@pytest.fixture(scope="module")
+def document_index() -> pd.DataFrame:
+    return pd.DataFrame(
+        data=[(filename, year) for filename, year, _ in SIMPLE_CORPUS], columns=['filename', 'year']
+    ).set_index('filename', drop=False)
+
+
+@pytest.mark.parametrize('processes', [None, 2])
+def test_compute_hal_co_occurrences_by_partition(corpus, document_index, processes):
+
+    token2id: dict = generate_token2id([tokens for _, tokens in corpus])
+
+    co_occurrences: pd.DataFrame = compute_hal_or_glove_co_occurrences(
+        iter(corpus),
+        document_index=document_index,
+        token2id=token2id,
+        window_size=2,
+        distance_metric=0,
+        method='HAL',
+        processes=processes,
+    )
+
+    assert co_occurrences.columns.tolist() == ['year', 'x_term', 'y_term', 'nw_xy', 'nw_x', 'nw_y', 'cwr']
+    assert set(co_occurrences.year) == {1960, 1961, 1962}
+    assert co_occurrences.cwr.max() == 1.0
+
+    expected: pd.DataFrame = (
+        HyperspaceAnalogueToLanguageVectorizer(token2id=token2id)
+        .fit(
+            [tokens for filename, tokens in corpus if filename in ('document_01.txt', 'document_02.txt')],
+            size=2,
+            distance_metric=0,
+        )
+        .to_dataframe()
+    )
+
+    co_occurrences_1960 = co_occurrences[co_occurrences.year == 1960]
+
+    assert co_occurrences_1960.x_term.tolist() == expected.x_term.tolist()
+    assert co_occurrences_1960.y_term.tolist() == expected.y_term.tolist()
+    assert co_occurrences_1960.nw_xy.tolist() == expected.nw_xy.tolist()
+
+
+def test_is_partitioned_in_runs():
+    assert is_partitioned_in_runs(pd.Series([], dtype=int))
+    assert is_partitioned_in_runs(pd.Series([1960, 1960, 1961, 1962]))
+    assert is_partitioned_in_runs(pd.Series([1962, 1960, 1960]))
+    assert not is_partitioned_in_runs(pd.Series([1960, 1961, 1960]))
+
+
+def test_compute_hal_co_occurrences_reads_contiguous_partitions_one_at_a_time(corpus, document_index, monkeypatch):
+
+    token2id: dict = generate_token2id([tokens for _, tokens in corpus])
+    sorted_corpus: list = sorted(corpus, key=lambda x: document_index.loc[x[0]].year)
+    sorted_document_index: pd.DataFrame = document_index.loc[[filename for filename, _ in sorted_corpus]]
+
+    n_consumed: list = []
+    consumed_at_fit: list = []
+
+    def stream():
+        for item in sorted_corpus:
+            n_consumed.append(item[0])
+            yield item
+
+    compute_partition = compute_hal_or_glove._compute_partition_co_occurrences
+
+    def spy(args):
+        consumed_at_fit.append((args[0], len(n_consumed)))
+        return compute_partition(args)
+
+    monkeypatch.setattr(compute_hal_or_glove, '_compute_partition_co_occurrences', spy)
+
+    opts: dict = dict(token2id=token2id, window_size=2, distance_metric=0, method='HAL')
+    co_occurrences: pd.DataFrame = compute_hal_or_glove_co_occurrences(
+        stream(), document_index=sorted_document_index, **opts
+    )
+
+    """Partition 1960 (2 docs) is fitted after reading one item past it, not after reading the whole stream"""
+    assert consumed_at_fit == [(1960, 3), (1961, 5), (1962, 5)]
+
+    expected: pd.DataFrame = compute_hal_or_glove_co_occurrences(iter(corpus), document_index=document_index, **opts)
+    assert co_occurrences.reset_index(drop=True).equals(expected.reset_index(drop=True))
+
+    with pytest.raises(CoOccurrenceError):
+        compute_hal_or_glove_co_occurrences(iter(corpus), document_index=sorted_document_index, **opts)
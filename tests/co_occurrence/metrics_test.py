@@ -68,6 +68,43 @@ def test_chen_lu_test():
     assert df_imp.equals(df_answer), "Test failed"
 
 
+@pytest.mark.parametrize('distance_metric', [0, 1, 2])
+def test_hal_fit_computes_expected_distance_weighted_counts(distance_metric: int):
+    terms = 'The Horse Raced Past The Barn Fell .'.lower().split()
+    size: int = 3
+    vectorizer = HyperspaceAnalogueToLanguageVectorizer().fit([terms], size=size, distance_metric=distance_metric)
+
+    weights = {0: lambda d: size - d + 1, 1: lambda d: 1.0 / d, 2: lambda _: 1}[distance_metric]
+    expected = np.zeros(vectorizer.nw_xy.shape)
+    for i, x in enumerate(terms):
+        for d in range(1, size + 1):
+            if i + d < len(terms):
+                expected[vectorizer.token2id[x], vectorizer.token2id[terms[i + d]]] += weights(d)
+
+    assert np.allclose(vectorizer.nw_xy.toarray(), expected)
+    assert vectorizer.term_count == len(terms)
+
+
+@pytest.mark.parametrize('direction_sensitive', [False, True])
+def test_hal_to_dataframe_returns_long_frame_of_nonzero_pairs(direction_sensitive: bool):
+    terms = 'The Horse Raced Past The Barn Fell .'.lower().split()
+    vectorizer = HyperspaceAnalogueToLanguageVectorizer().fit([terms], size=5, distance_metric=0)
+    nw_xy = vectorizer.nw_xy.toarray().astype(np.float64)
+
+    co_occurrences: pd.DataFrame = vectorizer.to_dataframe(
+        normalize=None, zero_diagonal=True, direction_sensitive=direction_sensitive
+    )
+
+    expected = nw_xy if direction_sensitive else np.triu(nw_xy + nw_xy.T)
+    np.fill_diagonal(expected, 0)
+
+    assert (co_occurrences.x_id != co_occurrences.y_id).all()
+    assert 0 < len(co_occurrences) <= np.count_nonzero(expected)
+    assert np.allclose(co_occurrences.nw_xy, expected[co_occurrences.x_id, co_occurrences.y_id])
+    assert (co_occurrences.x_term == co_occurrences.x_id.map(vectorizer.id2token)).all()
+    assert (co_occurrences.cwr > 0).all()
+
+
 def test_compute_hal_score_by_co_occurrence_matrix(bundle: Bundle):
     co_occurrences = bundle.co_occurrences
     co_occurrences['cwr'] = compute_hal_score_by_co_occurrence_matrix(
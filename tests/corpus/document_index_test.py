@@ -14,6 +14,7 @@ from penelope.corpus import (
     update_document_index_by_dicts_or_tuples,
     update_document_index_properties,
 )
+from penelope.corpus.document_index import categorize_time_period, group_indices
 from penelope.utility import assert_is_strictly_increasing, is_strictly_increasing
 
 TEST_DOCUMENT_INDEX = """
@@ -256,6 +257,47 @@ def test_group_by_time_period_aggregates_n_documents():
     assert decade_document_index.n_documents.tolist() == [2, 3, 4]
 
 
+def test_categorize_time_period_and_group_indices():
+    index: pd.DataFrame = load_document_index(filename=StringIO(TEST_DOCUMENT_INDEX3), sep=';')
+
+    assert categorize_time_period(index.year, 'decade').tolist() == [
+        2000,
+        2000,
+        2010,
+        2010,
+        2010,
+        2020,
+        2020,
+        2020,
+        2020,
+    ]
+    assert categorize_time_period(index.year, 'lustrum').tolist() == [
+        2005,
+        2005,
+        2015,
+        2015,
+        2015,
+        2020,
+        2020,
+        2025,
+        2025,
+    ]
+    assert categorize_time_period(index.year, {1: [2009, 2019]}).fillna(0).tolist() == [1, 1, 1, 1, 1, 0, 0, 0, 0]
+
+    index['decade'] = categorize_time_period(index.year, 'decade')
+
+    assert group_indices(index, 'decade') == index.groupby('decade').apply(lambda x: x.index.tolist()).to_dict()
+    assert group_indices(index.set_index('document_id'), ['decade', 'year_id']) == {
+        (2000, 1): [0],
+        (2000, 2): [1],
+        (2010, 1): [2],
+        (2010, 2): [3],
+        (2010, 3): [4],
+        (2020, 1): [5, 7],
+        (2020, 2): [6, 8],
+    }
+
+
 def test_assert_is_strictly_increasing():
     assert_is_strictly_increasing(pd.Series([0, 1, 2], dtype=np.int))
     with pytest.raises(ValueError):
@@ -1,8 +1,12 @@
 import numpy as np
 import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer
 
 from penelope.corpus import CorpusVectorizer, TokenizedCorpus, TokensTransformOpts, VectorizedCorpus
+from penelope.corpus.dtm.shard import load_tokens, save_tokens
 from penelope.corpus.readers import TextReaderOpts, TextTokenizer
+from penelope.utility import strip_path_and_extension
 from tests.fixtures import MockedProcessedCorpus
 from tests.utils import TEST_CORPUS_FILENAME, create_tokens_reader
 
@@ -203,3 +207,99 @@ def test_from_token_ids_stream():
     expected_dtm = np.matrix([[2, 1, 4, 1], [2, 2, 3, 0], [2, 3, 2, 0], [2, 4, 1, 1], [2, 0, 1, 1]])
 
     assert (vectorized_corpus.data.todense() == expected_dtm).all()
+
+
+def random_tokens_stream(n_documents: int = 57, n_terms: int = 40, seed: int = 42) -> list:
+    rng = np.random.default_rng(seed)
+    words = [f"w{i:02}" for i in range(n_terms)]
+    return [
+        (f"document_{i}.txt", [words[j] for j in rng.integers(0, n_terms, rng.integers(0, 30))])
+        for i in range(n_documents)
+    ]
+
+
+def count_vectorize(stream: list, already_tokenized: bool, vocabulary: dict = None, **opts) -> tuple:
+    """Reference: DTM and vocabulary computed by sklearn's CountVectorizer"""
+    min_tf: int = opts.pop('min_tf', 1)
+    lowercase: bool = opts.pop('lowercase', False)
+    opts['max_features'] = opts.pop('max_tokens', None)
+    vectorizer: CountVectorizer = CountVectorizer(
+        tokenizer=((lambda ts: [t.lower() for t in ts]) if lowercase else (lambda ts: ts))
+        if already_tokenized
+        else None,
+        lowercase=lowercase and not already_tokenized,
+        vocabulary=vocabulary,
+        token_pattern=r"(?u)\b\w+\b" if not already_tokenized else None,
+        dtype=np.int32,
+        **opts,
+    )
+    bag_term_matrix = vectorizer.fit_transform(terms for _, terms in stream)
+    corpus: VectorizedCorpus = VectorizedCorpus(
+        bag_term_matrix,
+        token2id=vectorizer.vocabulary_,
+        document_index=pd.DataFrame({'document_name': [name for name, _ in stream], 'document_id': range(len(stream))}),
+    )
+    return corpus.slice_by_tf(min_tf) if min_tf > 1 else corpus
+
+
+@pytest.mark.parametrize('shard_size', [None, 10])
+@pytest.mark.parametrize(
+    'opts',
+    [
+        dict(),
+        dict(lowercase=True),
+        dict(min_df=2, max_df=0.9),
+        dict(min_df=0.1, max_df=20),
+        dict(max_tokens=10),
+        dict(min_tf=5, stop_words=['w01', 'w02']),
+        dict(vocabulary={f"w{i:02}": i for i in range(45)}, min_tf=2),
+    ],
+)
+def test_fit_transform_equals_count_vectorizer(opts: dict, shard_size: int):
+
+    stream = random_tokens_stream()
+
+    expected: VectorizedCorpus = count_vectorize(stream, True, **dict(opts))
+    corpus: VectorizedCorpus = CorpusVectorizer().fit_transform(
+        stream, already_tokenized=True, shard_size=shard_size, **opts
+    )
+
+    assert corpus.token2id == expected.token2id
+    assert corpus.data.dtype == expected.data.dtype
+    assert (corpus.data != expected.data).nnz == 0
+    assert corpus.document_index.document_name.tolist() == [strip_path_and_extension(name) for name, _ in stream]
+
+
+@pytest.mark.parametrize('opts', [dict(lowercase=True), dict(lowercase=False, stop_words='english')])
+def test_fit_transform_of_text_equals_count_vectorizer(opts: dict):
+
+    stream = [(name, " ".join(tokens + ['The', 'and', 'Ölands']).upper()) for name, tokens in random_tokens_stream()]
+
+    expected: VectorizedCorpus = count_vectorize(stream, False, **dict(opts))
+    corpus: VectorizedCorpus = CorpusVectorizer().fit_transform(stream, already_tokenized=False, **opts)
+
+    assert corpus.token2id == expected.token2id
+    assert (corpus.data != expected.data).nnz == 0
+
+
+def test_fit_transform_sharded_text_in_parallel_processes(tmp_path):
+
+    stream = [(name, " ".join(tokens).upper()) for name, tokens in random_tokens_stream(n_documents=23)]
+
+    expected: VectorizedCorpus = count_vectorize(stream, False, lowercase=True)
+    corpus: VectorizedCorpus = CorpusVectorizer().fit_transform(
+        stream, already_tokenized=False, lowercase=True, shard_size=5, shard_folder=str(tmp_path), processes=2
+    )
+
+    assert corpus.token2id == expected.token2id
+    assert (corpus.data != expected.data).nnz == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize('tokens', [[], ['a'], ['b', 'ab', 'åäö', 'x' * 1000, '']])
+def test_save_and_load_shard_tokens(tmp_path, tokens):
+    filename: str = str(tmp_path / 'vocabulary.npz')
+    save_tokens(filename, tokens)
+    loaded = load_tokens(filename)
+    assert loaded.dtype == object
+    assert loaded.tolist() == tokens
@@ -1,9 +1,11 @@
 import numpy as np
 import pandas as pd
 import pytest
+import scipy
 
 from penelope.co_occurrence import Bundle
 from penelope.corpus import DocumentIndexHelper, VectorizedCorpus
+from penelope.corpus.dtm.group import group_DTM_by_category_series, group_DTM_by_indices_mapping
 from penelope.utility import is_strictly_increasing
 
 from ...utils import create_bundle, create_vectorized_corpus
@@ -243,3 +245,57 @@ def test_group_by_year_with_average():
 
     assert np.allclose(expected_bag_term_matrix_sums, y_sum_corpus.data.todense())
     assert np.allclose(expected_bag_term_matrix_means, y_mean_corpus.data.todense())
+
+
+def test_group_DTM_by_indicator_matrix_sums_and_means_rows():
+    dtm = scipy.sparse.csr_matrix(np.array([[1, 0, 2], [0, 3, 0], [4, 0, 0], [0, 0, 5]], dtype=np.int32))
+
+    category_indices = {0: [0, 2], 1: [], 2: [1, 2, 3]}
+
+    matrix = group_DTM_by_indices_mapping(dtm, n_docs=3, category_indices=category_indices, aggregate='sum')
+
+    assert scipy.sparse.isspmatrix_csr(matrix)
+    assert matrix.dtype == np.int32
+    assert (matrix.todense() == np.array([[5, 0, 2], [0, 0, 0], [4, 3, 5]])).all()
+
+    matrix = group_DTM_by_indices_mapping(dtm, n_docs=3, category_indices=category_indices, aggregate='mean')
+
+    assert scipy.sparse.isspmatrix_csr(matrix)
+    assert np.allclose(matrix.todense(), np.array([[2.5, 0.0, 1.0], [0.0, 0.0, 0.0], [4 / 3, 1.0, 5 / 3]]))
+
+    matrix = group_DTM_by_category_series(
+        dtm, category_series=pd.Series(['b', 'a', 'b', 'a']), categories=['a', 'b', 'c'], aggregate='sum'
+    )
+    assert scipy.sparse.isspmatrix_csr(matrix)
+    assert (matrix.todense() == np.array([[0, 3, 5], [5, 0, 2], [0, 0, 0]])).all()
+
+
+def test_group_by_pivot_keys_fills_temporal_gaps():
+    document_index = pd.DataFrame(
+        {
+            'filename': [f'd{i}' for i in range(5)],
+            'document_id': range(5),
+            'year': [1991, 1992, 1993, 2011, 2012],
+            'gender_id': [1, 2, 1, 2, 2],
+            'n_tokens': [3, 2, 3, 1, 2],
+        }
+    )
+    dtm = np.array([[1, 1, 1], [0, 2, 0], [2, 0, 1], [1, 0, 0], [0, 1, 1]])
+    corpus = VectorizedCorpus(dtm, token2id={'a': 0, 'b': 1, 'c': 2}, document_index=document_index)
+
+    grouped_corpus: VectorizedCorpus = corpus.group_by_pivot_keys(
+        temporal_key='decade',
+        pivot_keys=['gender_id'],
+        filter_opts=None,
+        document_namer=None,
+        fill_gaps=True,
+        drop_group_ids=False,
+    )
+
+    di: pd.DataFrame = grouped_corpus.document_index
+
+    assert di.document_name.tolist() == ['1990_1', '1990_2', '2000_0', '2010_2']
+    assert di.document_ids.tolist() == [[0, 2], [1], [], [3, 4]]
+    assert di.n_documents.tolist() == [2, 1, 0, 2]
+    assert di.n_tokens.tolist() == [6, 2, 0, 3]
+    assert (grouped_corpus.data.todense() == np.array([[3, 1, 2], [0, 2, 0], [0, 0, 0], [1, 1, 1]])).all()
@@ -0,0 +1,116 @@
+import re
+
+import numpy as np
+import pytest
+
+from penelope.corpus import VectorizedCorpus
+from penelope.corpus.dtm.search import VocabularySearchIndex, glob_literals, glob_to_regex, regex_literals
+
+from ...utils import create_vectorized_corpus
+
+# pylint: disable=redefined-outer-name
+
+TOKEN2ID: dict = {
+    "information": 0,
+    "informal": 1,
+    "formation": 2,
+    "reformation": 3,
+    "nation": 4,
+    "in": 5,
+    "form": 6,
+}
+
+TF: np.ndarray = np.array([10, 3, 7, 1, 20, 50, 5])
+
+
+@pytest.fixture
+def corpus() -> VectorizedCorpus:
+    return create_vectorized_corpus()
+
+
+@pytest.fixture
+def index() -> VocabularySearchIndex:
+    return VocabularySearchIndex(TOKEN2ID)
+
+
+def search(index: VocabularySearchIndex, *expressions: str, **kwargs) -> list:
+    return index.vocabulary[index.search(list(expressions), TF, **kwargs)].tolist()
+
+
+def test_glob_literals():
+    assert glob_literals("abc") == ("abc", ["abc"])
+    assert glob_literals("abc*") == ("abc", ["abc"])
+    assert glob_literals("*abc*def") == ("", ["abc", "def"])
+    assert glob_literals("a?c*") == ("a", ["a", "c"])
+    assert glob_literals("[ab]cde*") == ("", ["cde"])
+
+
+def test_regex_literals():
+    assert regex_literals(re.compile("abc")) == ("abc", ["abc"])
+    assert regex_literals(re.compile("^abc.*def$")) == ("abc", ["abc", "def"])
+    assert regex_literals(re.compile(r"\Aa.cd+")) == ("a", ["a", "c"])
+    assert regex_literals(re.compile(".*tion$")) == ("", ["tion"])
+    assert regex_literals(re.compile("ab|cd")) == ("", [])
+    assert regex_literals(re.compile("abc", re.IGNORECASE)) == ("", [])
+
+
+def test_glob_to_regex_does_not_match_across_lines():
+    assert glob_to_regex("a*").endswith("$")
+    assert "(?s:" not in glob_to_regex("a*")
+
+
+def test_search_plain_words(index: VocabularySearchIndex):
+    assert search(index, "nation", descending=True) == ["nation"]
+    assert search(index, "jens") == []
+    assert search(index) == []
+
+
+def test_search_prefix(index: VocabularySearchIndex):
+    assert set(search(index, "inform*")) == {"information", "informal"}
+    assert set(search(index, "form*")) == {"form", "formation"}
+
+
+def test_search_infix(index: VocabularySearchIndex):
+    assert set(search(index, "*format*")) == {"information", "formation", "reformation"}
+    assert set(search(index, "*mation")) == {"information", "formation", "reformation"}
+    assert set(search(index, "?ation*")) == {"nation"}
+    assert set(search(index, "*at*")) == {"information", "formation", "reformation", "nation"}
+
+
+def test_search_regexp(index: VocabularySearchIndex):
+    assert set(search(index, "|.*al|")) == {"informal"}
+    assert set(search(index, "|re.*|", "nation")) == {"reformation", "nation"}
+
+
+def test_search_regexp_is_matched_per_token(index: VocabularySearchIndex):
+    assert set(search(index, r"|\D+|")) == set(TOKEN2ID)
+    assert set(search(index, "|[^m]+$|")) == {"nation", "in"}
+    assert set(search(index, "|(f|n)|")) == {"formation", "nation", "form"}
+    assert set(search(index, r"|.*n\Z|")) == {"information", "formation", "reformation", "nation", "in"}
+
+
+def test_search_ranks_by_term_frequency(index: VocabularySearchIndex):
+    assert search(index, "*ation", descending=True) == ["nation", "information", "formation", "reformation"]
+    assert search(index, "*ation", descending=False) == ["reformation", "formation", "information", "nation"]
+    assert search(index, "*ation", n_top=2, descending=True) == ["nation", "information"]
+    assert search(index, "*ation", n_top=2, descending=False) == ["information", "nation"]
+
+
+def test_corpus_search_index_follows_vocabulary(corpus: VectorizedCorpus):
+
+    corpus._token2id = {"bengt": 0, "bertil": 1, "eva": 2, "julia": 3}  # pylint: disable=protected-access
+    assert set(corpus.find_matching_words(["b*"], 4)) == {"bengt", "bertil"}
+
+    corpus._token2id = {"adam": 0, "bertil": 1, "cecilia": 2, "julia": 3}  # pylint: disable=protected-access
+    assert set(corpus.find_matching_words(["b*", "a*"], 4)) == {"adam", "bertil"}
+
+
+def test_find_matching_words_ranked_by_term_frequency(corpus: VectorizedCorpus):
+
+    corpus._token2id = {"bengt": 0, "bertil": 1, "eva": 2, "julia": 3}  # pylint: disable=protected-access
+    ranked: list = corpus.find_matching_words(["*"], 4, descending=True)
+
+    vocabulary: list = ["bengt", "bertil", "eva", "julia"]
+    assert ranked == [vocabulary[i] for i in np.argsort(-corpus.term_frequency, kind='stable')]
+    assert corpus.find_matching_words(["*"], 2, descending=True) == ranked[:2]
+    assert corpus.pick_n_top_words(ranked, 2, descending=True) == ranked[:2]
@@ -1,3 +1,4 @@
+import re
 from typing import Callable
 
 import numpy as np
@@ -6,6 +7,8 @@ import pytest
 import scipy
 
 from penelope.corpus import VectorizedCorpus
+from penelope.corpus.dtm.search import VocabularySearchIndex
+from penelope.corpus.dtm.slice import matching_token_ids
 from penelope.corpus.token2id import id2token2token2id
 
 from ...utils import create_abc_corpus, create_vectorized_corpus
@@ -330,3 +333,53 @@ def test_translate_to_vocab():
 
     assert result_corpus.shape == A.shape
     assert (result_corpus.data.todense() == expected_corpus.data.todense()).all().all()
+
+
+def test_slice_by_vectorized_predicates():
+    corpus: VectorizedCorpus = create_abc_corpus(
+        [[1, 2, 3, 4], [5, 6, 7, 8]], token2id={'apple': 0, 'banana': 1, 'apricot': 2, 'cherry': 3}
+    )
+
+    for px in ['^ap', re.compile('^ap').match, ('ap',), lambda w: w.startswith('ap')]:
+        sliced_corpus: VectorizedCorpus = corpus.slice_by(px)
+        assert sliced_corpus.token2id == {'apple': 0, 'apricot': 1}
+        assert (sliced_corpus.data.todense() == [[1, 3], [5, 7]]).all()
+
+
+@pytest.mark.parametrize(
+    'pattern, expected',
+    [
+        (r'\D+', [0, 1, 2, 3, 4]),
+        (r'[^0-9]+$', [0, 2, 3]),
+        (r'(f|b)', [3, 4]),
+        (r'\s', []),
+        (r'\Aab', [0]),
+        (r'.*1\Z', [1]),
+        (re.compile(r'.*9$', re.DOTALL), [4]),
+        (r'ba.9', [4]),
+        (r'.*ar9', [4]),
+        (r'fo+$', [3]),
+        (r'^xyz', [2]),
+        (r'de|ab', [0, 1]),
+        (r'(?i)ABC', [0]),
+        (r'(?i:X)yz', [2]),
+        (('ab', 'x'), [0, 2]),
+        (('ab', 'abc'), [0]),
+        (('',), [0, 1, 2, 3, 4]),
+        ((), []),
+    ],
+)
+def test_matching_token_ids(pattern, expected):
+    token2id: dict = {w: i for i, w in enumerate(['abc', 'de1', 'xyz', 'foo', 'bar9'])}
+    assert matching_token_ids(VocabularySearchIndex(token2id), pattern).tolist() == expected
+
+
+def test_translate_to_vocab_translates_overridden_term_frequency():
+    corpus: VectorizedCorpus = create_abc_corpus([[1, 2, 3], [4, 5, 6]], token2id={'a': 0, 'b': 1, 'c': 2})
+    corpus._overridden_term_frequency = np.array([10, 20, 30])  # pylint: disable=protected-access
+
+    result_corpus = corpus.translate_to_vocab({0: 'c', 1: 'x', 2: 'a'}, inplace=False)
+
+    assert result_corpus.token2id == {'c': 0, 'x': 1, 'a': 2}
+    assert (result_corpus.data.todense() == [[3, 0, 1], [6, 0, 4]]).all()
+    assert result_corpus.overridden_term_frequency.tolist() == [30, 0, 10]
@@ -196,6 +196,32 @@ def test_tf_idf(corpus: VectorizedCorpus):
     assert corpus.tf_idf() is not None
 
 
+def test_tf_idf_equals_sklearn_tf_idf(corpus: VectorizedCorpus):
+    TfidfTransformer = pytest.importorskip("sklearn.feature_extraction.text").TfidfTransformer
+
+    for norm, smooth_idf in [('l2', True), ('l1', False), (None, True)]:
+        expected = TfidfTransformer(norm=norm, smooth_idf=smooth_idf).fit_transform(corpus.data).todense()
+        assert np.allclose(corpus.tf_idf(norm=norm, smooth_idf=smooth_idf).data.todense(), expected)
+
+
+def test_normalize_and_tf_idf_inplace_with_float32(corpus: VectorizedCorpus):
+    expected_normalized = corpus.normalize(axis=0, norm='l2').data.todense()
+    expected_tf_idf = corpus.tf_idf().data.todense()
+
+    n_corpus: VectorizedCorpus = corpus.normalize(axis=0, norm='l2', inplace=True, dtype=np.float32)
+
+    assert n_corpus is corpus
+    assert corpus.data.dtype == np.float32
+    assert np.allclose(corpus.data.todense(), expected_normalized)
+
+    corpus = create_vectorized_corpus()
+    t_corpus: VectorizedCorpus = corpus.tf_idf(inplace=True, dtype=np.float32)
+
+    assert t_corpus is corpus
+    assert corpus.data.dtype == np.float32
+    assert np.allclose(corpus.data.todense(), expected_tf_idf)
+
+
 def test_to_bag_of_terms(corpus: VectorizedCorpus):
     expected_docs = [
         ['a', 'a', 'b', 'c', 'c', 'c', 'c', 'd'],
@@ -211,6 +237,20 @@ def test_get_top_n_words(corpus: VectorizedCorpus):
     assert corpus.get_top_n_words(n=2) == [('c', 11), ('a', 10)]
 
 
+def test_get_partitioned_top_n_words(corpus: VectorizedCorpus):
+
+    corpus.document_index['category'] = [2013, 2014, 2013, 2013, 2015]
+
+    data: dict = corpus.get_partitioned_top_n_words(category_column='category', n_top=3)
+
+    assert list(data.keys()) == ['2013', '2014', '2015']
+    for category, indices in corpus.document_index.groupby('category').groups.items():
+        assert data[str(category)] == corpus.get_top_n_words(n=3, indices=indices)
+
+    data = corpus.get_partitioned_top_n_words(category_column='category', n_top=4, pad='*')
+    assert data['2015'] == [('a', 2), ('c', 1), ('d', 1), ('*', 0)]
+
+
 def test_co_occurrence_matrix(corpus: VectorizedCorpus):
     m = corpus.co_occurrence_matrix()
     assert m is not None
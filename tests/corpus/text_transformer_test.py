@@ -1,7 +1,12 @@
+import unicodedata
+
+import ftfy
 import pytest  # pylint: disable=unused-import
 
-from penelope.corpus.readers import TextTransformer
+from penelope.corpus import transforms
+from penelope.corpus.readers import TextTransformer, TextTransformOpts
 from penelope.corpus.transforms import normalize_characters
+from penelope.vendor.textacy_api._textacy import fallbacks as textacy_fallbacks
 
 
 @pytest.mark.xfail
@@ -20,3 +25,34 @@ def test_normalize_characters():
     text = "räksmörgås‐‑⁃‒–—―−－⁻＋⁺⁄∕˜⁓∼∽∿〜～’՚Ꞌꞌ＇‘’‚‛“”„‟´″‴‵‶‷⁗RÄKSMÖRGÅS"
     normalized_text = normalize_characters(text, groups="double_quotes,tildes")
     assert normalized_text == 'räksmörgås‐‑⁃‒–—―−－⁻＋⁺⁄∕~~~~~~~’՚Ꞌꞌ＇‘’‚‛""""´″‴‵‶‷⁗RÄKSMÖRGÅS'
+
+
+@pytest.mark.parametrize(
+    'text',
+    [
+        '',
+        'Detta är en  text\r\n\r\nmed radbrytningar\u200b och\xa0\xa0mellanrum.\v\n',
+        ' \r\r\n\r a\u2060b \t\x0c c \n \n',
+        'En avstav-\r\n  ning och ännu en avstav¬\nning i texten.',
+        'Plain ASCII text with &amp; entity and \x1b[31m escape \x00 code.',
+        'Mojibake: cafÃ© and ligature ﬁne, accents: räksmörgås, Ångström, é and é.',
+    ],
+)
+def test_text_transforms_equals_reference_transforms(text: str):
+    text_transforms = [
+        (transforms.normalize_whitespace, textacy_fallbacks.whitespace),
+        (transforms.remove_hyphens, lambda x: transforms.RE_HYPHEN_REGEXP.sub(r"\1\2\n", x)),
+        (transforms.fix_ftfy_text, ftfy.fix_text),
+        (transforms.strip_accents, lambda x: unicodedata.normalize('NFD', x).encode('ascii', 'ignore').decode()),
+        (transforms.fix_unicode, lambda x: unicodedata.normalize('NFC', x)),
+    ]
+
+    for fx, reference_fx in text_transforms:
+        assert fx(text) == reference_fx(text)
+
+    opts: TextTransformOpts = TextTransformOpts(fix_accents=True, fix_unicode=True)
+    expected: str = text
+    for _, reference_fx in text_transforms:
+        expected = reference_fx(expected)
+
+    assert TextTransformer(text_transform_opts=opts).transform(text) == expected.strip()
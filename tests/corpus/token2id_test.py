@@ -2,11 +2,12 @@ import os
 from collections import Counter
 from typing import Mapping
 
+import numpy as np
 import pytest
 
 from penelope.corpus import Token2Id
 from penelope.corpus.readers import GLOBAL_TF_THRESHOLD_MASK_TOKEN
-from penelope.corpus.token2id import ClosedVocabularyError
+from penelope.corpus.token2id import MAGIC_TOKENS, ClosedVocabularyError
 from penelope.utility import path_add_suffix
 
 TEST_TOKENS_STREAM1 = ['adam', 'anton', 'anton', 'beatrice', 'felicia', 'niklas', 'adam', 'adam']
@@ -185,3 +186,47 @@ def test_translate():
 
     """Note that translate doesn't add LF-counts to LF-marker"""
     assert dict(token2id.tf) == {0: 1, 1: 1, 2: 5, 3: 5, 4: 4}
+
+
+def random_documents(n_documents: int = 50, n_words: int = 40) -> list[list[str]]:
+    rng = np.random.default_rng(42)
+    return [[f"w{i}" for i in rng.integers(0, n_words, size=rng.integers(0, 20))] for _ in range(n_documents)]
+
+
+def test_token2id_merge_of_partial_vocabularies_equals_sequential_ingest():
+
+    documents: list[list[str]] = random_documents()
+    expected: Token2Id = Token2Id().ingest_stream(documents)
+
+    token2id: Token2Id = Token2Id()
+    for i in range(0, len(documents), 7):
+        token2id.merge(Token2Id().ingest_stream(documents[i : i + 7]))
+
+    assert list(token2id.data.items()) == list(expected.data.items())
+    assert dict(token2id.tf) == dict(expected.tf)
+
+
+def test_token2id_merge_of_vocabularies_of_different_corpora():
+
+    token2id: Token2Id = Token2Id().ingest(['adam', 'anton', 'adam'])
+    token2id.merge(Token2Id().ingest(['beata', 'adam']))
+    token2id.merge({'cecilia': 1, 'anton': 0})
+
+    assert token2id.data == {'adam': 0, 'anton': 1, 'beata': 2, 'cecilia': 3}
+    assert tf_to_string(token2id) == {'adam': 3, 'anton': 1, 'beata': 1, 'cecilia': 0}
+
+    with pytest.raises(ClosedVocabularyError):
+        token2id.close().merge({'eva': 0})
+
+
+@pytest.mark.parametrize('processes,chunk_size', [(1, 100), (2, 3)])
+def test_token2id_parallel_ingest_stream_equals_sequential_ingest(processes: int, chunk_size: int):
+
+    documents: list = random_documents() + [{'w1': 4, 'x': 2}]
+    expected: Token2Id = Token2Id().ingest(MAGIC_TOKENS).ingest_stream(documents)
+
+    token2id: Token2Id = Token2Id().ingest(MAGIC_TOKENS)
+    token2id.ingest_stream(iter(documents), processes=processes, chunk_size=chunk_size)
+
+    assert list(token2id.data.items()) == list(expected.data.items())
+    assert dict(token2id.tf) == dict(expected.tf)
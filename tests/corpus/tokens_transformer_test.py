@@ -1,4 +1,7 @@
-from penelope.corpus import TokensTransformer, TokensTransformOpts
+import pandas as pd
+import pytest
+
+from penelope.corpus import Token2Id, TokensTransformer, TokensTransformOpts
 from penelope.corpus.transforms import load_stopwords
 from penelope.vendor.nltk import STOPWORDS_CACHE, extended_stopwords, get_stopwords
 
@@ -36,3 +39,58 @@ def test_get_stopwords():
 
     words = get_stopwords("swedish")
     assert len(words) > 0
+
+
+@pytest.mark.parametrize(
+    'opts',
+    [
+        dict(),
+        dict(to_lower=True, min_len=2),
+        dict(to_upper=True, max_len=4, keep_numerals=False),
+        dict(only_alphabetic=True, keep_symbols=False, stopwords=['och', 'att']),
+        dict(only_any_alphanumeric=True, remove_accents=True, to_lower=True),
+    ],
+)
+def test_vectorized_transform_equals_chained_transform(opts: dict):
+
+    tokens = ['Och', 'räksmörgås', 'att', '1958', '!', '--', 'Åke', 'och', 'x2', '', 'Räksmörgås', '§', 'att', 'é']
+
+    transform_opts: TokensTransformOpts = TokensTransformOpts(**opts)
+    vectorized: TokensTransformer = TokensTransformer(transform_opts=transform_opts)
+    chained: TokensTransformer = TokensTransformer(transform_opts=transform_opts, vectorize=False)
+
+    assert vectorized.elementwise
+
+    for _ in range(2):
+        """Second pass uses cached vocabulary"""
+        assert vectorized.transform(tokens) == chained.transform(tokens)
+        assert vectorized.transform(iter(tokens[3:])) == chained.transform(tokens[3:])
+
+    assert vectorized.transform([]) == []
+
+
+def test_transformer_with_non_elementwise_transform_is_not_vectorized():
+
+    transformer: TokensTransformer = TokensTransformer(transform_opts=TokensTransformOpts(to_lower=True))
+    transformer.add(lambda tokens: [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])])
+
+    assert not transformer.elementwise
+    assert transformer.transform(['A', 'B', 'C']) == ['a_b', 'b_c']
+
+
+def test_tokens_transform_opts_mask():
+
+    tokens = pd.Series(['Och', 'räksmörgås', 'att', '1958', '!', 'och', '', 'att'])
+    opts: TokensTransformOpts = TokensTransformOpts(min_len=2, keep_numerals=False)
+
+    assert opts.mask(tokens).tolist() == [True, True, True, False, False, True, False, True]
+    assert TokensTransformOpts(min_len=2).mask(pd.Series(['att', None, 'x', 'att'])).tolist() == [
+        True,
+        False,
+        False,
+        True,
+    ]
+
+    token2id: Token2Id = Token2Id(data={'och': 0, 'att': 1, '1958': 2, '!': 3})
+    ids = pd.Series([0, 1, 2, 3, 1, 0])
+    assert opts.mask(ids, token2id=token2id).tolist() == [True, True, False, False, True, True]
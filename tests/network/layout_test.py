@@ -0,0 +1,116 @@
+import networkx as nx
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from penelope.network import plot_utility
+from penelope.network.layout import layout_network
+from penelope.network.layout_cache import LayoutCache, graph_key
+from penelope.network.sparse_layout import coarsen, multilevel_spring_layout, symmetric_adjacency
+
+
+def mean_edge_length_ratio(positions: np.ndarray, adjacency: sp.spmatrix) -> float:
+    """Mean edge length relative to mean distance between random node pairs"""
+    rows, columns = sp.triu(adjacency).nonzero()
+    pairs: np.ndarray = np.random.default_rng(0).integers(0, len(positions), (5000, 2))
+    edge_length: float = np.linalg.norm(positions[rows] - positions[columns], axis=1).mean()
+    return edge_length / np.linalg.norm(positions[pairs[:, 0]] - positions[pairs[:, 1]], axis=1).mean()
+
+
+def test_coarsen_merges_nodes_into_neighbouring_centers():
+
+    adjacency: sp.csr_matrix = symmetric_adjacency(nx.to_scipy_sparse_array(nx.star_graph(10), format='csr'))
+    labels: np.ndarray = coarsen(adjacency, np.random.default_rng(0))
+    assert (labels == 0).all()
+
+    adjacency = symmetric_adjacency(nx.to_scipy_sparse_array(nx.grid_2d_graph(20, 20), format='csr'))
+    labels = coarsen(adjacency, np.random.default_rng(0))
+    assert labels.max() + 1 < 0.5 * adjacency.shape[0]
+
+    """Each coarse node is a center and (some of) its neighbours"""
+    rows, columns = adjacency.nonzero()
+    assert all(labels[i] in set(labels[columns[rows == i]]) or (labels == labels[i]).sum() == 1 for i in range(400))
+
+
+@pytest.mark.parametrize('graph', [nx.grid_2d_graph(30, 30), nx.barabasi_albert_graph(1200, 2, seed=1)])
+def test_multilevel_spring_layout(graph: nx.Graph):
+
+    adjacency: sp.csr_matrix = nx.to_scipy_sparse_array(graph, format='csr')
+
+    positions: np.ndarray = multilevel_spring_layout(adjacency, scale=2.0, seed=1)
+
+    assert positions.shape == (adjacency.shape[0], 2)
+    assert np.isfinite(positions).all()
+    assert np.isclose(np.abs(positions).max(), 2.0)
+    assert mean_edge_length_ratio(positions, adjacency) < 0.6
+    assert (multilevel_spring_layout(adjacency, scale=2.0, seed=1) == positions).all()
+
+
+def test_multilevel_spring_layout_warm_start():
+
+    adjacency: sp.csr_matrix = nx.to_scipy_sparse_array(nx.grid_2d_graph(20, 20), format='csr')
+    positions: np.ndarray = multilevel_spring_layout(adjacency, seed=1)
+
+    initial: np.ndarray = positions.copy()
+    initial[:10] = np.nan
+
+    warm: np.ndarray = multilevel_spring_layout(adjacency, pos=initial, seed=1)
+
+    assert np.isfinite(warm).all()
+    assert mean_edge_length_ratio(warm, adjacency) < 0.2
+
+
+def test_multilevel_spring_layout_of_trivial_graphs():
+    assert multilevel_spring_layout(sp.csr_matrix((0, 0))).shape == (0, 2)
+    assert multilevel_spring_layout(sp.csr_matrix((1, 1))).shape == (1, 2)
+    assert np.isfinite(multilevel_spring_layout(sp.csr_matrix((5, 5)), seed=1)).all()
+
+
+def test_graph_key():
+    G: nx.Graph = nx.Graph([('a', 'b', {'weight': 1}), ('b', 'c', {'weight': 2})])
+    H: nx.Graph = nx.Graph([('a', 'b', {'weight': 1}), ('b', 'c', {'weight': 2})])
+    assert graph_key(G) == graph_key(H)
+
+    H.edges['b', 'c']['weight'] = 3
+    assert graph_key(G) != graph_key(H)
+
+    H.remove_edge('b', 'c')
+    assert graph_key(G) != graph_key(H)
+
+
+def test_layout_cache_returns_cached_layout_and_warm_starts_changed_networks():
+
+    cache: LayoutCache = LayoutCache(max_size=2)
+    calls: list = []
+
+    def compute(pos):
+        calls.append(pos)
+        return {'a': (0.0, 0.0), 'b': (1.0, 1.0), 'c': (2.0, 2.0)}
+
+    G: nx.Graph = nx.Graph([('a', 'b'), ('b', 'c')])
+    layout: dict = cache.get(G, 'spring', compute, warm_start=True, k=0.1)
+
+    assert cache.get(G.copy(), 'spring', compute, warm_start=True, k=0.1) is layout
+    assert calls == [None]
+
+    cache.get(G, 'spring', compute, warm_start=True, k=0.2)
+    assert len(calls) == 2
+
+    G.add_edge('c', 'd')
+    cache.get(G, 'spring', compute, warm_start=True, k=0.1)
+    assert calls[-1] == {'a': (0.0, 0.0), 'b': (1.0, 1.0), 'c': (2.0, 2.0)}
+    assert len(cache.layouts) == 2
+
+
+def test_layout_network_is_cached():
+
+    G: nx.Graph = nx.les_miserables_graph()
+    layout, _ = layout_network(G, 'nx_multilevel_spring_layout', seed=1)
+
+    assert set(layout.keys()) == set(G.nodes)
+    assert layout_network(G, 'nx_multilevel_spring_layout', seed=1)[0] is layout
+
+    layout = plot_utility.compute_layout(
+        'Multilevel Spring', G, **plot_utility.layout_args('Multilevel Spring', G, 1.0)
+    )
+    assert set(layout.keys()) == set(G.nodes)
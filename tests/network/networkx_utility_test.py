@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from penelope.network.networkx import utility as nu
+
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def edges() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            'source': ['a', 'a', 'b', 'c'],
+            'target': ['b', 'c', 'c', 'd'],
+            'weight': [1.0, 2.0, 3.0, 4.0],
+            'year': [2001, 2002, 2003, 2004],
+        }
+    )
+
+
+@pytest.fixture
+def layout() -> nu.NodesLayout:
+    return {'a': (0.0, 0.0), 'b': (1.0, 0.0), 'c': (1.0, 1.0), 'd': (0.0, 2.0)}
+
+
+def test_create_network(edges: pd.DataFrame):
+
+    network = nu.create_network(edges)
+
+    assert set(network.nodes) == {'a', 'b', 'c', 'd'}
+    assert network.edges['a', 'c'] == {'weight': 2.0}
+
+
+def test_df_to_nx_with_edge_attributes(edges: pd.DataFrame):
+
+    network = nu.df_to_nx(edges, weight='weight', year='year')
+
+    assert network.number_of_edges() == 4
+    assert network.edges['c', 'd'] == {'weight': 4.0, 'year': 2004}
+
+
+def test_create_bipartite_network():
+
+    data: pd.DataFrame = pd.DataFrame({'source': [0, 0, 1], 'target': ['x', 'y', 'x'], 'weight': [1, 2, 3]})
+    network = nu.create_bipartite_network(data)
+
+    assert set(nu.get_bipartite_node_set(network, bipartite=0)[0]) == {0, 1}
+    assert network.edges[1, 'x'] == {'weight': 3}
+
+
+def test_layout_edges(edges: pd.DataFrame, layout: nu.NodesLayout):
+
+    network = nu.create_network(edges)
+    sources, targets, weights, xs, ys = nu.layout_edges(network, layout)
+
+    assert len(sources) == len(targets) == len(weights) == len(xs) == len(ys) == 4
+    for u, v, w, x, y in zip(sources, targets, weights, xs, ys):
+        assert network.edges[u, v]['weight'] == w
+        assert x.tolist() == [layout[u][0], layout[v][0]]
+        assert y.tolist() == [layout[u][1], layout[v][1]]
+
+
+def test_layout_edges_raises_key_error_for_nodes_missing_in_layout(edges: pd.DataFrame, layout: nu.NodesLayout):
+
+    network = nu.create_network(edges)
+    del layout['d']
+
+    with pytest.raises(KeyError, match="'d'"):
+        nu.layout_edges(network, layout)
+
+    with pytest.raises(KeyError, match="'d'"):
+        nu.get_positioned_edges_as_dict(network, layout)
+
+
+def test_get_positioned_nodes(edges: pd.DataFrame, layout: nu.NodesLayout):
+
+    network = nu.create_network(edges)
+    network.nodes['a']['size'] = 10
+
+    nodes: dict = nu.get_positioned_nodes(network, layout, nodes=['c', 'a'])
+
+    assert nodes['name'].tolist() == ['a', 'c']
+    assert nodes['x'].tolist() == [0.0, 1.0]
+    assert nodes['y'].tolist() == [0.0, 1.0]
+    assert nodes['size'][0] == 10 and np.isnan(nodes['size'][1])
+
+
+def test_get_positioned_edges_as_dict(edges: pd.DataFrame, layout: nu.NodesLayout):
+
+    network = nu.df_to_nx(edges, weight='weight', year='year')
+    data: dict = nu.get_positioned_edges_as_dict(network, layout, sort_attr='weight')
+
+    assert data['weight'].tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert data['year'].tolist() == [2001, 2002, 2003, 2004]
+    assert [x.tolist() for x in data['xs']] == [[0.0, 1.0], [0.0, 1.0], [1.0, 1.0], [1.0, 0.0]]
+    assert data['m_y'].tolist() == [0.0, 0.5, 0.5, 1.5]
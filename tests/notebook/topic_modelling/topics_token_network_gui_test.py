@@ -2,6 +2,7 @@ import io
 from unittest.mock import patch
 
 import ipycytoscape
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -77,6 +78,49 @@ def test_to_dict(inferred_topics_data: tm.InferredTopicsData):
     assert {x['data']['id'] for x in edges} == {'0_valv', '0_i', '0_och'}
 
 
+def test_create_network_data(topics_tokens: pd.DataFrame):
+
+    data: ttn_gui.TopicsTokensNetworkData = ttn_gui.create_network_data(topics_tokens)
+
+    assert data.topics.tolist() == ['Topic #0', 'Topic #1', 'Topic #2', 'Topic #3']
+    assert data.topic_ids.tolist() == [0, 1, 2, 3]
+    assert data.tokens.tolist() == sorted(topics_tokens.token.unique())
+    assert dict(zip(data.tokens, data.token_topic_ids)) == {
+        'av': '1',
+        'de': '3',
+        'en': '2',
+        'i': '',
+        'och': '',
+        'som': '',
+        'valv': '0',
+        'är': '',
+    }
+    assert data.topics[data.sources].tolist() == topics_tokens.topic.tolist()
+    assert data.tokens[data.targets].tolist() == topics_tokens.token.tolist()
+    assert np.allclose(data.weights, 10.0 * topics_tokens.weight)
+
+    g = ttn_gui.create_networkx(topics_tokens)
+    assert g.number_of_nodes() == 12 and g.number_of_edges() == 12
+    assert g.edges['Topic #1', 'som'] == {'id': '1_som', 'weight': data.weights[4], 'topic_id': '1'}
+
+    layout = data.layout()
+    assert set(layout) == set(data.topics) | set(data.tokens)
+    assert data.layout() is layout
+
+    w = ttn_gui.create_network(data, positions=layout)
+    assert all(node.position == dict(zip('xy', map(float, layout[node.data['id']]))) for node in w.graph.nodes)
+
+
+def test_view_model_reuses_network_data(inferred_topics_data: tm.InferredTopicsData):
+
+    model = ttn_gui.ViewModel(filename_fields="year:_:1").update(inferred_topics_data)
+
+    data = model.get_network_data([0, 1], 3)
+    assert model.get_network_data([1, 0], 3) is data
+    assert model.get_network_data([0, 1], 2) is not data
+    assert len(model.get_network_data([0, 1], 2).sources) == 4
+
+
 def test_create_network(inferred_topics_data: tm.InferredTopicsData):
 
     n_top_count = 2
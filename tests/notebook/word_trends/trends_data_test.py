@@ -220,3 +220,68 @@ def test_find_word_indices():
 
 def test_find_words():
     pass
+
+
+def test_extract_slices_token_columns_from_cached_csc_matrix():
+
+    trends_data: TrendsData = TrendsData(corpus=simple_corpus_with_pivot_keys())
+    opts: TrendsComputeOpts = TrendsComputeOpts(normalize=False, keyness=KeynessMetric.TF, temporal_key='year')
+
+    corpus: VectorizedCorpus = trends_data.transform(opts).transformed_corpus
+    data: pd.DataFrame = trends_data.extract(indices=[2, 0])
+
+    assert data.columns.tolist() == ['year', 'c', 'a']
+    assert (data.c.values == corpus.bag_term_matrix.getcol(2).A.ravel()).all()
+    assert (data.a.values == corpus.bag_term_matrix.getcol(0).A.ravel()).all()
+
+    csc = trends_data.tabular_compiler.csc(corpus, opts)
+    trends_data.extract(indices=[1])
+    assert trends_data.tabular_compiler.csc(corpus, opts) is csc
+
+    trends_data.transform(TrendsComputeOpts(normalize=True, keyness=KeynessMetric.TF, temporal_key='year'))
+    trends_data.extract(indices=[1])
+    assert trends_data.tabular_compiler.csc(trends_data.transformed_corpus, trends_data.compute_opts) is not csc
+
+
+def test_transform_reuses_cached_corpora():
+
+    trends_data: TrendsData = TrendsData(corpus=simple_corpus_with_pivot_keys())
+
+    def transform(**kwargs) -> VectorizedCorpus:
+        opts: TrendsComputeOpts = TrendsComputeOpts(**{**dict(normalize=False, keyness=KeynessMetric.TF), **kwargs})
+        return trends_data.transform(opts).transformed_corpus
+
+    yearly: VectorizedCorpus = transform(temporal_key='year')
+    decade: VectorizedCorpus = transform(temporal_key='decade')
+
+    assert decade is not yearly
+    assert transform(temporal_key='year') is yearly
+    assert transform(temporal_key='decade') is decade
+
+    normalized: VectorizedCorpus = transform(temporal_key='year', normalize=True)
+    assert normalized is not yearly
+    assert transform(temporal_key='year') is yearly
+    assert np.allclose(normalized.data.sum(axis=1), 1.0)
+    assert not np.allclose(yearly.data.sum(axis=1), 1.0)
+
+    tf_idf: VectorizedCorpus = transform(temporal_key='year', keyness=KeynessMetric.TF_IDF)
+    assert transform(temporal_key='decade', keyness=KeynessMetric.TF_IDF) is not tf_idf
+    assert ('keyness', KeynessMetric.TF_IDF) in trends_data._cache.entries  # pylint: disable=protected-access
+
+
+def test_transform_cache_evicts_least_recently_used():
+
+    trends_data: TrendsData = TrendsData(corpus=simple_corpus_with_pivot_keys())
+    opts: TrendsComputeOpts = TrendsComputeOpts(normalize=False, keyness=KeynessMetric.TF, temporal_key='year')
+
+    yearly: VectorizedCorpus = trends_data.transform(opts).transformed_corpus
+    cache = trends_data._cache  # pylint: disable=protected-access
+    cache.max_bytes = cache.nbytes
+
+    decade: VectorizedCorpus = trends_data.transform(
+        TrendsComputeOpts(normalize=False, keyness=KeynessMetric.TF, temporal_key='decade')
+    ).transformed_corpus
+
+    assert cache.nbytes <= cache.max_bytes
+    assert all(corpus is not yearly for corpus, _ in cache.entries.values())
+    assert any(corpus is decade for corpus, _ in cache.entries.values())
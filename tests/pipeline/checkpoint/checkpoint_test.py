@@ -1,9 +1,11 @@
 import os
 
+import pandas as pd
 import pytest
 
 import penelope.pipeline.checkpoint as checkpoint
 from penelope.corpus.readers.interfaces import TextReaderOpts
+from penelope.pipeline.checkpoint import load
 
 
 @pytest.mark.long_running
@@ -49,6 +51,52 @@ def test_load_tagged_frame_checkpoint():
     assert {x for x in data.document_index.filename.to_list()} == expected_documents
 
 
+@pytest.mark.parametrize(
+    'document_filter,expected_documents',
+    [
+        (
+            dict(year=(1950, 1999)),
+            [
+                'CONVENTION_0201_015395_1958_paris.txt',
+                'DECLARATION_0201_013178_1997.txt',
+                'RECOMMENDATION_0201_013135_1978.txt',
+            ],
+        ),
+        (
+            lambda di: di.type == 'RECOMMENDATION',
+            ['RECOMMENDATION_0201_049455_2017.txt', 'RECOMMENDATION_0201_013135_1978.txt'],
+        ),
+        (
+            ['DECLARATION_0201_013178_1997', 'CONSTITUTION_0201_015244_1945_london.csv'],
+            ['CONSTITUTION_0201_015244_1945_london.txt', 'DECLARATION_0201_013178_1997.txt'],
+        ),
+    ],
+)
+def test_load_archive_with_document_filter(document_filter, expected_documents):
+
+    tagged_corpus_source: str = "./tests/test_data/legal_instrument_five_docs_test_pos_csv.zip"
+
+    loaded_filenames: list = []
+
+    def payload_loader(*, zip_or_filename, checkpoint_opts, filenames):
+        loaded_filenames.extend(filenames)
+        return checkpoint.load_payloads_singleprocess(
+            zip_or_filename=zip_or_filename, checkpoint_opts=checkpoint_opts, filenames=filenames
+        )
+
+    data = checkpoint.load_archive(
+        source_name=tagged_corpus_source, payload_loader=payload_loader, document_filter=document_filter
+    )
+
+    assert data.filenames == expected_documents
+    assert data.document_index.filename.tolist() == expected_documents
+
+    payloads = list(data.create_stream())
+
+    assert loaded_filenames == expected_documents
+    assert [x.filename for x in payloads] == expected_documents
+
+
 def test_python_list_merge():
 
     tokens = [chr(ord('a') + i) for i in range(0, 10)]
@@ -69,3 +117,84 @@ def test_python_list_merge():
     tokens = tokens_str.split()
 
     assert tokens == ['a', 'b', 'c', 'd_e_f', 'g', 'h', 'i', 'j']
+
+
+@pytest.mark.long_running
+@pytest.mark.parametrize('ordered,use_feather', [(True, False), (False, True)])
+def test_load_payloads_multiprocess_equals_singleprocess(ordered: bool, use_feather: bool, tmp_path):
+    tagged_corpus_source: str = "./tests/test_data/legal_instrument_five_docs_test_pos_csv.zip"
+
+    data = checkpoint.load_archive(source_name=tagged_corpus_source)
+    checkpoint_opts: checkpoint.CheckpointOpts = data.checkpoint_opts
+    checkpoint_opts.deserialize_processes = 2
+    checkpoint_opts.deserialize_chunksize = 2
+    checkpoint_opts.feather_folder = str(tmp_path) if use_feather else None
+
+    expected = list(
+        checkpoint.load_payloads_singleprocess(
+            zip_or_filename=tagged_corpus_source, checkpoint_opts=checkpoint_opts, filenames=data.filenames
+        )
+    )
+
+    for _ in range(2 if use_feather else 1):
+        """Second pass (if feathered) reads documents from feather files instead of archive"""
+        payloads = list(
+            checkpoint.load_payloads_multiprocess(
+                zip_or_filename=tagged_corpus_source,
+                checkpoint_opts=checkpoint_opts,
+                filenames=data.filenames,
+                ordered=ordered,
+            )
+        )
+
+        if ordered:
+            assert [x.filename for x in payloads] == data.filenames
+
+        actual = {x.filename: x for x in payloads}
+        assert set(actual) == set(data.filenames)
+        for payload in expected:
+            assert (
+                actual[payload.filename].content.reset_index(drop=True).equals(payload.content.reset_index(drop=True))
+            )
+            assert actual[payload.filename].property_bag.keys() == payload.property_bag.keys()
+
+
+@pytest.mark.long_running
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason="shared memory blocks are not listed in /dev/shm")
+def test_load_payloads_multiprocess_releases_shared_memory_when_closed_early():
+    tagged_corpus_source: str = "./tests/test_data/legal_instrument_five_docs_test_pos_csv.zip"
+
+    def shared_blocks() -> set:
+        return {x for x in os.listdir('/dev/shm') if x.startswith('psm_')}
+
+    data = checkpoint.load_archive(source_name=tagged_corpus_source)
+    checkpoint_opts: checkpoint.CheckpointOpts = data.checkpoint_opts
+    checkpoint_opts.deserialize_processes = 2
+    checkpoint_opts.deserialize_chunksize = 1
+
+    blocks: set = shared_blocks()
+
+    payloads = checkpoint.load_payloads_multiprocess(
+        zip_or_filename=tagged_corpus_source, checkpoint_opts=checkpoint_opts, filenames=data.filenames
+    )
+    assert next(payloads).filename == data.filenames[0]
+    payloads.close()
+
+    assert shared_blocks() == blocks
+
+
+def test_export_and_import_shared_frames():
+    frames = [
+        pd.DataFrame({'token': ['a', 'b'], 'pos': ['NN', 'VB']}, index=[3, 4]),
+        None,
+        pd.DataFrame({'token': pd.Series([], dtype=object), 'count': pd.Series([], dtype=int)}),
+    ]
+
+    shared_frames = load.export_frames(frames)
+    imported = load.import_frames(shared_frames)
+
+    assert imported[1] is None
+    assert imported[0].equals(frames[0])
+    assert imported[2].equals(frames[2])
+
+    assert load.import_frames(load.export_frames([None, None])) == [None, None]
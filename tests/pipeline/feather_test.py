@@ -1,9 +1,13 @@
+import glob
 import os
+import uuid
+from typing import List
 
 import pandas as pd
 import pytest
 
-from penelope.pipeline import CorpusConfig, CorpusPipeline
+from penelope.pipeline import ContentType, CorpusConfig, CorpusPipeline, DocumentPayload
+from penelope.pipeline import checkpoint as cp
 from penelope.utility import replace_extension
 
 CORPUS_FOLDER = './tests/test_data'
@@ -45,3 +49,145 @@ def test_pipeline_can_can_be_saved_in_feather(config: CorpusConfig):
         apa = pd.read_feather(filename)
 
         assert apa is not None
+
+
+def tagged_payloads() -> List[DocumentPayload]:
+    return [
+        DocumentPayload(
+            content_type=ContentType.TAGGED_FRAME,
+            filename=f"doc_{i}.csv",
+            content=pd.DataFrame(
+                {
+                    'token': [f"a{i}", f"b{i}", "c"][: i % 3 + 1],
+                    'pos': 'NN',
+                    'baseform': [f"A{i}", "B", "C"][: i % 3 + 1],
+                }
+            ),
+        )
+        for i in range(7)
+    ] + [
+        DocumentPayload(
+            content_type=ContentType.TAGGED_FRAME,
+            filename="doc_empty.csv",
+            content=pd.DataFrame({'token': pd.Series([], dtype=object), 'pos': [], 'baseform': []}),
+        ),
+        DocumentPayload(
+            content_type=ContentType.TAGGED_FRAME,
+            filename="doc_other_columns.csv",
+            content=pd.DataFrame({'token': ['x', 'y'], 'pos': ['NN', 'VB'], 'tf': [1, 2]}),
+        ),
+    ]
+
+
+def test_feather_archive_random_access_projection_and_scan():
+
+    folder: str = os.path.join(OUTPUT_FOLDER, f"feather_archive_{uuid.uuid4()}")
+    payloads: List[DocumentPayload] = tagged_payloads()
+
+    with cp.feather.FeatherArchiveWriter(folder, part_size=100) as writer:
+        for payload in payloads:
+            writer.write(payload)
+
+    assert cp.feather.archive_exists(folder)
+    assert not glob.glob(os.path.join(folder, "*.feather"))
+
+    archive: cp.feather.FeatherArchive = cp.feather.open_archive(folder)
+
+    assert len(archive) == len(payloads)
+    assert archive.index.part.nunique() > 1
+    assert "doc_3.feather" in archive and "doc_99.csv" not in archive
+
+    for payload in payloads:
+        tagged_frame: pd.DataFrame = archive.read(payload.filename)
+        assert tagged_frame.columns.tolist() == payload.content.columns.tolist()
+        assert tagged_frame.values.tolist() == payload.content.values.tolist()
+
+    assert archive.read("doc_4.csv", columns=['baseform', 'token']).to_dict('list') == {
+        'baseform': ['A4', 'B'],
+        'token': ['a4', 'b4'],
+    }
+
+    filenames: List[str] = ["doc_5.csv", "doc_1.csv", "doc_2.csv", "doc_3.csv", "doc_other_columns.csv"]
+    for processes in [None, 2]:
+        scanned: List[DocumentPayload] = list(
+            cp.feather.read_payloads(folder, filenames, columns=['token'], processes=processes)
+        )
+        assert [x.filename for x in scanned] == filenames
+        assert [x.content.token.tolist() for x in scanned] == [
+            ['a5', 'b5', 'c'],
+            ['a1', 'b1'],
+            ['a2', 'b2', 'c'],
+            ['a3'],
+            ['x', 'y'],
+        ]
+
+    payload: DocumentPayload = cp.feather.read_payload(os.path.join(folder, "doc_2.csv"))
+    assert payload.filename == "doc_2.csv" and payload.content.token.tolist() == ['a2', 'b2', 'c']
+    assert cp.feather.payload_exists(folder, payload)
+
+
+def test_read_payloads_falls_back_to_document_files():
+
+    folder: str = os.path.join(OUTPUT_FOLDER, f"feather_files_{uuid.uuid4()}")
+    os.makedirs(folder)
+
+    for payload in tagged_payloads():
+        cp.feather.write_payload(folder, payload)
+
+    assert not cp.feather.archive_exists(folder)
+
+    scanned: List[DocumentPayload] = list(cp.feather.read_payloads(folder, ["doc_4.csv", "doc_0.csv"], columns=['pos']))
+
+    assert [x.filename for x in scanned] == ["doc_4.csv", "doc_0.csv"]
+    assert [x.content.columns.tolist() for x in scanned] == [['pos'], ['pos']]
+
+
+def test_pipeline_consolidated_feather_checkpoint(config: CorpusConfig):
+
+    tagged_corpus_source: str = os.path.join(CORPUS_FOLDER, 'legal_instrument_five_docs_test_pos_csv.zip')
+    folder: str = os.path.join(OUTPUT_FOLDER, f"consolidated_feather_{uuid.uuid4()}")
+
+    def pipeline() -> CorpusPipeline:
+        return (
+            CorpusPipeline(config=config)
+            .checkpoint(tagged_corpus_source, force_checkpoint=False)
+            .checkpoint_feather(folder=folder, consolidated=True)
+        )
+
+    written: List[DocumentPayload] = pipeline().to_list()
+
+    assert cp.feather.archive_exists(folder) and cp.feather.document_index_exists(folder)
+    assert not glob.glob(os.path.join(folder, "*.feather"))
+
+    read: List[DocumentPayload] = pipeline().to_list()
+
+    assert [x.document_name for x in read] == [x.document_name for x in written]
+    assert all(x.content.equals(y.content) for x, y in zip(read, written))
+
+
+@pytest.mark.parametrize('consolidated', [False, True])
+def test_pipeline_feather_checkpoint_with_document_filter(config: CorpusConfig, consolidated: bool):
+
+    tagged_corpus_source: str = os.path.join(CORPUS_FOLDER, 'legal_instrument_five_docs_test_pos_csv.zip')
+    folder: str = os.path.join(OUTPUT_FOLDER, f"filtered_feather_{uuid.uuid4()}")
+    expected_documents: List[str] = [
+        'CONVENTION_0201_015395_1958_paris',
+        'DECLARATION_0201_013178_1997',
+        'RECOMMENDATION_0201_013135_1978',
+    ]
+
+    def pipeline() -> CorpusPipeline:
+        return (
+            CorpusPipeline(config=config)
+            .checkpoint(tagged_corpus_source, force_checkpoint=False)
+            .checkpoint_feather(folder=folder, consolidated=consolidated, document_filter=dict(year=(1950, 1999)))
+        )
+
+    for _ in range(2):
+        """First pass creates a complete checkpoint, second pass reads only selected documents"""
+        p: CorpusPipeline = pipeline()
+        payloads: List[DocumentPayload] = p.to_list()
+        assert [x.document_name for x in payloads] == expected_documents
+        assert p.payload.document_index.document_name.tolist() == expected_documents
+
+    assert len(cp.feather.read_document_index(folder)) == 5
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import time
+import zipfile
+from typing import Callable, Iterable, List
+
+import pandas as pd
+
+import penelope.pipeline.checkpoint as cp
+from penelope.pipeline import DocumentPayload
+
+SOURCE: str = './tests/test_data/legal_instrument_five_docs_test_pos_csv.zip'
+TARGET: str = './tests/output/checkpoint_filter_profiling'
+
+DOCUMENT_FILTER: dict = dict(year=(1960, 1969))
+
+
+def create_archive(source: str, target: str, copies: int) -> str:
+    """Creates a larger checkpoint of `copies` renamed copies of each document in `source`, spread over a century"""
+    data: cp.CheckpointData = cp.load_archive(source_name=source)
+    filename: str = os.path.join(target, 'corpus.zip')
+    document_index: pd.DataFrame = pd.concat(
+        [
+            data.document_index.assign(
+                filename=data.document_index.filename.str.replace('.txt', f'_{i:05}.txt', regex=False),
+                document_name=data.document_index.document_name + f'_{i:05}',
+                year=1900 + i % 100,
+            )
+            for i in range(copies)
+        ],
+        ignore_index=True,
+    )
+    document_index['document_id'] = range(len(document_index))
+    document_index = document_index.set_index('document_name', drop=False)
+    os.makedirs(target, exist_ok=True)
+    with zipfile.ZipFile(source) as zs, zipfile.ZipFile(filename, mode="w", compression=zipfile.ZIP_DEFLATED) as zt:
+        zt.writestr(cp.interface.CHECKPOINT_OPTS_FILENAME, zs.read(cp.interface.CHECKPOINT_OPTS_FILENAME))
+        for i in range(copies):
+            for name in data.filenames:
+                zt.writestr(name.replace('.txt', f'_{i:05}.txt'), zs.read(name))
+        zt.writestr(
+            cp.interface.DOCUMENT_INDEX_FILENAME,
+            document_index.to_csv(sep=data.checkpoint_opts.document_index_sep or "\t", header=True),
+        )
+    return filename
+
+
+def create_feather_folders(source: str, target: str) -> List[str]:
+    """Stores checkpoint `source` as a feather folder with one file per document, and as a consolidated archive"""
+    data: cp.CheckpointData = cp.load_archive(source_name=source)
+    folders: List[str] = [os.path.join(target, 'feather'), os.path.join(target, 'consolidated')]
+    for folder in folders:
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder)
+    with cp.feather.FeatherArchiveWriter(folders[1]) as writer:
+        for payload in data.create_stream():
+            cp.feather.write_payload(folders[0], payload)
+            writer.write(payload)
+    for folder in folders:
+        cp.feather.write_document_index(folder, data.document_index.copy())
+    return folders
+
+
+def load_zip(source: str, document_filter: cp.DocumentFilter) -> Iterable[DocumentPayload]:
+    data: cp.CheckpointData = cp.load_archive(source_name=source, document_filter=document_filter)
+    return cp.load_payloads_singleprocess(
+        zip_or_filename=source, checkpoint_opts=data.checkpoint_opts, filenames=data.filenames
+    )
+
+
+def load_feather(folder: str, document_filter: cp.DocumentFilter) -> Iterable[DocumentPayload]:
+    document_index: pd.DataFrame = cp.filter_document_index(cp.feather.read_document_index(folder), document_filter)
+    return cp.feather.read_payloads(folder, document_index.filename.tolist())
+
+
+def timed(name: str, loader: Callable[[str, cp.DocumentFilter], Iterable[DocumentPayload]], source: str) -> None:
+    elapsed: List[float] = []
+    for document_filter in [None, DOCUMENT_FILTER]:
+        start: float = time.perf_counter()
+        payloads: list = list(loader(source, document_filter))
+        elapsed.append(time.perf_counter() - start)
+        print(f"{name:<14} {'filtered' if document_filter else 'full':<10} {len(payloads):6} docs {elapsed[-1]:8.3f}s")
+    print(f"{name:<14} {'speedup':<10} {elapsed[0] / elapsed[1]:20.1f}x")
+
+
+def main(copies: int = 200):
+    source: str = create_archive(SOURCE, TARGET, copies)
+    feather_folder, consolidated_folder = create_feather_folders(source, TARGET)
+
+    timed("zip", load_zip, source)
+    timed("feather", load_feather, feather_folder)
+    timed("consolidated", load_feather, consolidated_folder)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
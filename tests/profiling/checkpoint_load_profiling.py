@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+import zipfile
+
+import penelope.pipeline.checkpoint as cp
+
+SOURCE: str = './tests/test_data/legal_instrument_five_docs_test_pos_csv.zip'
+TARGET: str = './tests/output/checkpoint_load_profiling.zip'
+
+
+def create_archive(source: str, target: str, copies: int) -> str:
+    """Creates a larger checkpoint by storing `copies` renamed copies of each document in `source`"""
+    data: cp.CheckpointData = cp.load_archive(source_name=source)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with zipfile.ZipFile(source) as zs, zipfile.ZipFile(target, mode="w", compression=zipfile.ZIP_DEFLATED) as zt:
+        zt.writestr(cp.interface.CHECKPOINT_OPTS_FILENAME, zs.read(cp.interface.CHECKPOINT_OPTS_FILENAME))
+        for i in range(copies):
+            for filename in data.filenames:
+                name, extension = os.path.splitext(filename)
+                zt.writestr(f"{name}_{i:05}{extension}", zs.read(filename))
+    return target
+
+
+def timed(name: str, source: str, processes: int) -> None:
+    data: cp.CheckpointData = cp.load_archive(source_name=source)
+    data.checkpoint_opts.deserialize_processes = processes
+    data.checkpoint_opts.deserialize_chunksize = 16
+    start: float = time.perf_counter()
+    payloads: list = list(
+        cp.load_payloads_multiprocess(
+            zip_or_filename=source, checkpoint_opts=data.checkpoint_opts, filenames=data.filenames
+        )
+        if processes
+        else cp.load_payloads_singleprocess(
+            zip_or_filename=source, checkpoint_opts=data.checkpoint_opts, filenames=data.filenames
+        )
+    )
+    elapsed: float = time.perf_counter() - start
+    tokens: int = sum(len(x.content) for x in payloads)
+    print(f"{name:<30} {elapsed:8.3f}s {len(payloads) / elapsed:10.1f} docs/s {tokens / elapsed:12.0f} tokens/s")
+
+
+def main(copies: int = 200, max_processes: int = 8):
+    source: str = create_archive(SOURCE, TARGET, copies)
+
+    timed("single process", source, 0)
+    for processes in [x for x in [1, 2, 4, 8] if x <= max_processes]:
+        timed(f"multiprocess ({processes} workers)", source, processes)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import os
+import time
+
+from penelope import corpus as pc
+from penelope import utility as pu
+
+# DTM stored by `riksprot-dtm_profiling.py`
+FOLDER: str = './tests/output/dtm_1965_cprofile'
+TAG: str = os.path.split(FOLDER)[1]
+
+
+def timed(name: str, fx, *args, **kwargs) -> pc.VectorizedCorpus:
+    start: float = time.perf_counter()
+    corpus: pc.VectorizedCorpus = fx(*args, **kwargs)
+    print(f"{name:<40} {time.perf_counter() - start:8.3f}s  shape={corpus.data.shape} nnz={corpus.data.nnz}")
+    return corpus
+
+
+def main():
+
+    corpus: pc.VectorizedCorpus = pc.VectorizedCorpus.load(folder=FOLDER, tag=TAG)
+
+    print(f"loaded DTM shape={corpus.data.shape} nnz={corpus.data.nnz}")
+
+    for aggregate in ['sum', 'mean']:
+        timed(f"group_by_year ({aggregate})", corpus.group_by_year, aggregate=aggregate, fill_gaps=True)
+        timed(
+            f"group_by_time_period_optimized ({aggregate})",
+            corpus.group_by_time_period_optimized,
+            time_period_specifier='decade',
+            aggregate=aggregate,
+        )
+
+        pivot_keys = [key for key in ['who', 'gender_id', 'party_id'] if key in corpus.document_index.columns]
+        timed(
+            f"group_by_pivot_keys ({aggregate})",
+            corpus.group_by_pivot_keys,
+            temporal_key='year',
+            pivot_keys=pivot_keys,
+            filter_opts=pu.PropertyValueMaskingOpts(),
+            document_namer=None,
+            aggregate=aggregate,
+        )
+
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import random
+import sys
+import time
+import unicodedata
+from typing import Callable, List
+
+import ftfy
+
+from penelope.corpus import transforms as tr
+from penelope.corpus.readers import TextTransformer, TextTransformOpts
+from penelope.vendor.textacy_api import normalize_whitespace
+
+WORDS: List[str] = "riksdagen har beslutat att anslaget för skolor och vägar ska ökas med tio procent".split()
+NOISE: List[str] = ['  ', ' \t', '\r\n', '\n\n', '\xa0', '\u200b', 'ﬁ', 'é', 'å', '§ 3', '1958', '&']
+
+
+def create_ocr_like_text(n_lines: int, ascii_only: bool, rng: random.Random) -> str:
+    """Lines of words with hyphenated line breaks, irregular whitespace and (optionally) some non-ASCII noise"""
+    lines: List[str] = []
+    for _ in range(n_lines):
+        words: List[str] = rng.choices(WORDS, k=rng.randint(6, 14))
+        if not ascii_only and rng.random() < 0.3:
+            words.insert(rng.randint(0, len(words)), rng.choice(NOISE))
+        line: str = (' ' * rng.randint(1, 2)).join(words)
+        if rng.random() < 0.2:
+            line = line + '-' if rng.random() < 0.8 else line + '¬'
+        lines.append(line)
+    text: str = ('\r\n' if rng.random() < 0.5 else '\n').join(lines)
+    return text.encode('ascii', 'ignore').decode() if ascii_only else text
+
+
+def reference_transform(opts: TextTransformOpts) -> Callable[[str], str]:
+    """Transforms as they were before fast paths, one full pass each"""
+    transforms: List[Callable[[str], str]] = []
+    if opts.fix_whitespaces:
+        transforms.append(normalize_whitespace)
+    if opts.fix_hyphenation:
+        transforms.append(lambda text: tr.RE_HYPHEN_REGEXP.sub(r"\1\2\n", text))
+    if opts.fix_ftfy_text:
+        transforms.append(ftfy.fix_text)
+    if opts.fix_accents:
+        transforms.append(lambda text: unicodedata.normalize('NFD', text).encode('ascii', 'ignore').decode("utf-8"))
+    if opts.fix_unicode:
+        transforms.append(lambda text: unicodedata.normalize("NFC", text))
+
+    def transform(text: str) -> str:
+        for ft in transforms:
+            text = ft(text)
+        return text.strip()
+
+    return transform
+
+
+def timed(name: str, fx: Callable[[str], str], documents: List[str]) -> List[str]:
+    start: float = time.perf_counter()
+    result: List[str] = [fx(x) for x in documents]
+    elapsed: float = time.perf_counter() - start
+    n_chars: int = sum(map(len, documents))
+    print(f"{name:<40} {elapsed:8.3f}s {n_chars / elapsed / 1e6:8.2f} Mchars/s")
+    return result
+
+
+def main(n_documents: int = 500, n_lines: int = 200):
+
+    rng: random.Random = random.Random(42)
+
+    for ascii_share in [0.0, 0.9]:
+        documents: List[str] = [
+            create_ocr_like_text(n_lines, rng.random() < ascii_share, rng) for _ in range(n_documents)
+        ]
+        for opts in [TextTransformOpts(), TextTransformOpts(fix_accents=True, fix_unicode=True)]:
+            print(f"ascii share={ascii_share} {opts.props}")
+            expected: List[str] = timed("  reference", reference_transform(opts), documents)
+            actual: List[str] = timed(
+                "  TextTransformer", TextTransformer(text_transform_opts=opts).transform, documents
+            )
+            assert actual == expected
+
+
+if __name__ == '__main__':
+
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import random
+import sys
+import time
+from typing import List
+
+from penelope.corpus import TextTransformOpts, TokenizedCorpus, TokensTransformOpts
+from penelope.corpus.readers import TextTokenizer
+
+
+def create_vocabulary(n_words: int, rng: random.Random) -> List[str]:
+    """Mixed case words, numerals, symbols and accented words"""
+    letters: str = 'abcdefghijklmnopqrstuvwxyzåäöé'
+    words: List[str] = [''.join(rng.choices(letters, k=rng.randint(1, 12))) for _ in range(n_words)]
+    words = [x.capitalize() if rng.random() < 0.2 else x for x in words]
+    return words + [str(i) for i in range(1900, 2000)] + list('.,;:!?§-') + ['och', 'att', 'det', 'som', 'en']
+
+
+def create_texts(n_documents: int, n_tokens: int, vocabulary: List[str], rng: random.Random) -> List[str]:
+    weights: List[float] = [1.0 / (i + 1) for i in range(len(vocabulary))]
+    return [' '.join(rng.choices(vocabulary, weights=weights, k=n_tokens)) for _ in range(n_documents)]
+
+
+def timed(name: str, texts: List[str], transform_opts: TokensTransformOpts, vectorize: bool) -> List[List[str]]:
+    reader: TextTokenizer = TextTokenizer(source=texts, transform_opts=TextTransformOpts.empty(), tokenize=str.split)
+    corpus: TokenizedCorpus = TokenizedCorpus(reader, transform_opts=transform_opts)
+    corpus.transformer.vectorize = vectorize
+    start: float = time.perf_counter()
+    documents: List[List[str]] = [tokens for _, tokens in corpus]
+    elapsed: float = time.perf_counter() - start
+    n_tokens: int = sum(len(x.split()) for x in texts)
+    print(f"{name:<40} {elapsed:8.3f}s {n_tokens / elapsed / 1e6:8.2f} Mtokens/s")
+    return documents
+
+
+def main(n_documents: int = 1000, n_tokens: int = 2000, n_words: int = 50000):
+
+    rng: random.Random = random.Random(42)
+    texts: List[str] = create_texts(n_documents, n_tokens, create_vocabulary(n_words, rng), rng)
+
+    for opts in [
+        TokensTransformOpts(),
+        TokensTransformOpts(to_lower=True, min_len=2, keep_numerals=False),
+        TokensTransformOpts(
+            to_lower=True,
+            min_len=2,
+            max_len=10,
+            only_alphabetic=True,
+            remove_accents=True,
+            keep_numerals=False,
+            keep_symbols=False,
+            stopwords=['och', 'att', 'det', 'som', 'en'],
+        ),
+    ]:
+        print({k: v for k, v in opts.props.items() if v != getattr(TokensTransformOpts(), k)})
+        expected: List[List[str]] = timed("  chained", texts, opts, vectorize=False)
+        actual: List[List[str]] = timed("  vectorized", texts, opts, vectorize=True)
+        assert actual == expected
+
+
+if __name__ == '__main__':
+
+    main(*map(int, sys.argv[1:]))
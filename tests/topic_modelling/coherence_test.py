@@ -0,0 +1,91 @@
+import os
+import uuid
+
+import pandas as pd
+import pytest
+
+from penelope.topic_modelling.engines.engine_gensim import coherence
+from penelope.vendor.gensim_api import corpora as gensim_corpora
+from tests.utils import OUTPUT_FOLDER
+
+from .train_test import create_train_corpus
+
+jj = os.path.join
+
+
+def test_compute_scores():
+    train_corpus = create_train_corpus()
+
+    metrics = coherence.compute_scores(
+        'gensim_lda',
+        train_corpus.id2token,
+        train_corpus.corpus,
+        start=2,
+        stop=6,
+        step=2,
+        engine_args={'passes': 1, 'max_iter': 10, 'random_seed': 42},
+    )
+
+    assert [m['num_topics'] for m in metrics] == [2, 4]
+    assert all(isinstance(m['coherence_score'], float) for m in metrics)
+    assert all(m['perplexity_score'] > 0 for m in metrics)
+
+
+@pytest.mark.parametrize('processes', [None, 2])
+def test_sweep_computes_scores_and_resumes(processes):
+    train_corpus = create_train_corpus()
+    folder: str = jj(OUTPUT_FOLDER, f"sweep_{str(uuid.uuid4())[:6]}")
+    engine_args: dict = {'passes': 1, 'max_iter': 10}
+
+    configurations = coherence.sweep_configurations(n_topics=[2, 3], random_seeds=[1, 2])
+    assert len(configurations) == 4
+
+    scores: pd.DataFrame = coherence.sweep(
+        'gensim_lda',
+        train_corpus.id2token,
+        train_corpus.corpus,
+        configurations=configurations[:3],
+        folder=folder,
+        engine_args=engine_args,
+        processes=processes,
+    )
+
+    assert os.path.isfile(jj(folder, coherence.SWEEP_CORPUS_FILENAME))
+    assert len(scores) == 3
+    assert {'key', 'n_topics', 'random_seed', 'alpha', 'coherence_score', 'perplexity_score'} <= set(scores.columns)
+
+    scores = coherence.sweep(
+        'gensim_lda',
+        train_corpus.id2token,
+        train_corpus.corpus,
+        configurations=configurations,
+        folder=folder,
+        engine_args=engine_args,
+        processes=processes,
+    )
+
+    assert len(scores) == 4
+    assert set(scores.key) == {coherence.sweep_key(c) for c in configurations}
+
+
+def test_sweep_rebuilds_corpus_when_resumed_with_another_corpus():
+    train_corpus = create_train_corpus()
+    other_corpus = gensim_corpora.Sparse2Corpus(train_corpus.corpus.sparse[:, :3])
+    folder: str = jj(OUTPUT_FOLDER, f"sweep_{str(uuid.uuid4())[:6]}")
+    configurations = coherence.sweep_configurations(n_topics=[2], random_seeds=[1, 2])
+    opts: dict = dict(folder=folder, engine_args={'passes': 1, 'max_iter': 10})
+
+    scores: pd.DataFrame = coherence.sweep(
+        'gensim_lda', train_corpus.id2token, train_corpus.corpus, configurations=configurations[:1], **opts
+    )
+    assert len(scores) == 1
+
+    fingerprint: dict = coherence.corpus_fingerprint(train_corpus.corpus)
+    assert fingerprint['n_documents'] == 5
+    assert coherence.corpus_fingerprint(other_corpus) != fingerprint
+
+    scores = coherence.sweep('gensim_lda', train_corpus.id2token, other_corpus, configurations=configurations, **opts)
+
+    assert len(scores) == 2
+    assert len(gensim_corpora.MmCorpus(jj(folder, coherence.SWEEP_CORPUS_FILENAME))) == 3
+    assert os.path.isfile(jj(folder, f"sweep_scores.{fingerprint['sha1']}.csv"))
@@ -0,0 +1,78 @@
+import os
+import uuid
+from os.path import join as jj
+
+import numpy as np
+import pandas as pd
+
+from penelope.topic_modelling.engines.engine_gensim import convert
+from tests.utils import OUTPUT_FOLDER
+
+DOCTOPICS_SAMPLE: str = """#doc name topic proportion ...
+0	0	2	0.5	0	0.3	1	0.2
+1	1	1	0.9	3	0.004
+2	2
+3	3	0	0.25	3	0.25	2	0.25	1	0.25
+"""
+
+TOPICWORDWEIGHTS_SAMPLE: str = """0	a	0.01
+0	b	3.01
+0	c	0.01
+1	a	2.01
+1	b	0.01
+1	c	1.01
+"""
+
+
+def create_mallet_folder() -> str:
+    folder: str = jj(OUTPUT_FOLDER, f"mallet_{str(uuid.uuid4())[:6]}")
+    os.makedirs(jj(folder, "mallet"))
+    with open(jj(folder, "mallet", "doctopics.txt"), "w") as fp:
+        fp.write(DOCTOPICS_SAMPLE)
+    with open(jj(folder, "mallet", "topicwordweights.txt"), "w") as fp:
+        fp.write(TOPICWORDWEIGHTS_SAMPLE)
+    pd.Series({0: 'c', 1: 'a', 2: 'b'}).to_json(jj(folder, "topic_model_id2token.json.gz"))
+    pd.DataFrame({'document_id': [0, 1, 2, 3], 'year': [2000, 2000, 2001, 2002]}).to_csv(
+        jj(folder, "documents.zip"), sep='\t', compression=dict(method='zip', archive_name="document_index.csv")
+    )
+    return folder
+
+
+def test_doctopics_to_dataframe_is_independent_of_chunk_size():
+    folder: str = create_mallet_folder()
+    source_filename: str = jj(folder, "mallet", "doctopics.txt")
+
+    dtw: pd.DataFrame = convert.doctopics_to_dataframe(source_filename, normalize=False, epsilon=0.005)
+
+    assert dtw.document_id.tolist() == [0, 0, 0, 1, 3, 3, 3, 3]
+    assert dtw.topic_id.tolist() == [2, 0, 1, 1, 0, 3, 2, 1]
+    assert dtw.weight.tolist() == [0.5, 0.3, 0.2, 0.9, 0.25, 0.25, 0.25, 0.25]
+
+    for chunk_size in [1, 2, 3]:
+        assert dtw.equals(convert.doctopics_to_dataframe(source_filename, epsilon=0.005, chunk_size=chunk_size))
+
+    dtw = convert.doctopics_to_dataframe(source_filename, normalize=True, epsilon=0.005, chunk_size=2)
+    assert np.allclose(dtw.groupby('document_id').weight.sum(), 1.0)
+
+
+def test_convert_document_topics_and_topic_tokens_to_feather():
+    folder: str = create_mallet_folder()
+
+    convert.convert_document_topics(folder, normalize=False, epsilon=0.005, chunk_size=2)
+    convert.convert_topic_tokens(folder, chunk_size=4)
+
+    dtw: pd.DataFrame = pd.read_feather(jj(folder, "document_topic_weights.feather"))
+    assert dtw.columns.tolist() == ['document_id', 'topic_id', 'weight', 'year']
+    assert dtw.year.tolist() == [2000, 2000, 2000, 2000, 2002, 2002, 2002, 2002]
+    assert dtw.dtypes.to_dict() == {
+        'document_id': np.int32,
+        'topic_id': np.int16,
+        'weight': np.float32,
+        'year': np.int16,
+    }
+
+    ttw: pd.DataFrame = pd.read_feather(jj(folder, "topic_token_weights.feather"))
+    assert ttw.columns.tolist() == ['topic_id', 'token_id', 'weight']
+    assert ttw.topic_id.tolist() == [0, 1, 1]
+    assert ttw.token_id.tolist() == [2, 1, 0]
+    assert np.allclose(ttw.weight, [3.01, 2.01, 1.01])
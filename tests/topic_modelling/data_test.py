@@ -120,3 +120,37 @@ def test_load_token2id(topics_data: tm.InferredTopicsData):
     token2id: pc.Token2Id = tm.InferredTopicsData.load_token2id('tests/test_data/tranströmer_inferred_model')
 
     assert token2id.id2token == topics_data.id2token
+
+
+def test_get_topic_titles(topics_data: tm.InferredTopicsData):
+    titles: pd.Series = topics_data.get_topic_titles(n_tokens=3)
+
+    assert titles.index.tolist() == [0, 1, 2, 3]
+    assert titles.loc[0] == 'Och Valv I'
+    assert topics_data.get_topic_title(0, n_tokens=3) == 'Och Valv I'
+    assert topics_data.get_topic_title2(0, n_tokens=3) == 'ID 0: Och Valv I'
+    assert topics_data.get_topic_title2(99, n_tokens=3).startswith('ID 99: Topics has no significant presence')
+
+    assert topics_data.get_topic_titles(n_tokens=3) is titles
+
+    topics_data.update_topic_labels(topics_data.topic_token_overview.index.astype(str))
+    assert topics_data.get_topic_titles(n_tokens=3) is not titles
+
+    titles = tm.get_topic_titles(
+        topics_data.topic_token_weights.drop(columns='token'), n_tokens=2, id2token=topics_data.id2term
+    )
+    assert titles.loc[0] == 'och valv'
+
+
+def test_top_topic_token_weights(topics_data: tm.InferredTopicsData):
+    ttw: pd.DataFrame = topics_data.topic_token_weights
+    top_tokens: pd.DataFrame = topics_data.top_topic_token_weights(n_top=3)
+
+    assert top_tokens.index.name == 'topic_id'
+    assert top_tokens.columns.tolist() == ['token_id', 'weight', 'token', 'position']
+    assert len(top_tokens) == 4 * 3
+    assert top_tokens.loc[0].token.tolist() == ['och', 'valv', 'i']
+    assert top_tokens.loc[0].position.tolist() == [1, 2, 3]
+
+    expected = ttw[ttw.topic_id == 1].nlargest(3, columns='weight')
+    assert top_tokens.loc[1].token_id.tolist() == expected.token_id.tolist()
@@ -3,6 +3,7 @@
 import functools
 import io
 import os
+import pickle
 import shutil
 import uuid
 from typing import Tuple
@@ -16,6 +17,7 @@ from penelope.topic_modelling.engines import get_engine_by_model_type
 from penelope.topic_modelling.engines.engine_gensim import SUPPORTED_ENGINES, convert
 from penelope.topic_modelling.engines.engine_gensim.utility import diagnostics_to_topic_token_weights_data
 from penelope.topic_modelling.engines.interface import ITopicModelEngine
+from penelope.vendor.gensim_api import corpora as gensim_corpora
 from penelope.vendor.gensim_api._gensim.wrappers.mallet_tm import MalletTopicModel
 from tests.fixtures import TranströmerCorpus  # pylint: disable=non-ascii-module-import
 from tests.utils import OUTPUT_FOLDER
@@ -101,6 +103,79 @@ def test_infer_model(method):
     assert isinstance(inferred_model.topic_model, engine.supported_models())
 
 
+def test_translate_corpus_to_memory_mapped_corpus():
+    pytest.importorskip("gensim")
+
+    corpus: TranströmerCorpus = TranströmerCorpus()
+    mmap_folder: str = jj(OUTPUT_FOLDER, f"{uuid.uuid1()}")
+
+    expected_corpus, expected_vocabulary = convert.TranslateCorpus().translate(corpus, id2token=None)
+    mmap_corpus, vocabulary = convert.TranslateCorpus().translate(corpus, id2token=None, mmap_folder=mmap_folder)
+
+    assert isinstance(mmap_corpus, gensim_corpora.MmapSparse2Corpus)
+    assert isinstance(mmap_corpus, gensim_corpora.Sparse2Corpus)
+    assert vocabulary.token2id == expected_vocabulary.token2id
+    assert len(mmap_corpus) == len(expected_corpus)
+    assert list(mmap_corpus) == list(expected_corpus)
+    assert (mmap_corpus.sparse != expected_corpus.sparse).nnz == 0
+
+    """Already serialized corpus is passed through, pickled copies reopens the same files"""
+    same_corpus, _ = convert.TranslateCorpus().translate(mmap_corpus, id2token=vocabulary, mmap_folder=mmap_folder)
+    assert same_corpus is mmap_corpus
+
+    unpickled_corpus: gensim_corpora.MmapSparse2Corpus = pickle.loads(pickle.dumps(mmap_corpus))
+    assert unpickled_corpus.folder == mmap_corpus.folder
+    assert list(unpickled_corpus) == list(expected_corpus)
+
+    shutil.rmtree(mmap_folder)
+
+
+def test_serialize_memory_mapped_corpus_does_not_overwrite_mapped_files():
+    pytest.importorskip("gensim")
+
+    mmap_folder: str = jj(OUTPUT_FOLDER, f"{uuid.uuid1()}")
+    corpus_a, _ = convert.TranslateCorpus().translate(TranströmerCorpus(), id2token=None)
+    corpus_b: gensim_corpora.Sparse2Corpus = gensim_corpora.Sparse2Corpus(corpus_a.sparse[:, :2])
+
+    mmap_corpus_a = gensim_corpora.MmapSparse2Corpus.serialize(mmap_folder, corpus_a)
+    mmap_corpus_b = gensim_corpora.MmapSparse2Corpus.serialize(mmap_folder, corpus_b)
+    same_corpus_a = gensim_corpora.MmapSparse2Corpus.serialize(mmap_folder, corpus_a)
+
+    assert mmap_corpus_a.folder != mmap_corpus_b.folder
+    assert same_corpus_a.folder == mmap_corpus_a.folder
+    assert list(mmap_corpus_a) == list(corpus_a)
+    assert list(mmap_corpus_b) == list(corpus_b)
+    assert sorted(os.listdir(mmap_folder)) == sorted(os.path.basename(x.folder) for x in [mmap_corpus_a, mmap_corpus_b])
+
+    shutil.rmtree(mmap_folder)
+
+
+def test_train_model_with_memory_mapped_corpus():
+    pytest.importorskip("gensim")
+
+    work_folder: str = f'./tests/output/{uuid.uuid4()}'
+    train_corpus: tm.TrainingCorpus = create_train_corpus()
+    inferred_model: tm.InferredModel = tm.train_model(
+        train_corpus=train_corpus,
+        method="gensim_lda-multicore",
+        engine_args={
+            'n_topics': 4,
+            'passes': 1,
+            'random_seed': 42,
+            'workers': 1,
+            'max_iter': 100,
+            'work_folder': work_folder,
+            'mmap_corpus': True,
+        },
+    )
+
+    assert inferred_model.topic_model is not None
+    assert isinstance(train_corpus.corpus, gensim_corpora.MmapSparse2Corpus)
+    assert os.path.dirname(train_corpus.corpus.folder) == jj(work_folder, 'mmap_corpus')
+
+    shutil.rmtree(work_folder)
+
+
 def test_load_inferred_model_fixture():
 
     inferred_model: tm.InferredModel = tm.InferredModel.load(PERSISTED_INFERRED_MODEL_SOURCE_FOLDER)